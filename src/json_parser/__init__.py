@@ -1,5 +1,44 @@
 """JSON Parser"""
 
+from .aio import aiterparse, aload
+from .batch import parse_many
+from .buffer import load_path
+from .cache import CachedParser
+from .document import Document
+from .encoder import dump, dumps, iterencode
+from .events import iterparse
+from .index import StructuralIndex
+from .keys import KeyCache
+from .lazy import parse_lazy
+from .numeric import RawNumber
 from .parser import parse
+from .schema import SchemaError, compile_schema
+from .stats import ParseStats
+from .stream import Parser, load
+from .typed import parse_into
+from .validation import validate
 
-__all__ = ('parse',)
+__all__ = (
+    'parse',
+    'parse_many',
+    'parse_lazy',
+    'parse_into',
+    'validate',
+    'load',
+    'load_path',
+    'iterparse',
+    'aload',
+    'aiterparse',
+    'dumps',
+    'dump',
+    'iterencode',
+    'Parser',
+    'CachedParser',
+    'Document',
+    'StructuralIndex',
+    'KeyCache',
+    'RawNumber',
+    'ParseStats',
+    'SchemaError',
+    'compile_schema',
+)
@@ -0,0 +1,111 @@
+"""Parsing JSON from asyncio streams, without blocking the event loop"""
+import asyncio
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Optional,
+    Union,
+)
+
+from json_parser.events import Builder, Event, EventParser
+from json_parser.stream import CHUNK_SIZE, Parser
+
+# A `StreamReader`, or anything else with an async `read(n)`, or an async
+# iterable of chunks
+AsyncSource = Union[asyncio.StreamReader, AsyncIterable[Union[str, bytes]]]
+
+
+async def _chunks(
+        source: AsyncSource,
+        chunk_size: int) -> AsyncIterator[Union[str, bytes]]:
+    """Reads the source in chunks of at most `chunk_size`.
+
+    Larger chunks from an async iterable are split up, and control goes
+    back to the event loop after every chunk. A reader that already has
+    data buffered doesn't suspend on its own, so without that one large
+    document would keep every other task waiting until it is parsed.
+    """
+    if hasattr(source, 'read'):
+        read = source.read  # type: ignore
+        chunk = await read(chunk_size)
+        while chunk:
+            yield chunk
+            await asyncio.sleep(0)
+            chunk = await read(chunk_size)
+        return
+
+    async for data in source:  # type: ignore
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+            await asyncio.sleep(0)
+
+
+async def aload(
+        source: AsyncSource,
+        chunk_size: int = CHUNK_SIZE,
+        max_depth: Optional[int] = None) -> object:
+    """Parses JSON from an asyncio stream, or an async iterable of chunks.
+
+    Chunks can be `str` or UTF-8 encoded `bytes`, and are fed to a
+    `Parser` as they arrive, so the document is never buffered whole.
+    """
+    parser = Parser(max_depth)
+    async for chunk in _chunks(source, chunk_size):
+        parser.feed(chunk)
+
+    return parser.close()
+
+
+async def _events(
+        source: AsyncSource,
+        chunk_size: int,
+        max_depth: Optional[int]) -> AsyncIterator[Event]:
+    """Parses the source, yielding events as each chunk is processed"""
+    parser = EventParser(max_depth)
+
+    async for chunk in _chunks(source, chunk_size):
+        parser.feed(chunk)
+        events, parser.events = parser.events, []
+        for event in events:
+            yield event
+
+    parser.close()
+    for event in parser.events:
+        yield event
+
+
+async def _items(
+        events: AsyncIterator[Event],
+        prefix: str) -> AsyncIterator[object]:
+    """Builds and yields every value found at `prefix`"""
+    async for path, event, value in events:
+        if path != prefix:
+            continue
+
+        if event in ('start_map', 'start_array'):
+            builder = Builder(event)
+            async for _, event, item in events:
+                if builder.add(event, item):
+                    break
+            yield builder.value
+
+        elif event not in ('map_key', 'end_map', 'end_array'):
+            yield value
+
+
+def aiterparse(
+        source: AsyncSource,
+        prefix: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_depth: Optional[int] = None) -> AsyncIterator[Any]:
+    """Parses JSON incrementally from an asyncio stream or async chunks.
+
+    Works like `iterparse`: yields `(path, event, value)` tuples, or with a
+    prefix, every complete value found at that path.
+    """
+    events = _events(source, chunk_size, max_depth)
+    if prefix is None:
+        return events
+
+    return _items(events, prefix)
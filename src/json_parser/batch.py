@@ -0,0 +1,246 @@
+"""Parsing batches of many small documents, in this process or a pool"""
+import os
+import threading
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from json_parser.buffer import parse_buffer
+from json_parser.keys import KeyCache
+from json_parser.numeric import make_number_decoder
+from json_parser.parallel import CHUNKS_PER_WORKER
+from json_parser.parser import (
+    Buffer,
+    ObjectHook,
+    ParserEngine,
+    _pairs_hook,
+    _parse_text,
+)
+
+Backend = Literal['serial', 'thread', 'process']
+
+# The parser of the current worker thread or process
+WORKER = threading.local()
+
+
+class Failed:
+    """Marks a message that couldn't be parsed, in place of its value"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+class BatchWorker:
+    """Parses messages one after another, with `parse_many`'s options.
+
+    The options are checked and turned into a number decoder and object
+    hook once, and a `KeyCache` is shared by every message the worker
+    parses, so the keys that repeat from message to message are decoded
+    once per worker.
+    """
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.engine: ParserEngine = options['engine']
+        self.max_depth: Optional[int] = options['max_depth']
+        if self.max_depth is not None and self.engine == 'recursive':
+            raise ValueError("max_depth needs a non-recursive engine")
+
+        self.number_decoder = make_number_decoder(
+            options['parse_float'],
+            options['parse_int'],
+            options['decimal'],
+            options['raw_numbers'],
+        )
+        self.object_hook: Optional[ObjectHook] = options['object_hook']
+        if options['object_pairs_hook'] is not None:
+            self.object_hook = _pairs_hook(options['object_pairs_hook'])
+        self.key_cache = KeyCache(options['key_cache_size'], lru=True)
+
+    def parse(self, message: Union[str, Buffer]) -> object:
+        """Parses a single message"""
+        if isinstance(message, str):
+            return _parse_text(
+                message,
+                self.engine,
+                self.max_depth,
+                self.key_cache,
+                self.number_decoder,
+                self.object_hook,
+            )
+
+        return parse_buffer(
+            message,
+            self.engine,
+            self.max_depth,
+            self.key_cache,
+            self.number_decoder,
+            self.object_hook,
+        )
+
+    def parse_chunk(
+            self,
+            messages: Sequence[Union[str, Buffer]],
+            return_exceptions: bool) -> List[object]:
+        """Parses messages in order, marking the ones that fail.
+
+        Unless `return_exceptions` is set, stops at the first failure.
+        """
+        values: List[object] = []
+        append = values.append
+        parse = self.parse
+        for message in messages:
+            try:
+                append(parse(message))
+            except Exception as err:
+                append(Failed(err))
+                if not return_exceptions:
+                    break
+
+        return values
+
+
+def parse_many(
+        messages: Iterable[Union[str, Buffer]],
+        workers: Optional[int] = None,
+        backend: Backend = 'serial',
+        return_exceptions: bool = False,
+        chunk_size: Optional[int] = None,
+        engine: ParserEngine = 'recursive',
+        max_depth: Optional[int] = None,
+        parse_float: Optional[Callable[[str], object]] = None,
+        parse_int: Optional[Callable[[str], object]] = None,
+        decimal: bool = False,
+        raw_numbers: bool = False,
+        object_hook: Optional[ObjectHook] = None,
+        object_pairs_hook: Optional[
+            Callable[[List[Tuple[str, object]]], object]] = None,
+        key_cache_size: int = 4096,
+) -> List[object]:
+    """Parses many JSON messages, and returns their values in order.
+
+    Each message is parsed like `parse` would with the same options, but
+    those are only looked at once per worker, rather than once per
+    message, and every worker keeps a `KeyCache` of `key_cache_size` keys
+    for all the messages it parses.
+
+    With the `serial` backend, messages are parsed in this process. The
+    `thread` and `process` backends hand them to a pool of `workers`
+    threads or processes (by default, the number of CPUs) in chunks of
+    `chunk_size` messages, by default a few chunks per worker, so that
+    each chunk costs one round trip to the pool. Hooks and `bytes`-like
+    messages are pickled for the `process` backend, so they have to be
+    picklable, and other buffers are copied into `bytes`. A single worker
+    parses in this process, like `serial`.
+
+    The first message that fails raises its error, as `parse` would, and
+    the chunks after it that haven't started yet are cancelled. With
+    `return_exceptions=True`, every message is parsed, and the ones that
+    fail have their exception in their place in the result instead.
+    """
+    options = {
+        'engine': engine,
+        'max_depth': max_depth,
+        'parse_float': parse_float,
+        'parse_int': parse_int,
+        'decimal': decimal,
+        'raw_numbers': raw_numbers,
+        'object_hook': object_hook,
+        'object_pairs_hook': object_pairs_hook,
+        'key_cache_size': key_cache_size,
+    }
+    if backend not in ('serial', 'thread', 'process'):
+        raise ValueError(f"Unknown backend: {backend}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, not {chunk_size}")
+
+    # Checks the options before any worker starts
+    worker = BatchWorker(options)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if backend == 'serial' or workers <= 1:
+        values = worker.parse_chunk(list(messages), return_exceptions)
+        return _results(values, return_exceptions)
+
+    if backend == 'process':
+        messages = [
+            message if isinstance(message, (str, bytes)) else bytes(message)
+            for message in messages
+        ]
+    elif not isinstance(messages, list):
+        messages = list(messages)
+
+    if chunk_size is None:
+        chunk_size = max(
+            -(-len(messages) // (workers * CHUNKS_PER_WORKER)), 1)
+    chunks = [
+        messages[start:start + chunk_size]
+        for start in range(0, len(messages), chunk_size)
+    ]
+
+    executor: Executor
+    if backend == 'thread':
+        executor = ThreadPoolExecutor(
+            workers, initializer=_start_worker, initargs=(options,))
+    else:
+        executor = ProcessPoolExecutor(
+            workers, initializer=_start_worker, initargs=(options,))
+
+    values: List[object] = []
+    with executor:
+        futures = [
+            executor.submit(_parse_chunk, chunk, return_exceptions)
+            for chunk in chunks
+        ]
+        try:
+            for future in futures:
+                values.extend(future.result())
+                if not return_exceptions and isinstance(values[-1], Failed):
+                    break
+        finally:
+            # Chunks after a failure aren't needed, and those that haven't
+            # started yet never will
+            for future in futures:
+                future.cancel()
+
+    return _results(values, return_exceptions)
+
+
+def _start_worker(options: Dict[str, Any]) -> None:
+    """Sets up the parser of a worker thread or process"""
+    WORKER.parser = BatchWorker(options)
+
+
+def _parse_chunk(
+        messages: List[Union[str, bytes]],
+        return_exceptions: bool) -> List[object]:
+    """Parses a chunk of messages, in a worker"""
+    return WORKER.parser.parse_chunk(messages, return_exceptions)
+
+
+def _results(values: List[object], return_exceptions: bool) -> List[object]:
+    """Turns failed messages into their exceptions, or raises the first"""
+    for index, value in enumerate(values):
+        if isinstance(value, Failed):
+            if not return_exceptions:
+                raise value.error
+            values[index] = value.error
+
+    return values
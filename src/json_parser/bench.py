@@ -0,0 +1,407 @@
+"""Benchmarks on generated corpora, with results to save and compare.
+
+Run with `python -m json_parser.bench`. Every corpus is generated from a
+seeded random number generator, so runs on different machines and commits
+parse exactly the same input without downloading anything. Each stage of
+the parser is timed on its own, next to the standard library's `json`, and
+the results are printed as JSON, which `--compare` checks against a saved
+baseline.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from json_parser.encoder import dumps
+from json_parser.jsonl import iter_lines
+from json_parser.lexer import tokenize
+from json_parser.parser import ParserEngine, _parse, parse
+
+ENGINES: Sequence[ParserEngine] = (
+    'recursive', 'iterative', 'fused', 'compact')
+
+SIZE = 512 * 1024
+REPEAT = 3
+# How much slower, or larger, a result can get before it counts as a
+# regression against the baseline
+THRESHOLD = 0.1
+
+# A benchmark run's results: the run's settings, and for each corpus, its
+# size and the best time and peak memory of each stage
+Results = Dict[str, Any]
+
+WORDS = [
+    ''.join(random.Random(index).choices(string.ascii_lowercase, k=length))
+    for index, length in enumerate([3, 4, 5, 6, 7, 8, 9, 10] * 8)
+]
+UNICODE = 'äöüßéñçøåœ€£¥αβγδλπΣΩжщыэюя中文字日本語한국어'
+ESCAPED = '"\\/\b\f\n\r\t\x00\x1f'
+
+
+def _array(
+        size: int,
+        element: Callable[[], object],
+        ensure_ascii: bool = False) -> str:
+    """Encodes an array of generated elements, about `size` long"""
+    parts: List[str] = []
+    length = 2
+    while length < size:
+        part = dumps(element(), ensure_ascii=ensure_ascii)
+        parts.append(part)
+        length += len(part) + 2
+
+    return '[' + ', '.join(parts) + ']'
+
+
+def _deep(rng: random.Random, size: int) -> List[str]:
+    """Containers nested a hundred levels deep, many times over"""
+    def element() -> object:
+        value: object = rng.randint(0, 1000)
+        for depth in range(100):
+            value = [value, depth] if depth % 2 else {'a': value}
+        return value
+
+    return [_array(size, element)]
+
+
+def _long_strings(rng: random.Random, size: int) -> List[str]:
+    """Strings of a few thousand characters, with no escapes"""
+    def element() -> object:
+        return ' '.join(rng.choices(WORDS, k=rng.randint(200, 2000)))
+
+    return [_array(size, element)]
+
+
+def _escapes(rng: random.Random, size: int) -> List[str]:
+    """Short strings full of escapes, including unicode and surrogates"""
+    alphabet = ESCAPED + UNICODE + '\U0001f600\U0001f680' + 'abc '
+
+    def element() -> object:
+        return ''.join(rng.choices(alphabet, k=rng.randint(5, 50)))
+
+    # ensure_ascii turns every non ASCII character into a \u escape
+    return [_array(size, element, ensure_ascii=True)]
+
+
+def _numbers(rng: random.Random, size: int) -> List[str]:
+    """Rows of integers and floats"""
+    def element() -> object:
+        return [
+            rng.randint(-10 ** 9, 10 ** 9) if index % 2
+            else round(rng.uniform(-1000, 1000), rng.randint(1, 6))
+            for index in range(16)
+        ]
+
+    return [_array(size, element)]
+
+
+def _wide(rng: random.Random, size: int) -> List[str]:
+    """Objects with a thousand keys each"""
+    def element() -> object:
+        return {
+            f'{rng.choice(WORDS)}_{index}': rng.choice(
+                [rng.randint(0, 100), rng.choice(WORDS), True, None])
+            for index in range(1000)
+        }
+
+    return [_array(size, element)]
+
+
+def _record(rng: random.Random, index: int) -> object:
+    """A small record, like a typical API response or log line"""
+    return {
+        'id': index,
+        'name': ' '.join(rng.choices(WORDS, k=2)),
+        'active': rng.random() < 0.5,
+        'score': round(rng.uniform(0, 100), 2),
+        'tags': rng.choices(WORDS, k=rng.randint(0, 5)),
+        'owner': {'id': rng.randint(1, 1000), 'email': None},
+    }
+
+
+def _jsonl(rng: random.Random, size: int) -> List[str]:
+    """One small record per line"""
+    lines: List[str] = []
+    length = 0
+    while length < size:
+        line = dumps(_record(rng, len(lines)))
+        lines.append(line)
+        length += len(line) + 1
+
+    return lines
+
+
+CORPORA: Dict[str, Callable[[random.Random, int], List[str]]] = {
+    'deep': _deep,
+    'long_strings': _long_strings,
+    'escapes': _escapes,
+    'numbers': _numbers,
+    'wide': _wide,
+    'jsonl': _jsonl,
+}
+
+
+def generate_corpus(name: str, size: int = SIZE, seed: int = 0) -> List[str]:
+    """Generates a corpus of about `size` characters, as a list of documents.
+
+    The same name, size and seed always give the same documents. Every
+    corpus is one document, except for `jsonl`, which has one per line.
+    """
+    return CORPORA[name](random.Random(f'{name}:{seed}'), size)
+
+
+def _best_time(
+        run: Callable[[Any], object],
+        setup: Callable[[], Any],
+        repeat: int) -> float:
+    """Times `run(setup())`, and returns the fastest of `repeat` runs"""
+    times: List[float] = []
+    for _ in range(repeat):
+        argument = setup()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(argument)
+            times.append(time.perf_counter() - start)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    return min(times)
+
+
+def _peak_memory(
+        run: Callable[[Any], object],
+        setup: Callable[[], Any]) -> int:
+    """Measures the peak memory allocated by `run(setup())`, in bytes"""
+    argument = setup()
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def _stages(
+        documents: List[str],
+        engines: Sequence[ParserEngine]) -> Dict[str, Any]:
+    """The stages to benchmark on a corpus, as `(run, setup)` pairs"""
+    def no_setup() -> List[str]:
+        return documents
+
+    def tokenized() -> List[Any]:
+        return [tokenize(document) for document in documents]
+
+    stages: Dict[str, Any] = {
+        'tokenize': (
+            lambda documents: [tokenize(document) for document in documents],
+            no_setup),
+        '_parse': (
+            lambda tokens: [_parse(queue) for queue in tokens],
+            tokenized),
+    }
+    for engine in engines:
+        stages[f'parse:{engine}'] = (
+            lambda documents, engine=engine: [
+                parse(document, engine=engine) for document in documents],
+            no_setup)
+
+    if len(documents) > 1:
+        stages['iter_lines'] = (
+            lambda documents: list(iter_lines(documents)),
+            no_setup)
+
+    stages['json'] = (
+        lambda documents: [json.loads(document) for document in documents],
+        no_setup)
+    return stages
+
+
+def run_benchmarks(
+        corpora: Sequence[str] = tuple(CORPORA),
+        engines: Sequence[ParserEngine] = ENGINES,
+        size: int = SIZE,
+        repeat: int = REPEAT,
+        seed: int = 0,
+        memory: bool = True) -> Results:
+    """Benchmarks every stage on every corpus.
+
+    Each stage's time is the best of `repeat` runs. Peak memory is measured
+    with `tracemalloc` in a separate run, for the end to end parses and
+    `json`, as it slows everything down while it's tracing.
+    """
+    results: Results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'size': size,
+        'repeat': repeat,
+        'seed': seed,
+        'corpora': {},
+    }
+
+    for name in corpora:
+        documents = generate_corpus(name, size, seed)
+        # Every engine has to agree with the standard library
+        expected = [json.loads(document) for document in documents]
+        for engine in engines:
+            if [parse(doc, engine=engine) for doc in documents] != expected:
+                raise AssertionError(f"{engine} parsed {name} incorrectly")
+
+        timings: Dict[str, float] = {}
+        peak_memory: Dict[str, int] = {}
+        for stage, (run, setup) in _stages(documents, engines).items():
+            timings[stage] = _best_time(run, setup, repeat)
+            if memory and (stage.startswith('parse:') or stage == 'json'):
+                peak_memory[stage] = _peak_memory(run, setup)
+
+        results['corpora'][name] = {
+            'characters': sum(len(document) for document in documents),
+            'documents': len(documents),
+            'timings': timings,
+            'peak_memory': peak_memory,
+        }
+
+    return results
+
+
+def compare(
+        results: Results,
+        baseline: Results,
+        threshold: float = THRESHOLD) -> List[str]:
+    """Lists the timings and peak memory that regressed from the baseline.
+
+    A result regressed if it's more than `threshold` times worse than the
+    baseline's. Corpora and stages missing from either side are skipped.
+    """
+    regressions: List[str] = []
+    for name, corpus in results['corpora'].items():
+        base = baseline['corpora'].get(name)
+        if base is None:
+            continue
+
+        for kind, unit in (('timings', 's'), ('peak_memory', 'B')):
+            for stage, value in corpus[kind].items():
+                old = base[kind].get(stage)
+                if old is None or stage == 'json':
+                    continue
+
+                if value > old * (1 + threshold):
+                    regressions.append(
+                        f"{name} {stage} {kind}: {old:.6g}{unit} -> "
+                        f"{value:.6g}{unit} ({value / old:.2f}x)")
+
+    return regressions
+
+
+def format_table(results: Results) -> str:
+    """Formats results as a table, with each stage's time relative to `json`"""
+    lines = [f"{'corpus':<14}{'stage':<18}{'time':>10}{'vs json':>9}"
+             f"{'peak memory':>14}"]
+    for name, corpus in results['corpora'].items():
+        reference = corpus['timings']['json']
+        for stage, seconds in corpus['timings'].items():
+            peak = corpus['peak_memory'].get(stage)
+            memory = '' if peak is None else f'{peak / 1024 / 1024:.1f}MB'
+            lines.append(
+                f"{name:<14}{stage:<18}{seconds:>9.4f}s"
+                f"{seconds / reference:>8.1f}x{memory:>14}")
+
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point, see `--help`"""
+    parser = argparse.ArgumentParser(
+        prog='python -m json_parser.bench',
+        description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--corpus', action='append', choices=list(CORPORA),
+        help="corpus to run, can be repeated (default: all)")
+    parser.add_argument(
+        '--engine', action='append', choices=list(ENGINES),
+        help="engine to time end to end, can be repeated (default: all)")
+    parser.add_argument(
+        '--size', type=int, default=SIZE,
+        help=f"characters per corpus (default: {SIZE})")
+    parser.add_argument(
+        '--repeat', type=int, default=REPEAT,
+        help=f"runs per stage, the best is kept (default: {REPEAT})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--no-memory', action='store_true',
+        help="skip measuring peak memory")
+    parser.add_argument(
+        '--output', metavar='FILE',
+        help="write the results to FILE instead of printing them")
+    parser.add_argument(
+        '--compare', metavar='BASELINE',
+        help="compare against saved results, exits with 1 on regressions")
+    parser.add_argument(
+        '--threshold', type=float, default=THRESHOLD,
+        help=f"allowed slowdown against the baseline (default: {THRESHOLD})")
+    parser.add_argument(
+        '--write-corpora', metavar='DIR',
+        help="write the generated corpora to DIR and exit")
+    args = parser.parse_args(argv)
+
+    corpora = args.corpus or list(CORPORA)
+    if args.write_corpora is not None:
+        os.makedirs(args.write_corpora, exist_ok=True)
+        for name in corpora:
+            documents = generate_corpus(name, args.size, args.seed)
+            extension = 'jsonl' if name == 'jsonl' else 'json'
+            path = os.path.join(args.write_corpora, f'{name}.{extension}')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('\n'.join(documents) + '\n')
+        return 0
+
+    results = run_benchmarks(
+        corpora,
+        args.engine or ENGINES,
+        args.size,
+        args.repeat,
+        args.seed,
+        memory=not args.no_memory,
+    )
+    print(format_table(results), file=sys.stderr)
+
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+            file.write('\n')
+
+    if args.compare is None:
+        return 0
+
+    with open(args.compare, encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
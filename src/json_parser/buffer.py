@@ -0,0 +1,263 @@
+"""Parsing UTF-8 encoded JSON straight out of bytes and memory maps"""
+import mmap
+import os
+import re
+from typing import Callable, List, Optional, Tuple, Union
+
+from json_parser.lexer import NUMBER, SCANNER, STRING, SYMBOL
+from json_parser.parser import (
+    Buffer,
+    JSONArray,
+    JSONObject,
+    ObjectHook,
+    ParserEngine,
+    PendingObject,
+    Unsupported,
+    _apply_object_hook,
+    _decode_string,
+    _key_counts,
+    _pairs_hook,
+    _parse_text,
+    _pending_object,
+    _restore_key_counts,
+)
+from json_parser.keys import KeyCache
+from json_parser.numeric import NumberDecoder, make_number_decoder
+
+# The same scanner, over bytes. Everything outside of strings has to be
+# ASCII, so anything else ends up as `unknown`.
+BYTES_SCANNER = re.compile(
+    SCANNER.pattern.encode(), SCANNER.flags & ~re.UNICODE)
+
+BYTES_SPECIAL_VALUES = {b'true': True, b'false': False, b'null': None}
+
+
+def parse_buffer(
+        buffer: Buffer,
+        engine: ParserEngine = 'recursive',
+        max_depth: Optional[int] = None,
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None) -> object:
+    """Parses UTF-8 encoded JSON from any bytes-like object.
+
+    The buffer is scanned in place, and only the text of each token is
+    copied out, with strings decoded (and so checked to be valid UTF-8) one
+    at a time. Errors are found by decoding the whole buffer and parsing it
+    with `engine`, so they are the same as for the decoded string, or a
+    `UnicodeDecodeError` if it isn't valid UTF-8.
+    """
+    if isinstance(buffer, memoryview):
+        buffer = buffer.cast('B')
+
+    counts = _key_counts(key_cache)
+    try:
+        return _parse_bytes(
+            buffer, max_depth, key_cache, number_decoder, object_hook)
+    except Unsupported:
+        _restore_key_counts(key_cache, counts)
+        return _parse_text(
+            str(buffer, 'utf-8'),
+            engine,
+            max_depth,
+            key_cache,
+            number_decoder,
+            object_hook,
+        )
+
+
+def _parse_bytes(
+        buffer: Buffer,
+        max_depth: Optional[int],
+        key_cache: Optional[KeyCache],
+        number_decoder: Optional[NumberDecoder],
+        object_hook: Optional[ObjectHook]) -> object:
+    """The fused parser, over bytes. Raises `Unsupported` on any problem."""
+    match = BYTES_SCANNER.match
+
+    # Containers still being built, and the pending key of every object
+    stack: List[Union[JSONArray, JSONObject]] = []
+    keys: List[str] = []
+    pending: List[PendingObject] = []
+
+    index = 0
+    while True:
+        found = match(buffer, index)
+        kind = found.lastindex
+        text = found.group(kind) if kind else b''
+        index = found.end()
+
+        if kind == STRING:
+            if b'\\' in text:
+                value = _decode_bytes(text)
+            else:
+                try:
+                    value = text[1:-1].decode()
+                except UnicodeDecodeError as err:
+                    raise Unsupported from err
+
+        elif kind == NUMBER:
+            try:
+                if number_decoder is not None:
+                    value = number_decoder(text.decode())
+                elif b'.' in text:
+                    value = float(text)
+                else:
+                    value = int(text)
+            except (ValueError, ArithmeticError) as err:
+                raise Unsupported from err
+
+        elif kind != SYMBOL:
+            raise Unsupported
+
+        elif text == b'[':
+            if max_depth is not None and len(stack) >= max_depth:
+                raise Unsupported
+
+            found = match(buffer, index)
+            if found.group(found.lastindex or 0) == b']':
+                value = []
+                index = found.end()
+            else:
+                stack.append([])
+                continue
+
+        elif text == b'{':
+            if max_depth is not None and len(stack) >= max_depth:
+                raise Unsupported
+
+            found = match(buffer, index)
+            if found.group(found.lastindex or 0) == b'}':
+                value = {}
+                if object_hook is not None:
+                    pending.append(_pending_object(
+                        value, stack[-1] if stack else None,
+                        keys[-1] if keys else ''))
+                index = found.end()
+            else:
+                key, index = _bytes_key(buffer, index, key_cache)
+                keys.append(key)
+                stack.append({})
+                continue
+
+        elif text in BYTES_SPECIAL_VALUES:
+            value = BYTES_SPECIAL_VALUES[text]
+
+        else:
+            raise Unsupported
+
+        # Add the value to its container, closing as many as possible
+        while stack:
+            container = stack[-1]
+            if isinstance(container, list):
+                container.append(value)
+            else:
+                container[keys[-1]] = value
+
+            found = match(buffer, index)
+            text = found.group(found.lastindex or 0)
+            index = found.end()
+
+            if text == b',':
+                if isinstance(container, dict):
+                    keys[-1], index = _bytes_key(buffer, index, key_cache)
+                break
+
+            if text == b']' and isinstance(container, list):
+                value = stack.pop()
+            elif text == b'}' and isinstance(container, dict):
+                value = stack.pop()
+                keys.pop()
+                if object_hook is not None:
+                    pending.append(_pending_object(
+                        value, stack[-1] if stack else None,
+                        keys[-1] if keys else ''))
+            else:
+                raise Unsupported
+
+        else:
+            if match(buffer, index).lastindex is not None:
+                raise Unsupported
+
+            if object_hook is not None:
+                return _apply_object_hook(value, pending, object_hook)
+            return value
+
+
+def _bytes_key(
+        buffer: Buffer,
+        index: int,
+        key_cache: Optional[KeyCache]) -> Tuple[str, int]:
+    """Reads an object key and its colon, for the bytes parser"""
+    found = BYTES_SCANNER.match(buffer, index)
+    if found.lastindex != STRING:
+        raise Unsupported
+
+    text = found.group(STRING)
+    if key_cache is None:
+        key = _decode_bytes(text)
+    else:
+        key = key_cache.get(text)  # type: ignore
+        if key is None:
+            key = key_cache.add(text, _decode_bytes(text))
+
+    found = BYTES_SCANNER.match(buffer, found.end())
+    if found.group(found.lastindex or 0) != b':':
+        raise Unsupported
+
+    return key, found.end()
+
+
+def _decode_bytes(text: bytes) -> str:
+    """Decodes a string token's UTF-8 text"""
+    try:
+        decoded = text.decode()
+    except UnicodeDecodeError as err:
+        raise Unsupported from err
+
+    return _decode_string(decoded)
+
+
+def map_file(path: Union[str, os.PathLike]) -> Union[bytes, mmap.mmap]:
+    """Memory maps a file for reading"""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_path(
+        path: Union[str, os.PathLike],
+        engine: ParserEngine = 'recursive',
+        max_depth: Optional[int] = None,
+        key_cache: Optional[KeyCache] = None,
+        parse_float: Optional[Callable[[str], object]] = None,
+        parse_int: Optional[Callable[[str], object]] = None,
+        decimal: bool = False,
+        raw_numbers: bool = False,
+        object_hook: Optional[ObjectHook] = None,
+        object_pairs_hook: Optional[
+            Callable[[List[Tuple[str, object]]], object]] = None) -> object:
+    """Parses a UTF-8 encoded JSON file, memory mapped instead of read.
+
+    Takes the same options as `parse`.
+    """
+    number_decoder = make_number_decoder(
+        parse_float, parse_int, decimal, raw_numbers)
+    if object_pairs_hook is not None:
+        object_hook = _pairs_hook(object_pairs_hook)
+
+    buffer = map_file(path)
+    try:
+        return parse_buffer(
+            buffer,
+            engine,
+            max_depth,
+            key_cache,
+            number_decoder,
+            object_hook,
+        )
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
@@ -0,0 +1,205 @@
+"""Caching parse results for documents that are parsed over and over"""
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    NoReturn,
+    Tuple,
+    Union,
+)
+
+from json_parser.parser import Buffer, parse
+
+# Marks a document that isn't in the cache
+MISSING = object()
+
+
+class CachedParserStats(NamedTuple):
+    """How well a `CachedParser` is doing"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    maxsize: int
+    maxbytes: int
+
+
+class FrozenDict(Dict[str, object]):
+    """A `dict` that can't be changed, for results shared between callers"""
+
+    __slots__ = ('_built',)
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> 'FrozenDict':
+        self = dict.__new__(cls)
+        dict.update(self, *args, **kwargs)
+        return self
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Filled in by `__new__`, so calling this again can't change it
+        if getattr(self, '_built', False):
+            self._immutable()
+        self._built = True
+
+    def _immutable(self, *args: object, **kwargs: object) -> NoReturn:
+        raise TypeError("FrozenDict can't be changed")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable  # type: ignore
+    clear = pop = popitem = setdefault = update = _immutable  # type: ignore
+
+    def __reduce__(self) -> Any:
+        return FrozenDict, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f'FrozenDict({dict.__repr__(self)})'
+
+
+class CachedParser:
+    """Parses documents with `parse`, reusing the result for repeated input.
+
+    Results are looked up by the document's content, so the same config or
+    feature flag document arriving again as a new string is still a hit.
+    At most `maxsize` documents, totalling `maxbytes` characters (or bytes,
+    for bytes input), are kept, and the least recently used ones are
+    evicted to make room. Larger documents are parsed, but never cached.
+
+    By default, every caller gets the same shared result, made immutable:
+    objects are `FrozenDict`s and arrays are tuples. With `copy=True`, the
+    result is the usual dicts and lists instead, copied on every call, so
+    it can be changed freely. Only objects and arrays are copied, so
+    values made by hooks are shared either way.
+
+    `options` are passed on to `parse`. Errors aren't cached, so invalid
+    documents are parsed again every time.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 1024,
+            maxbytes: int = 16 * 1024 * 1024,
+            copy: bool = False,
+            **options: Any) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.copy = copy
+        self.options = options
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._results: 'OrderedDict[Union[str, bytes], object]' = (
+            OrderedDict())
+        self._lock = threading.Lock()
+
+    def parse(self, json_string: Union[str, Buffer]) -> object:
+        """Parses a JSON string, or returns the cached result for it"""
+        if not isinstance(json_string, (str, bytes)):
+            # Only immutable input can be a key
+            json_string = bytes(json_string)
+
+        results = self._results
+        with self._lock:
+            result = results.get(json_string, MISSING)
+            if result is not MISSING:
+                results.move_to_end(json_string)
+                self.hits += 1
+                return _copy(result) if self.copy else result
+
+            self.misses += 1
+
+        value = parse(json_string, **self.options)
+        result = value if self.copy else _freeze(value)
+        size = len(json_string)
+        if size > self.maxbytes or self.maxsize <= 0:
+            return result
+
+        with self._lock:
+            if json_string not in results:
+                results[json_string] = result
+                self.size += size
+
+            while len(results) > self.maxsize or self.size > self.maxbytes:
+                key, _ = results.popitem(last=False)
+                self.size -= len(key)
+                self.evictions += 1
+
+        return _copy(result) if self.copy else result
+
+    def stats(self) -> CachedParserStats:
+        """Hit, miss and eviction counts, and how full the cache is"""
+        return CachedParserStats(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self._results),
+            self.size,
+            self.maxsize,
+            self.maxbytes,
+        )
+
+    def clear(self) -> None:
+        """Empties the cache, and resets its statistics"""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = self.evictions = self.size = 0
+
+
+def _freeze(value: object) -> object:
+    """Makes a parsed value's objects `FrozenDict`s and arrays tuples"""
+    return _rebuild(value, FrozenDict, tuple)
+
+
+def _copy(value: object) -> object:
+    """Copies a parsed value's objects and arrays"""
+    return _rebuild(value, dict, list)
+
+
+def _rebuild(
+        value: object,
+        make_object: Callable[[List[Tuple[str, object]]], object],
+        make_array: Callable[[List[object]], object]) -> object:
+    """Builds every object and array again, from its rebuilt items.
+
+    Containers are walked with an explicit stack, like the iterative
+    engine, so anything that engine can parse can be rebuilt, however
+    deeply nested.
+    """
+    if type(value) is not dict and type(value) is not list:
+        return value
+
+    # The containers being rebuilt: an iterator over each one's remaining
+    # items, whether it's an object, the items rebuilt so far, and the key
+    # of the item being rebuilt below it
+    stack: List[List[Any]] = [_rebuilding(value)]
+    while True:
+        entry = stack[-1]
+        items, is_object, rebuilt, _ = entry
+        for item in items:
+            child = item[1] if is_object else item
+            if type(child) is dict or type(child) is list:
+                entry[3] = item[0] if is_object else None
+                stack.append(_rebuilding(child))
+                break
+
+            rebuilt.append(item)
+
+        else:
+            stack.pop()
+            result = make_object(rebuilt) if is_object else make_array(rebuilt)
+            if not stack:
+                return result
+
+            parent = stack[-1]
+            parent[2].append((parent[3], result) if parent[1] else result)
+
+
+def _rebuilding(container: Any) -> List[Any]:
+    """A stack entry for `_rebuild`"""
+    if type(container) is dict:
+        return [iter(container.items()), True, [], None]
+
+    return [iter(container), False, [], None]
@@ -0,0 +1,546 @@
+"""Documents that are edited in place, re-parsing only what changed"""
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+from json_parser.lexer import (
+    NUMBER,
+    SCANNER,
+    STRING,
+    SYMBOL,
+    Token,
+    TokenizeError,
+    extract_token,
+)
+from json_parser.parser import (
+    SPECIAL_VALUES,
+    ParseError,
+    Unsupported,
+    _decode_string,
+    parse,
+    parse_number,
+    parse_string,
+)
+
+CLOSING = {'[': ']', '{': '}'}
+
+# How many offsets are kept in each block of `Offsets`
+BLOCK_SIZE = 512
+
+
+class Offsets:
+    """The ordered offsets of the children of a container.
+
+    They're kept in blocks, each with a delta added to all of its
+    offsets, so moving every offset after some child only changes the
+    offsets in that child's block, and the deltas of the blocks after it.
+    """
+
+    __slots__ = ('blocks', 'deltas', 'counts')
+
+    def __init__(self, offsets: Sequence[int] = ()) -> None:
+        self.blocks = [
+            list(offsets[start:start + BLOCK_SIZE])
+            for start in range(0, len(offsets), BLOCK_SIZE)]
+        self.deltas = [0] * len(self.blocks)
+        # The number of offsets before each block
+        self.counts = list(range(0, len(offsets), BLOCK_SIZE))
+
+    def __len__(self) -> int:
+        if not self.blocks:
+            return 0
+        return self.counts[-1] + len(self.blocks[-1])
+
+    def __getitem__(self, index: int) -> int:
+        block = bisect_right(self.counts, index) - 1
+        return self.blocks[block][index - self.counts[block]] + (
+            self.deltas[block])
+
+    def bisect_left(self, offset: int) -> int:
+        """Where `offset` would go before any equal offsets"""
+        blocks, deltas = self.blocks, self.deltas
+        # The last block that starts before the offset
+        low, high = 0, len(blocks)
+        while low < high:
+            middle = (low + high) // 2
+            if blocks[middle][0] + deltas[middle] < offset:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == 0:
+            return 0
+        block = low - 1
+        return self.counts[block] + bisect_left(
+            blocks[block], offset - deltas[block])
+
+    def bisect_right(self, offset: int) -> int:
+        """Where `offset` would go after any equal offsets"""
+        blocks, deltas = self.blocks, self.deltas
+        # The last block that starts at or before the offset
+        low, high = 0, len(blocks)
+        while low < high:
+            middle = (low + high) // 2
+            if blocks[middle][0] + deltas[middle] <= offset:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == 0:
+            return 0
+        block = low - 1
+        return self.counts[block] + bisect_right(
+            blocks[block], offset - deltas[block])
+
+    def shift(self, index: int, delta: int) -> None:
+        """Adds `delta` to every offset from `index` on"""
+        if not delta or index >= len(self):
+            return
+
+        block = bisect_right(self.counts, index) - 1
+        offsets = self.blocks[block]
+        start = index - self.counts[block]
+        offsets[start:] = [offset + delta for offset in offsets[start:]]
+
+        deltas = self.deltas
+        deltas[block + 1:] = [
+            block_delta + delta for block_delta in deltas[block + 1:]]
+
+    def replace(self, first: int, stop: int, offsets: List[int]) -> None:
+        """Replaces the offsets from `first` up to `stop`, which has to be
+        after it, with new ones"""
+        blocks, deltas, counts = self.blocks, self.deltas, self.counts
+        first_block = bisect_right(counts, first) - 1
+        last_block = bisect_right(counts, stop - 1) - 1
+
+        # The blocks the replaced offsets are in are split up again
+        head = blocks[first_block][:first - counts[first_block]]
+        tail = blocks[last_block][stop - counts[last_block]:]
+        head_delta = deltas[first_block]
+        tail_delta = deltas[last_block]
+        merged = (
+            [offset + head_delta for offset in head]
+            + offsets
+            + [offset + tail_delta for offset in tail])
+
+        new_blocks = [
+            merged[start:start + BLOCK_SIZE]
+            for start in range(0, len(merged), BLOCK_SIZE)]
+        blocks[first_block:last_block + 1] = new_blocks
+        deltas[first_block:last_block + 1] = [0] * len(new_blocks)
+
+        count = counts[first_block]
+        del counts[first_block:]
+        for block in blocks[first_block:]:
+            counts.append(count)
+            count += len(block)
+
+
+
+class Node:
+    """An array or object in a document, and where its children are.
+
+    Each child's span is kept relative to the start of this container, so
+    an edit only moves the spans after it in the containers around it,
+    not every span in the document, and those are moved a block at a
+    time. An object member's span starts at its key. Children that are
+    arrays or objects have nodes of their own.
+    """
+
+    __slots__ = ('value', 'length', 'starts', 'ends', 'keys', 'children')
+
+    def __init__(self, is_object: bool) -> None:
+        self.value: Any = {} if is_object else []
+        # From the opening bracket to just after the closing one
+        self.length = 0
+        self.starts = Offsets()
+        self.ends = Offsets()
+        # The key of every member, None for arrays
+        self.keys: Optional[List[str]] = [] if is_object else None
+        self.children: List[Optional[Node]] = []
+
+    def is_simple(self) -> bool:
+        """Whether every child can be replaced on its own.
+
+        An object with a repeated key only keeps the last value, so its
+        members can't be swapped one by one.
+        """
+        return self.keys is None or len(self.keys) == len(self.value)
+
+
+# The members of an array or object: their keys, values, nodes and spans
+Members = Tuple[List[str], List[object], List[Optional[Node]], List[int],
+                List[int]]
+
+
+class Document:
+    """A parsed JSON document, kept up to date as its text is edited.
+
+    `value` is the parsed document. On every `edit`, only the children of
+    the innermost array or object around the edit are parsed again, and
+    spliced into the existing value, so everything else keeps its
+    identity, and the time taken mostly depends on the size of the edit
+    rather than the document. The text is still copied on every edit,
+    and adding, removing or renaming keys rebuilds their object. Edits
+    that change the structure around them are parsed from the smallest
+    enclosing container that is still valid, up to the whole document.
+
+    Only `str` documents are supported, and values are built as `parse`
+    builds them by default.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.value: object = None
+        self._root: Optional[Node] = None
+        self._root_start = 0
+        self._reset(text)
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> object:
+        """Replaces `deleted` characters at `offset` with `inserted`.
+
+        Returns the new value. If the edit leaves the document invalid,
+        the error `parse` would raise is raised, and nothing changes.
+        """
+        old_text = self.text
+        if offset < 0 or deleted < 0 or offset + deleted > len(old_text):
+            raise ValueError(
+                f"Edit at {offset} of {deleted} characters is out of range")
+
+        text = old_text[:offset] + inserted + old_text[offset + deleted:]
+        delta = len(inserted) - deleted
+        try:
+            self._splice(text, offset, offset + deleted, delta)
+        except Unsupported:
+            self._reset(text)
+
+        self.text = text
+        return self.value
+
+    def _reset(self, text: str) -> None:
+        """Parses the whole document"""
+        try:
+            value, node, start, end = _parse_value(text, 0, len(text))
+            if SCANNER.match(text, end).lastindex is not None:
+                raise Unsupported
+        except Unsupported:
+            # Find the exact error
+            parse(text)
+            raise
+
+        self.value = value
+        self._root = node
+        self._root_start = start
+
+    def _splice(self, text: str, start: int, end: int, delta: int) -> None:
+        """Re-parses the part of the document around an edit.
+
+        `start` and `end` are where the edit was in the old text. Raises
+        `Unsupported` if only the whole document can be parsed again.
+        """
+        # The containers around the edit, each one's start in the old text,
+        # and the index of the next one in its children
+        path: List[Tuple[Node, int, int]] = []
+        node = self._root
+        node_start = self._root_start
+        if node is None or not node_start < start <= end < (
+                node_start + node.length):
+            raise Unsupported
+
+        while True:
+            index = node.starts.bisect_right(start - node_start) - 1
+            if index < 0 or not node.is_simple():
+                break
+
+            child = node.children[index]
+            child_end = node_start + node.ends[index]
+            child_start = child_end - child.length if child else 0
+            if child is None or not child_start < start <= end < child_end:
+                break
+
+            path.append((node, node_start, index))
+            node, node_start = child, child_start
+
+        replaced = self._splice_members(
+            text, node, node_start, start, end, delta)
+        if replaced is not None:
+            self._shift(path, delta)
+            replaced()
+            return
+
+        # The edit changes the innermost container's structure, so try
+        # parsing it whole, then each one around it
+        while path:
+            node_end = node_start + node.length + delta
+            try:
+                value, new_node, _, end = _parse_value(
+                    text, node_start, node_end)
+                if end != node_end:
+                    raise Unsupported
+            except Unsupported:
+                node, node_start, _ = path.pop()
+                continue
+
+            parent, _, index = path[-1]
+            self._shift(path, delta)
+            parent.children[index] = new_node
+            if parent.keys is None:
+                parent.value[index] = value
+            else:
+                parent.value[parent.keys[index]] = value
+            return
+
+        raise Unsupported
+
+    def _splice_members(
+            self,
+            text: str,
+            node: Node,
+            node_start: int,
+            start: int,
+            end: int,
+            delta: int) -> Any:
+        """Re-parses the children of a container that an edit touches.
+
+        Returns a function that puts the new children in place, or None if
+        they can't be parsed on their own.
+        """
+        count = len(node.children)
+        if count == 0 or not node.is_simple():
+            return None
+
+        # The children from the one the edit starts in, or after, to the one
+        # it ends in, or before, so that any comma it touches is included
+        first = max(node.starts.bisect_right(start - node_start) - 1, 0)
+        last = min(node.ends.bisect_left(end - node_start), count - 1)
+
+        region_start = min(node_start + node.starts[first], start)
+        region_end = max(node_start + node.ends[last], end) + delta
+        whole = first == 0 and last == count - 1
+        try:
+            members = _parse_members(
+                text, region_start, region_end, node.keys is not None, whole)
+        except Unsupported:
+            return None
+
+        def replace() -> None:
+            keys, values, children, starts, ends = members
+            old_keys = node.keys
+            stop = last + 1
+            node.starts.shift(stop, delta)
+            node.ends.shift(stop, delta)
+            node.starts.replace(
+                first, stop, [offset - node_start for offset in starts])
+            node.ends.replace(
+                first, stop, [offset - node_start for offset in ends])
+            node.children[first:stop] = children
+            node.length += delta
+
+            if old_keys is None:
+                node.value[first:stop] = values
+                return
+
+            obj = node.value
+            if keys == old_keys[first:stop]:
+                for key, value in zip(keys, values):
+                    obj[key] = value
+                return
+
+            # Keys were added, removed or renamed, so the object is built
+            # again to keep them in order
+            new_keys = old_keys[:first] + keys + old_keys[stop:]
+            new_values = (
+                [obj[key] for key in old_keys[:first]]
+                + values
+                + [obj[key] for key in old_keys[stop:]])
+            node.keys = new_keys
+            obj.clear()
+            obj.update(zip(new_keys, new_values))
+
+        return replace
+
+    @staticmethod
+    def _shift(path: List[Tuple[Node, int, int]], delta: int) -> None:
+        """Moves everything after the edit in the containers on its path"""
+        for node, _, index in path:
+            node.length += delta
+            node.starts.shift(index + 1, delta)
+            node.ends.shift(index, delta)
+
+
+def _parse_value(
+        text: str,
+        index: int,
+        endpos: int) -> Tuple[object, Optional[Node], int, int]:
+    """Parses the value at `index`, recording where every child is.
+
+    Nothing from `endpos` on is read. Returns the value, its node if it's
+    a container, and where it starts and ends. Raises `Unsupported` on any
+    error, for `parse` to find the exact one.
+    """
+    # The containers being built, each one's start, the pending key of
+    # each object with where its member starts, and the spans of the
+    # children so far
+    stack: List[Tuple[Node, int, str, int, List[int], List[int]]] = []
+
+    while True:
+        value, start, index = _scalar(text, index, endpos)
+        node = None
+        if text[start] in CLOSING:
+            closing = CLOSING[value]
+            node = Node(value == '{')
+            found = SCANNER.match(text, index, endpos)
+            if found.group(found.lastindex or 0) == closing:
+                index = found.end()
+                node.length = index - start
+                value = node.value
+            else:
+                key = ''
+                key_start = index
+                if node.keys is not None:
+                    key, key_start, index = _key(text, index, endpos)
+                stack.append((node, start, key, key_start, [], []))
+                continue
+
+        # Add the value to its container, closing as many as possible
+        while stack:
+            parent, parent_start, key, key_start, starts, ends = stack[-1]
+            keys = parent.keys
+            if keys is None:
+                parent.value.append(value)
+                starts.append(start - parent_start)
+            else:
+                parent.value[key] = value
+                keys.append(key)
+                starts.append(key_start - parent_start)
+            ends.append(index - parent_start)
+            parent.children.append(node)
+
+            found = SCANNER.match(text, index, endpos)
+            symbol = found.group(found.lastindex or 0)
+            index = found.end()
+            if found.lastindex != SYMBOL:
+                raise Unsupported
+
+            if symbol == ',':
+                if keys is not None:
+                    key, key_start, index = _key(text, index, endpos)
+                    stack[-1] = (
+                        parent, parent_start, key, key_start, starts, ends)
+                break
+
+            if symbol != ('}' if keys is not None else ']'):
+                raise Unsupported
+
+            stack.pop()
+            node = parent
+            value = parent.value
+            start = parent_start
+            node.length = index - start
+            node.starts = Offsets(starts)
+            node.ends = Offsets(ends)
+
+        else:
+            return value, node, start, index
+
+
+def _parse_members(
+        text: str,
+        index: int,
+        endpos: int,
+        is_object: bool,
+        allow_empty: bool) -> Members:
+    """Parses comma separated array items or object members, up to `endpos`"""
+    members: Members = ([], [], [], [], [])
+    keys, values, children, starts, ends = members
+
+    if SCANNER.match(text, index, endpos).lastindex is None:
+        if not allow_empty:
+            raise Unsupported
+        return members
+
+    while True:
+        if is_object:
+            key, start, index = _key(text, index, endpos)
+            value, node, _, index = _parse_value(text, index, endpos)
+            keys.append(key)
+        else:
+            value, node, start, index = _parse_value(text, index, endpos)
+
+        values.append(value)
+        children.append(node)
+        starts.append(start)
+        ends.append(index)
+
+        found = SCANNER.match(text, index, endpos)
+        if found.lastindex is None:
+            return members
+        if found.group(found.lastindex) != ',':
+            raise Unsupported
+        index = found.end()
+
+
+def _key(text: str, index: int, endpos: int) -> Tuple[str, int, int]:
+    """Reads an object key and its colon. Returns the key, where it starts,
+    and the index after the colon."""
+    key, start, index = _scalar(text, index, endpos)
+    if not isinstance(key, str) or text[start] != '"':
+        raise Unsupported
+
+    found = SCANNER.match(text, index, endpos)
+    if found.lastindex != SYMBOL or found.group(SYMBOL) != ':':
+        raise Unsupported
+
+    return key, start, found.end()
+
+
+def _scalar(text: str, index: int, endpos: int) -> Tuple[Any, int, int]:
+    """Reads the value, or opening bracket, at `index`.
+
+    Returns it, with where it starts and ends. Opening brackets are
+    returned as themselves, to be told apart from strings by the text.
+    """
+    found = SCANNER.match(text, index, endpos)
+    kind = found.lastindex
+    if kind is None:
+        raise Unsupported
+
+    start, end = found.span(kind)
+    token_text = found.group(kind)
+    if kind == STRING:
+        return _decode_string(token_text), start, end
+
+    if kind == NUMBER:
+        if '.' in token_text:
+            return float(token_text), start, end
+        return int(token_text), start, end
+
+    if kind == SYMBOL:
+        if token_text in SPECIAL_VALUES:
+            return SPECIAL_VALUES[token_text], start, end
+        if token_text in CLOSING:
+            return token_text, start, end
+        raise Unsupported
+
+    # Anything unusual goes through the lexer's own extractors, exactly as
+    # when tokenizing
+    tokens: Deque[Token] = deque()
+    try:
+        end, _, _ = extract_token(text, start, tokens, 1, 1)
+    except TokenizeError as err:
+        raise Unsupported from err
+    if end > endpos or not tokens:
+        raise Unsupported
+
+    token = tokens[0]
+    try:
+        if token.type == 'string':
+            return parse_string(token), start, end
+        if token.type == 'number':
+            return parse_number(token), start, end
+    except ParseError as err:
+        raise Unsupported from err
+
+    if token.type in ('boolean', 'null'):
+        return SPECIAL_VALUES[token.value], start, end
+    raise Unsupported
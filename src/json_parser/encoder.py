@@ -0,0 +1,266 @@
+"""Serializing Python objects to JSON, all at once or in chunks"""
+import math
+import re
+from decimal import Decimal
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from json_parser.numeric import RawNumber
+from json_parser.parser import ESCAPES
+
+# How many pieces of output are joined into each chunk
+BATCH_SIZE = 4096
+
+# Characters that have to be escaped in a string, and their escapes. The
+# short escapes are the ones the parser decodes, the rest of the control
+# characters get `\uXXXX`.
+ESCAPE_TABLE: Dict[int, str] = {
+    code: f'\\u{code:04x}' for code in range(0x20)}
+ESCAPE_TABLE.update(
+    (ord(char), '\\' + escape)
+    for escape, char in ESCAPES.items()
+    if escape != '/'
+)
+NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+NEEDS_ASCII_ESCAPE = re.compile(r'["\\]|[^\x20-\x7e]')
+
+MISSING = object()
+
+
+def encode_string(value: str, ensure_ascii: bool = False) -> str:
+    """Encodes a string, with quotes"""
+    if ensure_ascii:
+        if NEEDS_ASCII_ESCAPE.search(value) is None:
+            return '"' + value + '"'
+        return '"' + NEEDS_ASCII_ESCAPE.sub(_ascii_escape, value) + '"'
+
+    if NEEDS_ESCAPE.search(value) is None:
+        return '"' + value + '"'
+
+    return '"' + value.translate(ESCAPE_TABLE) + '"'
+
+
+def _ascii_escape(found: Match[str]) -> str:
+    """Escapes a character outside of printable ASCII"""
+    char = found.group()
+    code = ord(char)
+    if code in ESCAPE_TABLE:
+        return ESCAPE_TABLE[code]
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+
+    # Characters outside the BMP are written as a surrogate pair
+    code -= 0x10000
+    return f'\\u{0xd800 | code >> 10:04x}\\u{0xdc00 | code & 0x3ff:04x}'
+
+
+def encode_float(value: float) -> str:
+    """Encodes a float, always without an exponent.
+
+    The parser doesn't read exponents, so the shortest repr is written out
+    in full instead, eg. `1e+16` as `10000000000000000.0`.
+    """
+    if math.isnan(value) or math.isinf(value):
+        raise ValueError(f"Out of range float values are not JSON: {value}")
+
+    text = repr(value)
+    if 'e' in text:
+        text = format(Decimal(text), 'f')
+        if '.' not in text:
+            text += '.0'
+
+    return text
+
+
+def _encode_decimal(value: Decimal) -> str:
+    """Encodes a Decimal exactly, without an exponent"""
+    if not value.is_finite():
+        raise ValueError(f"Out of range Decimal values are not JSON: {value}")
+
+    return format(value, 'f')
+
+
+def _encode_key(key: object, ensure_ascii: bool) -> str:
+    """Encodes an object key, converting scalars to strings like `json`"""
+    if isinstance(key, str):
+        return encode_string(key, ensure_ascii)
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, int):
+        return '"' + int.__repr__(key) + '"'
+    if isinstance(key, float):
+        return '"' + encode_float(key) + '"'
+
+    raise TypeError(
+        f"Keys must be str, int, float, bool or None, not "
+        f"{type(key).__name__}")
+
+
+def iterencode(
+        obj: object,
+        indent: Union[int, str, None] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = False,
+        default: Optional[Callable[[Any], object]] = None) -> Iterator[str]:
+    """Encodes an object as JSON, yielding the output in chunks.
+
+    Only the chunk being built is kept in memory, so large documents can be
+    written out without ever holding the whole string. Containers are
+    walked with an explicit stack, so nesting isn't limited by recursion.
+
+    `indent` is a number of spaces or a string to indent nested values
+    with, each on its own line. Objects of types JSON has no equivalent
+    for are passed to `default`, which returns something that can be
+    encoded instead, or raises `TypeError`.
+    """
+    if isinstance(indent, int):
+        indent = ' ' * indent
+    item_separator = ', ' if indent is None else ','
+
+    parts: List[str] = []
+    append = parts.append
+
+    # The containers being written, with iterators over their remaining
+    # items, and the ids of those containers, to find cycles. Objects
+    # passed to `default` are marked too, until what they were replaced
+    # with is written, and are kept until then so their ids can't be reused.
+    stack: List[Tuple[Iterator[Any], bool, int, Tuple[object, ...]]] = []
+    markers: Set[int] = set()
+    defaulted: List[object] = []
+    # Whether nothing has been written in the innermost container yet
+    first = True
+
+    value = obj
+    while True:
+        if isinstance(value, str):
+            append(encode_string(value, ensure_ascii))
+        elif value is None:
+            append('null')
+        elif value is True:
+            append('true')
+        elif value is False:
+            append('false')
+        elif isinstance(value, int):
+            append(int.__repr__(value))
+        elif isinstance(value, float):
+            append(encode_float(value))
+
+        elif isinstance(value, (list, tuple, dict)):
+            marker = id(value)
+            if marker in markers:
+                raise ValueError("Circular reference detected")
+            markers.add(marker)
+
+            replaced: Tuple[object, ...] = ()
+            if defaulted:
+                replaced = tuple(defaulted)
+                defaulted.clear()
+
+            if isinstance(value, dict):
+                append('{')
+                items = value.items()
+                stack.append((
+                    iter(sorted(items) if sort_keys else items), True, marker,
+                    replaced))
+            else:
+                append('[')
+                stack.append((iter(value), False, marker, replaced))
+            first = True
+
+        elif isinstance(value, RawNumber):
+            append(value.text)
+        elif isinstance(value, Decimal):
+            append(_encode_decimal(value))
+
+        elif default is not None:
+            marker = id(value)
+            if marker in markers:
+                raise ValueError("Circular reference detected")
+            markers.add(marker)
+            defaulted.append(value)
+            value = default(value)
+            continue
+        else:
+            raise TypeError(
+                f"Object of type {type(value).__name__} "
+                "is not JSON serializable")
+
+        if defaulted:
+            # What they were replaced with was a scalar, now written
+            for replaced_value in defaulted:
+                markers.discard(id(replaced_value))
+            defaulted.clear()
+
+        # Move on to the next value, closing every finished container
+        while stack:
+            items, is_object, marker, replaced = stack[-1]
+            item = next(items, MISSING)
+            if item is MISSING:
+                stack.pop()
+                markers.discard(marker)
+                for replaced_value in replaced:
+                    markers.discard(id(replaced_value))
+                if indent is not None and not first:
+                    append('\n' + indent * len(stack))
+                append('}' if is_object else ']')
+                first = False
+                continue
+
+            if not first:
+                append(item_separator)
+            if indent is not None:
+                append('\n' + indent * len(stack))
+            first = False
+
+            if is_object:
+                key, value = item
+                append(_encode_key(key, ensure_ascii))
+                append(': ')
+            else:
+                value = item
+            break
+
+        else:
+            yield ''.join(parts)
+            return
+
+        if len(parts) >= BATCH_SIZE:
+            yield ''.join(parts)
+            parts.clear()
+
+
+def dumps(
+        obj: object,
+        indent: Union[int, str, None] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = False,
+        default: Optional[Callable[[Any], object]] = None) -> str:
+    """Encodes an object as a JSON string, see `iterencode`"""
+    return ''.join(iterencode(obj, indent, sort_keys, ensure_ascii, default))
+
+
+def dump(
+        obj: object,
+        fp: IO[str],
+        indent: Union[int, str, None] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = False,
+        default: Optional[Callable[[Any], object]] = None) -> None:
+    """Encodes an object as JSON into a text file, one chunk at a time"""
+    for chunk in iterencode(obj, indent, sort_keys, ensure_ascii, default):
+        fp.write(chunk)
@@ -0,0 +1,184 @@
+"""Event based parsing, for documents too large to build in memory"""
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from json_parser.parser import JSONArray, JSONObject
+from json_parser.stream import CHUNK_SIZE, DONE, SEPARATOR, Parser
+
+Event = Tuple[str, str, object]
+Source = Union[str, bytes, IO[Any], Iterable[Union[str, bytes]]]
+
+VALUE_EVENTS = {
+    str: 'string',
+    int: 'number',
+    float: 'number',
+    bool: 'boolean',
+    type(None): 'null',
+}
+
+
+class EventParser(Parser):
+    """Streaming parser that reports what it finds instead of building it.
+
+    Each event is a `(path, event, value)` tuple, where `path` is the dotted
+    path of the value (`item` for every array element), and `event` is one
+    of `start_map`, `map_key`, `end_map`, `start_array`, `end_array`,
+    `string`, `number`, `boolean` or `null`. Containers are never filled,
+    so memory use doesn't grow with the size of the document.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None) -> None:
+        super().__init__(max_depth)
+        self.events: List[Event] = []
+        self._path = ''
+        self._paths: List[str] = []
+
+    def _value_path(self) -> str:
+        """Path of the next value in the innermost container"""
+        container = self._container
+        if container is None:
+            return ''
+
+        name = 'item' if isinstance(container, list) else self._key
+        return f'{self._path}.{name}' if self._path else name
+
+    def _start_container(
+            self,
+            container: Union[JSONArray, JSONObject]) -> None:
+        path = self._value_path()
+        event = 'start_array' if isinstance(container, list) else 'start_map'
+        self.events.append((path, event, None))
+
+        super()._start_container(container)
+        self._paths.append(self._path)
+        self._path = path
+
+    def _add_key(self, key: str) -> None:
+        self.events.append((self._path, 'map_key', key))
+        self._key = key
+
+    def _close_container(self) -> None:
+        container = self._container
+        event = 'end_array' if isinstance(container, list) else 'end_map'
+        self.events.append((self._path, event, None))
+
+        self._path = self._paths.pop()
+        self._container, self._key, self._colon = self._stack.pop()
+        self._state = DONE if self._container is None else SEPARATOR
+
+    def _add_value(self, value: object) -> None:
+        event = VALUE_EVENTS[type(value)]
+        self.events.append((self._value_path(), event, value))
+        self._state = DONE if self._container is None else SEPARATOR
+
+
+def _chunks(source: Source, chunk_size: int) -> Iterator[Union[str, bytes]]:
+    """Splits the source into chunks of text or bytes"""
+    if isinstance(source, (str, bytes)):
+        yield source
+        return
+
+    if hasattr(source, 'read'):
+        read = source.read  # type: ignore
+        chunk = read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = read(chunk_size)
+        return
+
+    yield from source  # type: ignore
+
+
+def _events(
+        source: Source,
+        chunk_size: int,
+        max_depth: Optional[int]) -> Iterator[Event]:
+    """Parses the source, yielding events as each chunk is processed"""
+    parser = EventParser(max_depth)
+
+    for chunk in _chunks(source, chunk_size):
+        parser.feed(chunk)
+        events, parser.events = parser.events, []
+        yield from events
+
+    parser.close()
+    yield from parser.events
+
+
+class Builder:
+    """Builds a container out of the events inside it, fed one at a time"""
+
+    def __init__(self, event: str) -> None:
+        self.value: Union[JSONArray, JSONObject] = (
+            [] if event == 'start_array' else {})
+        self._stack = [self.value]
+        self._keys = ['']
+
+    def add(self, event: str, item: object) -> bool:
+        """Adds the next event, and returns whether the container is done"""
+        stack, keys = self._stack, self._keys
+        if event == 'map_key':
+            keys[-1] = item  # type: ignore
+            return False
+
+        if event in ('end_map', 'end_array'):
+            stack.pop()
+            keys.pop()
+            return not stack
+
+        if event == 'start_map':
+            item = {}
+        elif event == 'start_array':
+            item = []
+
+        container = stack[-1]
+        if isinstance(container, list):
+            container.append(item)
+        else:
+            container[keys[-1]] = item
+
+        if event in ('start_map', 'start_array'):
+            stack.append(item)  # type: ignore
+            keys.append('')
+
+        return False
+
+
+def _build(events: Iterator[Event], event: str) -> object:
+    """Builds the container that `event` started, out of the next events"""
+    builder = Builder(event)
+    for _, event, item in events:
+        if builder.add(event, item):
+            break
+
+    return builder.value
+
+
+def _items(events: Iterator[Event], prefix: str) -> Iterator[object]:
+    """Builds and yields every value found at `prefix`"""
+    for path, event, value in events:
+        if path != prefix:
+            continue
+
+        if event in ('start_map', 'start_array'):
+            yield _build(events, event)
+        elif event not in ('map_key', 'end_map', 'end_array'):
+            yield value
+
+
+def iterparse(
+        source: Source,
+        prefix: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_depth: Optional[int] = None) -> Iterator[Any]:
+    """Parses JSON incrementally from a string, bytes, file or chunks.
+
+    Without a prefix, yields `(path, event, value)` tuples for everything in
+    the document, see `EventParser`. With a prefix, yields every complete
+    value found at that path instead, eg. `prefix='item'` yields each
+    element of a top level array, one at a time.
+    """
+    events = _events(source, chunk_size, max_depth)
+    if prefix is None:
+        return events
+
+    return _items(events, prefix)
@@ -0,0 +1,324 @@
+"""Structural index, for random access into large JSON documents"""
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, NoReturn, Optional, Tuple, Union
+
+from json_parser.buffer import map_file
+from json_parser.lexer import Token
+from json_parser.parser import ParseError, parse, parse_string
+
+Buffer = Union[bytes, mmap.mmap]
+
+# Strings, and the punctuation outside of them. Scalars are never matched,
+# they are found from the separators around them instead.
+STRUCTURE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},:]', re.DOTALL)
+SCALAR = re.compile(
+    rb'"[^"\\]*(?:\\.[^"\\]*)*"|[^\[\]{},:" \t\n\r\x0b\x0c]*', re.DOTALL)
+WHITESPACE = b' \t\n\r\x0b\x0c'
+
+MAGIC = b'JPIX'
+VERSION = 1
+HEADER = struct.Struct('<4sBBqqqq')
+
+QUOTE, COMMA, COLON = ord('"'), ord(','), ord(':')
+LEFT_BRACKET, RIGHT_BRACKET = ord('['), ord(']')
+LEFT_BRACE, RIGHT_BRACE = ord('{'), ord('}')
+
+
+def _offsets() -> 'array[int]':
+    """A compact array of byte offsets"""
+    return array('q')
+
+
+class StructuralIndex:
+    """Byte offsets of every container, key and value in a JSON document.
+
+    The index is built in a single pass over the UTF-8 encoded document,
+    only stopping at strings and punctuation, and stored in flat arrays.
+    Lookups then find the byte range of a value, and only parse that part.
+
+    Only the structure is checked while indexing: values are checked when
+    they are parsed by `get`.
+    """
+
+    def __init__(self, document: Buffer) -> None:
+        self._document = document
+        self._root = 0
+        # Start and end offset of every container, in document order
+        self._starts = _offsets()
+        self._ends = _offsets()
+        # Where the children of every container are in the arrays below
+        self._first_child = _offsets()
+        self._child_count = _offsets()
+        # Start offset of every value in a container (possibly preceded by
+        # whitespace), and of its key, or -1 for array elements
+        self._value_starts = _offsets()
+        self._key_starts = _offsets()
+        self._key_maps: Dict[int, Dict[str, int]] = {}
+
+    @classmethod
+    def build(cls, document: Union[str, bytes]) -> 'StructuralIndex':
+        """Indexes a document held in memory"""
+        if isinstance(document, str):
+            document = document.encode()
+
+        index = cls(document)
+        index._scan()
+        return index
+
+    @classmethod
+    def build_file(cls, path: Union[str, os.PathLike]) -> 'StructuralIndex':
+        """Indexes a file, without reading it into memory"""
+        index = cls(map_file(path))
+        index._scan()
+        return index
+
+    @classmethod
+    def load(
+            cls,
+            index_path: Union[str, os.PathLike],
+            path: Union[str, os.PathLike]) -> 'StructuralIndex':
+        """Loads an index saved by `save`, for the file at `path`"""
+        document = map_file(path)
+        index = cls(document)
+
+        with open(index_path, 'rb') as index_file:
+            header = index_file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"Not a structural index: {index_path}")
+
+            magic, version, itemsize, size, root, containers, children = (
+                HEADER.unpack(header))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a structural index: {index_path}")
+            if itemsize != index._starts.itemsize:
+                raise ValueError("Index was saved on an incompatible platform")
+            if size != len(document):
+                raise ValueError(f"Index doesn't match the document: {path}")
+
+            index._root = root
+            for offsets, count in (
+                    (index._starts, containers),
+                    (index._ends, containers),
+                    (index._first_child, containers),
+                    (index._child_count, containers),
+                    (index._value_starts, children),
+                    (index._key_starts, children)):
+                offsets.fromfile(index_file, count)
+
+        return index
+
+    def save(self, index_path: Union[str, os.PathLike]) -> None:
+        """Saves the index next to its document, to be loaded later"""
+        with open(index_path, 'wb') as index_file:
+            index_file.write(HEADER.pack(
+                MAGIC,
+                VERSION,
+                self._starts.itemsize,
+                len(self._document),
+                self._root,
+                len(self._starts),
+                len(self._value_starts),
+            ))
+            for offsets in (
+                    self._starts,
+                    self._ends,
+                    self._first_child,
+                    self._child_count,
+                    self._value_starts,
+                    self._key_starts):
+                offsets.tofile(index_file)
+
+    def _fail(self) -> NoReturn:
+        """Raises the error `parse` finds in the document"""
+        parse(bytes(self._document).decode())
+        raise ParseError("Invalid JSON structure")
+
+    def _scan(self) -> None:
+        """Records every container, key and value start in the document"""
+        document = self._document
+        starts, ends = self._starts, self._ends
+        first_child, child_count = self._first_child, self._child_count
+        value_starts = self._value_starts
+        key_starts = self._key_starts
+
+        # For every open container: its id, whether it's an object, and the
+        # value and key starts found so far. Also whether it had any strings
+        # or containers in it.
+        stack: List[Tuple[int, bool, List[int], List[int]]] = []
+        has_content: List[bool] = []
+        expecting_key = False
+        key_start = -1
+
+        for found in STRUCTURE.finditer(document):
+            start = found.start()
+            char = document[start]
+
+            if char == QUOTE:
+                if stack:
+                    has_content[-1] = True
+                if key_start != -1:
+                    self._fail()
+                if expecting_key:
+                    key_start = start
+                    expecting_key = False
+                continue
+
+            if char == LEFT_BRACKET or char == LEFT_BRACE:
+                if stack:
+                    has_content[-1] = True
+                elif starts:
+                    self._fail()
+
+                container = len(starts)
+                starts.append(start)
+                ends.append(-1)
+                first_child.append(0)
+                child_count.append(0)
+
+                is_object = char == LEFT_BRACE
+                if is_object:
+                    stack.append((container, True, [], []))
+                    expecting_key = True
+                else:
+                    stack.append((container, False, [start + 1], []))
+                has_content.append(False)
+                continue
+
+            if not stack:
+                self._fail()
+
+            container, is_object, values, keys = stack[-1]
+
+            if char == COMMA:
+                if is_object:
+                    if expecting_key or key_start != -1:
+                        self._fail()
+                    expecting_key = True
+                else:
+                    values.append(start + 1)
+
+            elif char == COLON:
+                if not is_object or key_start == -1:
+                    self._fail()
+                keys.append(key_start)
+                values.append(start + 1)
+                key_start = -1
+
+            else:
+                if is_object != (char == RIGHT_BRACE) or key_start != -1:
+                    self._fail()
+
+                if (not is_object and len(values) == 1
+                        and not has_content[-1]
+                        and not document[values[0]:start].strip(WHITESPACE)):
+                    values.clear()
+
+                stack.pop()
+                has_content.pop()
+                expecting_key = False
+
+                ends[container] = start
+                first_child[container] = len(value_starts)
+                child_count[container] = len(values)
+                value_starts.extend(values)
+                if is_object:
+                    key_starts.extend(keys)
+                else:
+                    key_starts.extend([-1] * len(values))
+
+        if stack:
+            self._fail()
+
+        self._root = self._skip_whitespace(0)
+
+    def _skip_whitespace(self, index: int) -> int:
+        """Finds the first non whitespace byte at or after `index`"""
+        document = self._document
+        end = len(document)
+        while index < end and document[index] in WHITESPACE:
+            index += 1
+
+        return index
+
+    def _container_at(self, offset: int) -> Optional[int]:
+        """Finds the container starting at `offset`, if there is one"""
+        container = bisect_left(self._starts, offset)
+        if container < len(self._starts) and self._starts[container] == offset:
+            return container
+
+        return None
+
+    def _key_map(self, container: int) -> Dict[str, int]:
+        """Maps the keys of an object to their child numbers"""
+        key_map = self._key_maps.get(container)
+        if key_map is not None:
+            return key_map
+
+        key_map = {}
+        first = self._first_child[container]
+        for child in range(first, first + self._child_count[container]):
+            found = SCALAR.match(self._document, self._key_starts[child])
+            assert found is not None
+            text = found.group().decode()
+            if '\\' in text:
+                key = parse_string(Token(text, 'string', 0, 0))
+            else:
+                key = text[1:-1]
+            key_map[key] = child
+
+        self._key_maps[container] = key_map
+        return key_map
+
+    def span(self, pointer: str) -> Tuple[int, int]:
+        """Finds the byte range of the value at a JSON pointer"""
+        start = self._root
+
+        for part in split_pointer(pointer):
+            container = self._container_at(start)
+            if container is None:
+                raise KeyError(pointer)
+
+            if self._document[start] == LEFT_BRACE:
+                child = self._key_map(container).get(part)
+                if child is None:
+                    raise KeyError(pointer)
+            else:
+                if (not part.isdigit()
+                        or int(part) >= self._child_count[container]):
+                    raise KeyError(pointer)
+                child = self._first_child[container] + int(part)
+
+            start = self._skip_whitespace(self._value_starts[child])
+
+        container = self._container_at(start)
+        if container is not None:
+            return start, self._ends[container] + 1
+
+        found = SCALAR.match(self._document, start)
+        assert found is not None
+        return start, found.end()
+
+    def get(self, pointer: str) -> object:
+        """Parses just the value at a JSON pointer, like `/items/1532/name`"""
+        start, end = self.span(pointer)
+        return parse(bytes(self._document[start:end]).decode())
+
+
+def split_pointer(pointer: str) -> List[str]:
+    """Splits a JSON pointer (RFC 6901) into its reference tokens"""
+    if not pointer:
+        return []
+
+    if not pointer.startswith('/'):
+        raise ValueError(f"Invalid JSON pointer: {pointer}")
+
+    return [
+        part.replace('~1', '/').replace('~0', '~')
+        for part in pointer[1:].split('/')
+    ]
+
@@ -0,0 +1,214 @@
+"""Newline delimited JSON (JSONL), read line by line or in parallel"""
+import os
+import re
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError, ParserEngine, parse
+
+# The position at the end of parser and lexer error messages
+POSITION = re.compile(r'\(line (\d+) column (\d+)\)')
+
+CHUNK_SIZE = 4 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+Error = TypeVar('Error', ParseError, TokenizeError)
+# The values parsed out of a chunk, and the line number and error of the
+# line that couldn't be parsed, if any
+ChunkResult = Tuple[List[object], Optional[Tuple[int, Exception]]]
+
+
+def iter_lines(
+        lines: Iterable[Union[str, bytes]],
+        engine: ParserEngine = 'recursive') -> Iterator[object]:
+    """Parses a JSON value out of every line of a file.
+
+    Takes a file opened in text or binary mode, or any iterable of lines.
+    Blank lines are skipped. Errors give the line number in the file, and
+    binary lines that aren't valid UTF-8 raise `ParseError`.
+    """
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        try:
+            yield parse(line, engine=engine)
+        except (ParseError, TokenizeError) as err:
+            raise _at_line(err, lineno) from None
+        except UnicodeDecodeError as err:
+            raise _at_line(_encoding_error(err), lineno) from None
+
+
+def parse_jsonl_parallel(
+        path: Union[str, os.PathLike],
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        engine: ParserEngine = 'recursive',
+        chunk_size: int = CHUNK_SIZE) -> Iterator[object]:
+    """Parses a JSONL file with a pool of worker processes.
+
+    The file is split into chunks of about `chunk_size` bytes, ending on
+    line boundaries, and each worker reads and parses whole chunks. Values
+    are yielded in file order, or with `ordered=False`, chunk by chunk as
+    they finish. `workers` defaults to the number of CPUs, and with a
+    single worker, chunks are parsed in this process instead.
+
+    Only a few chunks per worker are parsed ahead, so memory use doesn't
+    grow with the size of the file. Errors give the line number in the
+    file, after yielding the values before them in the same chunk.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = _chunks(path, chunk_size)
+    if workers == 1:
+        for start, end in chunks:
+            yield from _chunk_values(
+                path, start, _parse_chunk(path, start, end, engine))
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        window = workers * 2
+        pending: Deque[Tuple[int, Future]] = deque()
+        running: Set[Future] = set()
+        starts: Dict[Future, int] = {}
+
+        try:
+            for start, end in chunks:
+                future = executor.submit(
+                    _parse_chunk, path, start, end, engine)
+                if ordered:
+                    pending.append((start, future))
+                    if len(pending) >= window:
+                        start, future = pending.popleft()
+                        yield from _chunk_values(
+                            path, start, future.result())
+                    continue
+
+                starts[future] = start
+                running.add(future)
+                if len(running) >= window:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from _chunk_values(
+                            path, starts.pop(future), future.result())
+
+            for start, future in pending:
+                yield from _chunk_values(path, start, future.result())
+
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from _chunk_values(
+                        path, starts.pop(future), future.result())
+
+        finally:
+            for _, future in pending:
+                future.cancel()
+            for future in running:
+                future.cancel()
+
+
+def _chunks(
+        path: Union[str, os.PathLike],
+        chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """Splits a file into ranges of about `chunk_size`, on line boundaries"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        start = 0
+        while start < size:
+            file.seek(start + chunk_size)
+            file.readline()
+            end = min(file.tell(), size)
+            yield start, end
+            start = end
+
+
+def _parse_chunk(
+        path: Union[str, os.PathLike],
+        start: int,
+        end: int,
+        engine: ParserEngine) -> ChunkResult:
+    """Parses the lines in a range of a file, in a worker process"""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    values: List[object] = []
+    for lineno, line in enumerate(data.split(b'\n'), 1):
+        if not line.strip():
+            continue
+
+        try:
+            values.append(parse(line, engine=engine))
+        except (ParseError, TokenizeError) as err:
+            return values, (lineno, err)
+        except UnicodeDecodeError as err:
+            return values, (lineno, _encoding_error(err))
+
+    return values, None
+
+
+def _chunk_values(
+        path: Union[str, os.PathLike],
+        start: int,
+        result: ChunkResult) -> Iterator[object]:
+    """Yields a chunk's values, then raises its error if it had one"""
+    values, error = result
+    yield from values
+
+    if error is not None:
+        lineno, err = error
+        raise _at_line(err, _count_lines(path, start) + lineno) from None
+
+
+def _count_lines(path: Union[str, os.PathLike], end: int) -> int:
+    """Counts the lines of a file before an offset"""
+    count = 0
+    with open(path, 'rb') as file:
+        while file.tell() < end:
+            data = file.read(min(READ_SIZE, end - file.tell()))
+            if not data:
+                break
+            count += data.count(b'\n')
+
+    return count
+
+
+def _encoding_error(err: UnicodeDecodeError) -> ParseError:
+    """The error for a line that isn't valid UTF-8, at the first byte that
+    can't be decoded"""
+    column = len(err.object[:err.start].decode('utf-8', 'replace')) + 1
+    return ParseError(f"Invalid UTF-8: {err.reason} (line 1 column {column})")
+
+
+def _at_line(err: Error, lineno: int) -> Error:
+    """Moves the position in a single line's error to its line in a file"""
+    message, = err.args
+    new_message, found = POSITION.subn(
+        lambda match: (
+            f"(line {lineno + int(match.group(1)) - 1} "
+            f"column {match.group(2)})"),
+        message)
+    if not found:
+        new_message = f"{message} (line {lineno})"
+
+    return type(err)(new_message)
@@ -0,0 +1,75 @@
+"""Caching decoded object keys across a document, or many documents"""
+import sys
+from typing import Dict, NamedTuple, Optional, Union
+
+
+class KeyCacheStats(NamedTuple):
+    """How well a `KeyCache` is doing"""
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class KeyCache:
+    """Decoded object keys, looked up by their raw token text.
+
+    Records in a large array tend to repeat the same few keys. With a cache,
+    each distinct key is decoded once and interned, and every object after
+    that reuses the same `str`, instead of decoding and storing a new copy.
+
+    At most `maxsize` keys are kept. Once full, new keys aren't cached,
+    unless `lru` is set, in which case the least recently used key is
+    dropped to make room.
+
+    Only the lookups of the parse that built the result are counted. When
+    a fast engine gives up on a document partway, and it's parsed again
+    by the iterative engine, the first attempt's lookups are forgotten.
+    The keys it added stay cached though, so in that document, even a key
+    seen for the first time counts as a hit.
+    """
+
+    def __init__(self, maxsize: int = 4096, lru: bool = False) -> None:
+        self.maxsize = maxsize
+        self.lru = lru
+        self.hits = 0
+        self.misses = 0
+        self._keys: Dict[Union[str, bytes], str] = {}
+
+    def get(self, text: Union[str, bytes]) -> Optional[str]:
+        """Finds the key for a token's text, if it's cached"""
+        key = self._keys.get(text)
+        if key is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.lru:
+            # Dicts keep insertion order, so this makes it the newest
+            del self._keys[text]
+            self._keys[text] = key
+
+        return key
+
+    def add(self, text: Union[str, bytes], key: str) -> str:
+        """Caches a decoded key, and returns its interned copy"""
+        key = sys.intern(key)
+        keys = self._keys
+        if len(keys) >= self.maxsize:
+            if not self.lru or not keys:
+                return key
+
+            del keys[next(iter(keys))]
+
+        keys[text] = key
+        return key
+
+    def stats(self) -> KeyCacheStats:
+        """Hit and miss counts, and how full the cache is"""
+        return KeyCacheStats(
+            self.hits, self.misses, len(self._keys), self.maxsize)
+
+    def clear(self) -> None:
+        """Empties the cache, and resets its statistics"""
+        self._keys.clear()
+        self.hits = self.misses = 0
@@ -0,0 +1,428 @@
+"""Lazy parsing, that only decodes the parts of a document that are used"""
+import re
+from collections import deque
+from collections.abc import Mapping, Sequence
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+from json_parser.lexer import (
+    NUMBER,
+    SCANNER,
+    STRING,
+    SYMBOL,
+    SYMBOL_TYPES,
+    Token,
+    TokenizeError,
+    extract_token,
+)
+from json_parser.numeric import NumberDecoder
+from json_parser.parser import (
+    SPECIAL_VALUES,
+    ParseError,
+    parse,
+    parse_number,
+    parse_string,
+)
+from json_parser.validation import validate
+
+# Strings, and the brackets outside of them
+STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+# Strings, brackets, and quotes that don't start a complete string
+SKIP = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}"]', re.DOTALL)
+
+CLOSING = {'[': ']', '{': '}'}
+
+# A child is either a container with its start offset, or a scalar token's
+# type and text
+Child = Tuple[str, Union[int, str]]
+
+MISSING = object()
+
+
+class TokenReader:
+    """Reads single tokens and values out of a JSON string, on demand"""
+
+    def __init__(
+            self,
+            json_string: str,
+            number_decoder: Optional[NumberDecoder] = None) -> None:
+        self.json_string = json_string
+        self.number_decoder = number_decoder
+
+    def fail(self) -> NoReturn:
+        """Raises the error `parse` finds in the document"""
+        parse(self.json_string, engine='iterative')
+        raise ParseError("Invalid JSON")
+
+    def next_token(self, index: int) -> Tuple[str, str, int, int]:
+        """Finds the token after `index`: its type, text, start and end"""
+        found = SCANNER.match(self.json_string, index)
+        kind = found.lastindex
+        if kind is None:
+            self.fail()
+
+        start, end = found.span(kind)
+        text = found.group(kind)
+        if kind == SYMBOL:
+            return SYMBOL_TYPES[text], text, start, end
+        if kind == STRING:
+            return 'string', text, start, end
+        if kind == NUMBER:
+            return 'number', text, start, end
+
+        tokens: Deque[Token] = deque()
+        try:
+            end, _, _ = extract_token(self.json_string, start, tokens, 0, 0)
+        except TokenizeError:
+            self.fail()
+
+        token, = tokens
+        return token.type, token.value, start, end
+
+    def decode_string(self, text: str) -> str:
+        """Decodes the text of a string token"""
+        if '\\' not in text:
+            return text[1:-1]
+
+        try:
+            return parse_string(Token(text, 'string', 0, 0))
+        except ParseError:
+            self.fail()
+
+    def scalar(self, token_type: str, text: str) -> object:
+        """Decodes a string, number, boolean or null token"""
+        if token_type == 'string':
+            return self.decode_string(text)
+
+        if token_type == 'number':
+            try:
+                return parse_number(
+                    Token(text, 'number', 0, 0), self.number_decoder)
+            except ParseError:
+                self.fail()
+
+        return SPECIAL_VALUES[text]
+
+    def skip(self, index: int) -> int:
+        """Finds the end of the value after `index`, without building it"""
+        token_type, _, start, end = self.next_token(index)
+        if token_type in ('string', 'number', 'boolean', 'null'):
+            return end
+        if token_type not in ('left_bracket', 'left_brace'):
+            self.fail()
+
+        json_string = self.json_string
+        stack = [json_string[start]]
+        for found in SKIP.finditer(json_string, end):
+            char = json_string[found.start()]
+            if char == '"':
+                if found.end() - found.start() == 1:
+                    self.fail()
+            elif char in '[{':
+                stack.append(char)
+            elif CLOSING[stack.pop()] != char:
+                self.fail()
+            elif not stack:
+                return found.end()
+
+        self.fail()
+
+    def check_span(self, start: int, end: int) -> None:
+        """Checks that the text from `start` to `end` is a valid value,
+        without building it"""
+        try:
+            validate(self.json_string[start:end])
+        except (ParseError, TokenizeError, ValueError):
+            self.fail()
+
+
+class LazyDocument(TokenReader):
+    """A JSON string, and the offsets of every container in it"""
+
+    def __init__(self, json_string: str) -> None:
+        super().__init__(json_string)
+        self.closing = self._match_brackets()
+
+    def _match_brackets(self) -> Dict[int, int]:
+        """Maps the offset of every '[' and '{' to its closing bracket"""
+        closing: Dict[int, int] = {}
+        stack: List[int] = []
+        json_string = self.json_string
+
+        for found in STRUCTURE.finditer(json_string):
+            start = found.start()
+            char = json_string[start]
+            if char == '"':
+                continue
+
+            if char in '[{':
+                stack.append(start)
+                continue
+
+            if not stack:
+                self.fail()
+
+            opening = stack.pop()
+            if json_string[opening] + char not in ('[]', '{}'):
+                self.fail()
+
+            closing[opening] = start
+
+        if stack:
+            self.fail()
+
+        return closing
+
+    def child(self, index: int) -> Tuple[Child, int]:
+        """Reads the value starting after `index`, and where it ends"""
+        token_type, text, start, end = self.next_token(index)
+        if token_type in ('left_bracket', 'left_brace'):
+            if start not in self.closing:
+                self.fail()
+
+            return (token_type, start), self.closing[start] + 1
+
+        if token_type not in ('string', 'number', 'boolean', 'null'):
+            self.fail()
+
+        return (token_type, text), end
+
+    def array_children(self, start: int) -> List[Child]:
+        """Finds the elements of the array starting at `start`"""
+        children: List[Child] = []
+        end = self.closing[start]
+
+        token_type, _, _, index = self.next_token(start + 1)
+        if token_type == 'right_bracket':
+            return children
+
+        index = start + 1
+        while True:
+            child, index = self.child(index)
+            children.append(child)
+
+            token_type, _, token_start, index = self.next_token(index)
+            if token_type == 'right_bracket' and token_start == end:
+                return children
+            if token_type != 'comma':
+                self.fail()
+
+    def object_children(self, start: int) -> Dict[str, Child]:
+        """Finds the keys and values of the object starting at `start`"""
+        children: Dict[str, Child] = {}
+        end = self.closing[start]
+
+        token_type, _, _, index = self.next_token(start + 1)
+        if token_type == 'right_brace':
+            return children
+
+        index = start + 1
+        while True:
+            token_type, text, _, index = self.next_token(index)
+            if token_type != 'string':
+                self.fail()
+
+            key = self.decode_string(text)
+
+            token_type, _, _, index = self.next_token(index)
+            if token_type != 'colon':
+                self.fail()
+
+            if key in children:
+                # Only the last value is kept, but an error in the others
+                # is still an error in the document
+                self.check(children[key])
+
+            children[key], index = self.child(index)
+
+            token_type, _, token_start, index = self.next_token(index)
+            if token_type == 'right_brace' and token_start == end:
+                return children
+            if token_type != 'comma':
+                self.fail()
+
+    def check(self, child: Child) -> None:
+        """Checks that a child is valid, without keeping its value"""
+        token_type, payload = child
+        if token_type not in ('left_bracket', 'left_brace'):
+            assert isinstance(payload, str)
+            self.scalar(token_type, payload)
+            return
+
+        assert isinstance(payload, int)
+        self.check_span(payload, self.closing[payload] + 1)
+
+    def value(self, child: Child) -> object:
+        """Decodes a child, or wraps it in a lazy container"""
+        token_type, payload = child
+        if token_type == 'left_bracket':
+            return LazyArray(self, payload)  # type: ignore
+        if token_type == 'left_brace':
+            return LazyObject(self, payload)  # type: ignore
+
+        assert isinstance(payload, str)
+        return self.scalar(token_type, payload)
+
+
+class LazyArray(Sequence):
+    """An array that decodes its elements the first time they're used"""
+
+    __slots__ = ('_document', '_start', '_children', '_values')
+
+    def __init__(self, document: LazyDocument, start: int) -> None:
+        self._document = document
+        self._start = start
+        self._children: Union[List[Child], None] = None
+        self._values: List[object] = []
+
+    def _child_list(self) -> List[Child]:
+        """Finds the elements on first use"""
+        if self._children is None:
+            self._children = self._document.array_children(self._start)
+            self._values = [MISSING] * len(self._children)
+
+        return self._children
+
+    def __len__(self) -> int:
+        return len(self._child_list())
+
+    @overload
+    def __getitem__(self, index: int) -> object: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[object]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> object:
+        children = self._child_list()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(children)))]
+
+        value = self._values[index]
+        if value is MISSING:
+            value = self._document.value(children[index])
+            self._values[index] = value
+
+        return value
+
+    def __iter__(self) -> Iterator[object]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and all(
+            value == other_value for value, other_value in zip(self, other))
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f'LazyArray({list(self)!r})'
+
+
+class LazyObject(Mapping):
+    """An object that decodes its values the first time they're used"""
+
+    __slots__ = ('_document', '_start', '_children', '_values')
+
+    def __init__(self, document: LazyDocument, start: int) -> None:
+        self._document = document
+        self._start = start
+        self._children: Union[Dict[str, Child], None] = None
+        self._values: Dict[str, object] = {}
+
+    def _child_dict(self) -> Dict[str, Child]:
+        """Finds the keys and values on first use"""
+        if self._children is None:
+            self._children = self._document.object_children(self._start)
+
+        return self._children
+
+    def __len__(self) -> int:
+        return len(self._child_dict())
+
+    def __getitem__(self, key: str) -> object:
+        value = self._values.get(key, MISSING)
+        if value is MISSING:
+            value = self._document.value(self._child_dict()[key])
+            self._values[key] = value
+
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._child_dict())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._child_dict()
+
+    def __repr__(self) -> str:
+        return f'LazyObject({dict(self)!r})'
+
+
+def materialize(value: Any) -> object:
+    """Converts lazy containers into regular lists and dicts"""
+    if not isinstance(value, (LazyObject, LazyArray)):
+        return value
+
+    # The containers being converted, with their remaining items
+    root: Union[List[object], Dict[str, object]]
+    root = {} if isinstance(value, LazyObject) else []
+    stack: List[Tuple[Iterator[Any], Any]] = [(_items(value), root)]
+
+    while stack:
+        items, container = stack[-1]
+        for key, item in items:
+            if isinstance(item, (LazyObject, LazyArray)):
+                converted: Any = {} if isinstance(item, LazyObject) else []
+                stack.append((_items(item), converted))
+            else:
+                converted = item
+
+            if key is None:
+                container.append(converted)
+            else:
+                container[key] = converted
+
+            if converted is not item:
+                break
+        else:
+            stack.pop()
+
+    return root
+
+
+def _items(value: Union['LazyObject', 'LazyArray']) -> Iterator[Any]:
+    """Iterates over a lazy container's keys and values, or None and its
+    elements"""
+    if isinstance(value, LazyObject):
+        return iter(value.items())
+    return ((None, item) for item in value)
+
+
+def parse_lazy(json_string: str) -> object:
+    """Parses a JSON string into lazy containers.
+
+    Only the boundaries of every array and object are found up front. The
+    elements of a container are found when it is first used, and each value
+    is only decoded when it is first accessed, and then cached.
+
+    Errors are only raised when the malformed part is reached, and are the
+    ones `parse` would report for the whole document.
+    """
+    document = LazyDocument(json_string)
+    child, index = document.child(0)
+    if SCANNER.match(json_string, index).lastindex is not None:
+        document.fail()
+
+    return document.value(child)
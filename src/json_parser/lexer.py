@@ -1,6 +1,18 @@
 """Lexer functions"""
+import re
+from array import array
+from bisect import bisect_right
 from collections import deque
-from typing import Deque, Literal, NamedTuple, Tuple
+from typing import (
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 from string import whitespace as WHITESPACE
 
 TokenType = Literal[
@@ -16,6 +28,77 @@ TokenType = Literal[
     'colon',
 ]
 
+LexerEngine = Literal['scanner', 'reference']
+
+SYMBOL_TYPES: Dict[str, TokenType] = {
+    '[': 'left_bracket',
+    ']': 'right_bracket',
+    '{': 'left_brace',
+    '}': 'right_brace',
+    ',': 'comma',
+    ':': 'colon',
+    'true': 'boolean',
+    'false': 'boolean',
+    'null': 'null',
+}
+
+# Small integer codes for token types, as stored in a `TokenStream`
+TOKEN_TYPES: Tuple[TokenType, ...] = (
+    'string',
+    'number',
+    'boolean',
+    'null',
+    'left_bracket',
+    'left_brace',
+    'right_bracket',
+    'right_brace',
+    'comma',
+    'colon',
+)
+(
+    STRING_CODE,
+    NUMBER_CODE,
+    BOOLEAN_CODE,
+    NULL_CODE,
+    LEFT_BRACKET_CODE,
+    LEFT_BRACE_CODE,
+    RIGHT_BRACKET_CODE,
+    RIGHT_BRACE_CODE,
+    COMMA_CODE,
+    COLON_CODE,
+) = range(len(TOKEN_TYPES))
+TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+# Symbol codes by their first character, so no substring is needed
+SYMBOL_CODES = {
+    char: TYPE_CODES[token_type] for char, token_type in (
+        ('[', 'left_bracket'),
+        (']', 'right_bracket'),
+        ('{', 'left_brace'),
+        ('}', 'right_brace'),
+        (',', 'comma'),
+        (':', 'colon'),
+        ('t', 'boolean'),
+        ('f', 'boolean'),
+        ('n', 'null'),
+    )
+}
+
+# Skips a whitespace run and matches the whole token after it in one go.
+# Anything the fast alternatives can't handle (errors, raw newlines inside
+# strings, unusual numbers, non-ASCII digits) falls through to `unknown`, and
+# is handed over to the reference extractors to decide what it is.
+SCANNER = re.compile(r'''
+    [ \t\n\r\x0b\x0c]*
+    (?:
+        (?P<symbol>[\[\]{},:]|true(?!\w)|false(?!\w)|null(?!\w))
+      | (?P<string>"[^"\\\n]*(?:\\.[^"\\\n]*)*")
+      | (?P<number>-?[0-9]+(?:\.[0-9]+)?(?![-.\w]))
+      | (?P<unknown>.)
+      | \Z
+    )
+''', re.VERBOSE | re.DOTALL)
+SYMBOL, STRING, NUMBER, UNKNOWN = 1, 2, 3, 4
+
 
 class Token(NamedTuple):
     """Represents a Token extracted by the parser"""
@@ -144,8 +227,33 @@ def extract_special(
     raise TokenizeError(err)
 
 
-def tokenize(json_string: str) -> Deque[Token]:
-    """Converts a JSON string into a queue of tokens"""
+def extract_token(
+        json_string: str,
+        index: int,
+        tokens: Deque[Token],
+        line: int,
+        column: int) -> Tuple[int, int, int]:
+    """Extracts a single non-whitespace token from JSON string"""
+    char = json_string[index]
+
+    if char in '[]{},:':
+        tokens.append(Token(char, SYMBOL_TYPES[char], line, column))
+        return index + 1, line, column + 1
+
+    if char == '"':
+        return extract_string(json_string, index, tokens, line, column)
+
+    if char == '-' or char.isdigit():
+        return extract_number(json_string, index, tokens, line, column)
+
+    return extract_special(json_string, index, tokens, line, column)
+
+
+def tokenize_reference(json_string: str) -> Deque[Token]:
+    """Converts a JSON string into a queue of tokens, one character at a time.
+
+    This is the original lexer loop, kept around to test the scanner against.
+    """
     tokens: Deque[Token] = deque()
 
     line = column = 1
@@ -163,34 +271,310 @@ def tokenize(json_string: str) -> Deque[Token]:
             else:
                 column += 1
 
-        elif char in '[]{},:':
-            token = Token(
-                char,
-                line=line,
-                column=column,
-                type=('left_bracket' if char == '[' else
-                      'right_bracket' if char == ']' else
-                      'left_brace' if char == '{' else
-                      'right_brace' if char == '}' else
-                      'comma' if char == ',' else 'colon')
-            )
-            tokens.append(token)
-            index += 1
-            column += 1
-
-        elif char == '"':
-            index, line, column = extract_string(
+        else:
+            index, line, column = extract_token(
                 json_string, index, tokens, line, column)
 
-        elif char == '-' or char.isdigit():
-            index, line, column = extract_number(
-                json_string, index, tokens, line, column)
+    if len(tokens) == 0:
+        raise TokenizeError("Cannot parse empty string")
 
-        else:
-            index, line, column = extract_special(
-                json_string, index, tokens, line, column)
+    return tokens
+
+
+def tokenize(
+        json_string: str,
+        engine: LexerEngine = 'scanner') -> Deque[Token]:
+    """Converts a JSON string into a queue of tokens"""
+    if engine == 'reference':
+        return tokenize_reference(json_string)
+
+    tokens: Deque[Token] = deque()
+    append = tokens.append
+    # Same as calling Token(...), minus the NamedTuple __new__ overhead
+    new_token = tuple.__new__
+
+    line = 1
+    line_start = 0
+    index = 0
+    end = len(json_string)
+    while index < end:
+        for found in SCANNER.finditer(json_string, index):
+            kind = found.lastindex
+            if kind is None:
+                index = end
+                break
+
+            start, stop = found.span(kind)
+            if (start != index
+                    and json_string.find('\n', index, start) != -1):
+                line += json_string.count('\n', index, start)
+                line_start = json_string.rfind('\n', index, start) + 1
+
+            value = found.group(kind)
+            if kind == SYMBOL:
+                token_type = SYMBOL_TYPES[value]
+            elif kind == STRING:
+                token_type = 'string'
+            elif kind == NUMBER:
+                token_type = 'number'
+            else:
+                index, line, column = extract_token(
+                    json_string, start, tokens, line, start - line_start + 1)
+                line_start = index - column + 1
+                break
+
+            append(new_token(
+                Token, (value, token_type, line, start - line_start + 1)))
+            index = stop
 
     if len(tokens) == 0:
         raise TokenizeError("Cannot parse empty string")
 
     return tokens
+
+
+class TokenStream:
+    """The tokens of a JSON string, stored as offsets into it.
+
+    Every token takes up a type code and its start and end offsets in flat
+    arrays, instead of a `Token` tuple and a substring. Indexing the stream
+    builds a `Token` on demand, with its line and column found through an
+    index of newline offsets that is only created when first needed.
+    """
+
+    def __init__(self, json_string: str) -> None:
+        self.json_string = json_string
+        self.types = array('b')
+        self.starts = array('q')
+        self.ends = array('q')
+        # False if a string token has a newline in it. `tokenize` doesn't
+        # always count those, so tokens have to be taken from it instead
+        self.exact_positions = True
+        self._newlines: Optional['array[int]'] = None
+        self._tokens: Optional[Deque[Token]] = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def _tokenized(self) -> Deque[Token]:
+        """The same tokens, with line numbers as `tokenize` counts them"""
+        if self._tokens is None:
+            self._tokens = tokenize(self.json_string)
+
+        return self._tokens
+
+    def __getitem__(self, index: int) -> Token:
+        if not self.exact_positions:
+            return self._tokenized()[index]
+
+        start = self.starts[index]
+        line, column = self.position(start)
+        return Token(
+            self.json_string[start:self.ends[index]],
+            TOKEN_TYPES[self.types[index]],
+            line,
+            column,
+        )
+
+    def __iter__(self) -> Iterator[Token]:
+        if not self.exact_positions:
+            yield from self._tokenized()
+            return
+
+        for index in range(len(self)):
+            yield self[index]
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Finds the line and column of an offset in the JSON string"""
+        newlines = self._newlines
+        if newlines is None:
+            newlines = self._newlines = array('q', (
+                found.start()
+                for found in re.finditer('\n', self.json_string)))
+
+        line = bisect_right(newlines, offset)
+        line_start = newlines[line - 1] + 1 if line else 0
+        return line + 1, offset - line_start + 1
+
+
+def tokenize_compact(json_string: str) -> TokenStream:
+    """Converts a JSON string into a compact `TokenStream`.
+
+    Raises the same errors as `tokenize`.
+    """
+    stream = TokenStream(json_string)
+    add_type = stream.types.append
+    add_start = stream.starts.append
+    add_end = stream.ends.append
+
+    # Lines are only counted up to the last token that needed them
+    line = 1
+    line_start = 0
+    counted = 0
+
+    index = 0
+    end = len(json_string)
+    while index < end:
+        for found in SCANNER.finditer(json_string, index):
+            kind = found.lastindex
+            if kind is None:
+                index = end
+                break
+
+            start, stop = found.span(kind)
+            if kind == SYMBOL:
+                add_type(SYMBOL_CODES[json_string[start]])
+            elif kind == STRING:
+                add_type(STRING_CODE)
+                # Only possible as an escaped newline, which `tokenize`
+                # doesn't count as a new line
+                if json_string.find('\n', start, stop) != -1:
+                    stream.exact_positions = False
+            elif kind == NUMBER:
+                add_type(NUMBER_CODE)
+            else:
+                tokens: Deque[Token] = deque()
+                if stream.exact_positions:
+                    if json_string.find('\n', counted, start) != -1:
+                        line += json_string.count('\n', counted, start)
+                        line_start = (
+                            json_string.rfind('\n', counted, start) + 1)
+
+                    index, line, column = extract_token(
+                        json_string, start, tokens, line,
+                        start - line_start + 1)
+                    line_start = index - column + 1
+                    counted = index
+                else:
+                    try:
+                        index, _, _ = extract_token(
+                            json_string, start, tokens, 0, 0)
+                    except TokenizeError:
+                        # Raises the error with the right line number
+                        tokenize(json_string)
+                        raise
+
+                token, = tokens
+                if '\n' in token.value:
+                    stream.exact_positions = False
+
+                add_type(TYPE_CODES[token.type])
+                add_start(start)
+                add_end(index)
+                break
+
+            add_start(start)
+            add_end(stop)
+            index = stop
+
+    if len(stream) == 0:
+        raise TokenizeError("Cannot parse empty string")
+
+    return stream
+
+
+class IncrementalLexer:
+    """Tokenizes JSON text that arrives in chunks.
+
+    A token that might continue in the next chunk (an unterminated string, a
+    number or keyword touching the end of the chunk) is held back until more
+    text arrives, so chunk boundaries never change the tokens produced.
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[str] = []
+        self._waiting_for_quote = False
+        self._line = 1
+        # Offset where the current line starts, relative to pending text
+        self._line_start = 0
+
+    def feed(self, text: str) -> Deque[Token]:
+        """Tokenizes a chunk, returning every token completed so far"""
+        self._pending.append(text)
+        if self._waiting_for_quote and '"' not in text:
+            return deque()
+
+        return self._scan(final=False)
+
+    def close(self) -> Deque[Token]:
+        """Tokenizes whatever is left once the input has ended"""
+        return self._scan(final=True)
+
+    def _scan(self, final: bool) -> Deque[Token]:
+        """Extracts tokens from the pending text"""
+        buffer = ''.join(self._pending)
+        tokens: Deque[Token] = deque()
+        append = tokens.append
+        match = SCANNER.match
+        new_token = tuple.__new__
+
+        self._waiting_for_quote = False
+        line = self._line
+        line_start = self._line_start
+        index = 0
+        end = len(buffer)
+        while index < end:
+            found = match(buffer, index)
+            kind = found.lastindex
+            start, stop = found.span(kind) if kind else (end, end)
+            if start != index and buffer.find('\n', index, start) != -1:
+                line += buffer.count('\n', index, start)
+                line_start = buffer.rfind('\n', index, start) + 1
+
+            index = start
+            if kind is None:
+                break
+
+            if kind == UNKNOWN:
+                try:
+                    stop, line, column = extract_token(
+                        buffer, start, tokens, line, start - line_start + 1)
+                except TokenizeError:
+                    if final or not self._may_continue(buffer, start):
+                        raise
+
+                    self._waiting_for_quote = buffer[start] == '"'
+                    break
+
+                if (not final and stop == end
+                        and tokens[-1].type in ('number', 'boolean', 'null')):
+                    tokens.pop()
+                    break
+
+                line_start = stop - column + 1
+
+            else:
+                value = found.group(kind)
+
+                # Numbers and keywords could still be cut short
+                if not final and stop == end and (
+                        kind == NUMBER or kind == SYMBOL and len(value) > 1):
+                    break
+
+                if kind == SYMBOL:
+                    token_type = SYMBOL_TYPES[value]
+                elif kind == STRING:
+                    token_type = 'string'
+                else:
+                    token_type = 'number'
+
+                append(new_token(
+                    Token, (value, token_type, line, start - line_start + 1)))
+
+            index = stop
+
+        self._pending = [buffer[index:]] if index < end else []
+        self._line = line
+        self._line_start = line_start - index
+        return tokens
+
+    @staticmethod
+    def _may_continue(buffer: str, index: int) -> bool:
+        """Whether a token that failed to lex could be fixed by more text"""
+        if buffer[index] == '"':
+            return True
+
+        while index < len(buffer) and buffer[index].isalpha():
+            index += 1
+
+        return index == len(buffer)
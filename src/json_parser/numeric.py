@@ -0,0 +1,126 @@
+"""Number decoding hooks: custom types, Decimal, and lazily decoded numbers"""
+import re
+from decimal import Decimal
+from functools import total_ordering
+from typing import Callable, Optional
+
+# Turns the text of a number token into a value. Raises ValueError or
+# ArithmeticError if the text isn't a valid number.
+NumberDecoder = Callable[[str], object]
+
+# What `int()` and `float()` accept out of a number token: the lexer's
+# digits, with an optional minus sign and decimal point
+NUMBER_TEXT = re.compile(r'-?(?:\d+(?:\.\d*)?|\.\d+)\Z')
+
+# Marks a raw number that hasn't been decoded yet
+MISSING = object()
+
+
+def decode_number(text: str) -> object:
+    """The default decoding, to `int` or `float`"""
+    if '.' in text:
+        return float(text)
+
+    return int(text)
+
+
+@total_ordering
+class RawNumber:
+    """A number that keeps its source text, and is only decoded when used.
+
+    Compares, hashes and converts like the decoded value.
+    """
+
+    __slots__ = ('text', '_decode', '_value')
+
+    def __init__(self, text: str, decode: NumberDecoder = decode_number):
+        self.text = text
+        self._decode = decode
+        self._value: object = MISSING
+
+    @property
+    def value(self) -> object:
+        """The decoded number, decoded on first use"""
+        if self._value is MISSING:
+            self._value = self._decode(self.text)
+
+        return self._value
+
+    def __int__(self) -> int:
+        return int(self.value)  # type: ignore
+
+    def __float__(self) -> float:
+        return float(self.value)  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RawNumber):
+            other = other.value
+
+        return self.value == other
+
+    def __lt__(self, other: object) -> bool:
+        if isinstance(other, RawNumber):
+            other = other.value
+
+        return self.value < other  # type: ignore
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f'RawNumber({self.text!r})'
+
+
+def make_number_decoder(
+        parse_float: Optional[Callable[[str], object]] = None,
+        parse_int: Optional[Callable[[str], object]] = None,
+        decimal: bool = False,
+        raw_numbers: bool = False) -> Optional[NumberDecoder]:
+    """Builds the number decoder for `parse`'s options.
+
+    Returns None when numbers should be decoded the default way, so the
+    parsers can keep using their inline fast paths.
+    """
+    if decimal:
+        if parse_float is not None:
+            raise ValueError("decimal can't be used with parse_float")
+        parse_float = Decimal
+
+    decoder: Optional[NumberDecoder] = None
+    if parse_float is not None or parse_int is not None:
+        decoder = _typed_decoder(
+            float if parse_float is None else parse_float,
+            int if parse_int is None else parse_int,
+        )
+
+    if raw_numbers:
+        return _raw_decoder(decode_number if decoder is None else decoder)
+
+    return decoder
+
+
+def _typed_decoder(
+        to_float: Callable[[str], object],
+        to_int: Callable[[str], object]) -> NumberDecoder:
+    """Decodes numbers with a decimal point and integers separately"""
+    def decode(text: str) -> object:
+        if '.' in text:
+            return to_float(text)
+
+        return to_int(text)
+
+    return decode
+
+
+def _raw_decoder(decoder: NumberDecoder) -> NumberDecoder:
+    """Checks numbers, but leaves decoding them to `RawNumber`"""
+    def decode(text: str) -> object:
+        if NUMBER_TEXT.match(text) is None:
+            raise ValueError(f"Invalid number: {text}")
+
+        return RawNumber(text, decoder)
+
+    return decode
@@ -0,0 +1,106 @@
+"""Parsing the elements of a large top level array in worker processes"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError, Unsupported, parse
+
+# Documents smaller than this aren't worth starting processes for
+PARALLEL_THRESHOLD = 1024 * 1024
+# Each worker gets about this many chunks, so that one slow chunk doesn't
+# hold up the rest
+CHUNKS_PER_WORKER = 4
+
+# Everything up to the next bracket outside of a string, and that bracket
+NEXT_BRACKET = re.compile(
+    r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*([\[\]{}])',
+    re.DOTALL)
+# The separator after a value
+SEPARATOR = re.compile(r'[ \t\n\r\x0b\x0c]*([,\]}])')
+WHITESPACE = ' \t\n\r\x0b\x0c'
+
+
+def parse_parallel(
+        json_string: str,
+        workers: int,
+        options: Dict[str, Any]) -> object:
+    """Parses a top level array's elements with a pool of processes.
+
+    The array is split between elements into a few chunks per worker, each
+    of which is parsed as an array of its own by `parse` with `options`,
+    and the results are joined in order. Raises `Unsupported` for small
+    documents, ones that aren't an array of containers, and on any error,
+    which is left for the serial parse to report.
+    """
+    if len(json_string) < PARALLEL_THRESHOLD:
+        raise Unsupported
+
+    chunks = split_array(
+        json_string, len(json_string) // (workers * CHUNKS_PER_WORKER))
+    if chunks is None or len(chunks) < 2:
+        raise Unsupported
+
+    values: List[object] = []
+    with ProcessPoolExecutor(workers) as executor:
+        try:
+            for part in executor.map(
+                    _parse_chunk, chunks, [options] * len(chunks)):
+                values.extend(part)  # type: ignore
+        except (ParseError, TokenizeError) as err:
+            raise Unsupported from err
+
+    return values
+
+
+def split_array(json_string: str, chunk_size: int) -> Optional[List[str]]:
+    """Splits a top level array into arrays of about `chunk_size`.
+
+    Arrays are only split after an element that is itself an array or
+    object, so that only brackets have to be matched up, and strings and
+    scalars are skipped over by the regex. Returns None if the document
+    doesn't look like a well formed array.
+    """
+    start = len(json_string) - len(json_string.lstrip(WHITESPACE))
+    if not json_string.startswith('[', start):
+        return None
+
+    chunks: List[str] = []
+    chunk_start = index = start + 1
+    target = chunk_start + chunk_size
+    depth = 1
+    while True:
+        found = NEXT_BRACKET.match(json_string, index)
+        if found is None:
+            return None
+
+        index = found.end()
+        if found.group(1) in '[{':
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 0:
+            break
+
+        if depth == 1 and index >= target:
+            separator = SEPARATOR.match(json_string, index)
+            if separator is not None and separator.group(1) == ',':
+                chunks.append(
+                    '[' + json_string[chunk_start:separator.start(1)] + ']')
+                chunk_start = separator.end()
+                target = chunk_start + chunk_size
+
+    # A trailing comma would leave the last chunk empty, and trailing data
+    # is an error, both are left for the serial parse
+    last = json_string[chunk_start:index - 1]
+    if not last.strip(WHITESPACE) or json_string[index:].strip(WHITESPACE):
+        return None
+
+    chunks.append('[' + last + ']')
+    return chunks
+
+
+def _parse_chunk(chunk: str, options: Dict[str, Any]) -> object:
+    """Parses one chunk, in a worker process"""
+    return parse(chunk, **options)
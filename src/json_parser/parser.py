@@ -1,19 +1,108 @@
 """Parser functions"""
-from ast import literal_eval
-from typing import Deque, Dict, List, Union
+import mmap
+import sys
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from json_parser.lexer import Token, tokenize
+from json_parser.lexer import (
+    BOOLEAN_CODE,
+    COLON_CODE,
+    COMMA_CODE,
+    LEFT_BRACE_CODE,
+    LEFT_BRACKET_CODE,
+    NULL_CODE,
+    NUMBER,
+    NUMBER_CODE,
+    RIGHT_BRACE_CODE,
+    RIGHT_BRACKET_CODE,
+    SCANNER,
+    STRING,
+    STRING_CODE,
+    SYMBOL,
+    Token,
+    TokenStream,
+    tokenize,
+    tokenize_compact,
+)
+from json_parser.keys import KeyCache
+from json_parser.numeric import NumberDecoder, make_number_decoder
+
+if TYPE_CHECKING:
+    from json_parser.schema import Validator
+    from json_parser.stats import ParseStats
 
 JSONArray = List[object]
 JSONObject = Dict[str, object]
+# Called with every decoded object, returns what to use in its place
+ObjectHook = Callable[[JSONObject], object]
+# Decodes a string token, see `parse_string`
+StringDecoder = Callable[[Token], str]
 JSONNumber = Union[int, float]
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+ParserEngine = Literal['recursive', 'iterative', 'fused', 'compact']
+
+# An object a fast path has closed, waiting for the object hook, with the
+# container and key or index it was added at, or None at the top level
+PendingObject = Tuple[
+    JSONObject, Union[JSONArray, JSONObject, None], Union[str, int]]
+
+ESCAPES = {
+    '"': '"',
+    '/': '/',
+    '\\': '\\',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+SPECIAL_VALUES = {
+    'true': True,
+    'false': False,
+    'null': None,
+}
 
 
 class ParseError(Exception):
     """Error thrown when invalid JSON tokens are parsed"""
 
 
-def parse_object(tokens: Deque[Token]) -> JSONObject:
+class Violation(Exception):
+    """A value that doesn't match its schema, and the keys leading to it"""
+
+    def __init__(self, message: str, token: Token) -> None:
+        super().__init__(message)
+        self.message = message
+        self.token = token
+        self.path: List[str] = []
+
+
+class Unsupported(Exception):
+    """Raised when the fused parser finds input it leaves to the tokens"""
+
+
+def parse_object(
+        tokens: Deque[Token],
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None,
+        schema: Optional['Validator'] = None,
+        string_decoder: Optional[StringDecoder] = None) -> JSONObject:
     """Parses an object out of JSON tokens"""
     obj: JSONObject = {}
 
@@ -30,7 +119,8 @@ def parse_object(tokens: Deque[Token]) -> JSONObject:
                 f"Expected string key for object, found {token.value} "
                 f"(line {token.line} column {token.column})")
 
-        key = parse_string(token)
+        key = _object_key(token, key_cache, string_decoder)
+        member = None if schema is None else schema.member(key, token)
 
         if len(tokens) == 0:
             column_end = token.column + len(token.value)
@@ -56,7 +146,13 @@ def parse_object(tokens: Deque[Token]) -> JSONObject:
                 "Expected value after colon, found } "
                 f"(line {token.line} column {token.column})")
 
-        value = _parse(tokens)
+        try:
+            value = _parse(
+                tokens, key_cache, number_decoder, object_hook, member,
+                string_decoder)
+        except Violation as err:
+            err.path.append(key)
+            raise
         obj[key] = value
 
         if len(tokens) == 0:
@@ -90,9 +186,16 @@ def parse_object(tokens: Deque[Token]) -> JSONObject:
     return obj
 
 
-def parse_array(tokens: Deque[Token]) -> JSONArray:
+def parse_array(
+        tokens: Deque[Token],
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None,
+        schema: Optional['Validator'] = None,
+        string_decoder: Optional[StringDecoder] = None) -> JSONArray:
     """Parses an array out of JSON tokens"""
     array: JSONArray = []
+    items = None if schema is None else schema.items
 
     # special case:
     if tokens[0].type == 'right_bracket':
@@ -100,7 +203,13 @@ def parse_array(tokens: Deque[Token]) -> JSONArray:
         return array
 
     while tokens:
-        value = _parse(tokens)
+        try:
+            value = _parse(
+                tokens, key_cache, number_decoder, object_hook, items,
+                string_decoder)
+        except Violation as err:
+            err.path.append(str(len(array)))
+            raise
         array.append(value)
 
         token = tokens.popleft()
@@ -130,113 +239,923 @@ def parse_array(tokens: Deque[Token]) -> JSONArray:
 
 def parse_string(token: Token) -> str:
     """Parses a string out of a JSON token"""
-    chars: List[str] = []
+    value = token.value
+    if '\\' not in value:
+        return value[1:-1]
 
-    index = 1
-    end = len(token.value) - 1
-    line, column = token.line, token.column + 1
+    # Copies the text between escapes in runs, and decodes each escape
+    chunks: List[str] = []
+    append = chunks.append
 
-    while index < end:
-        char = token.value[index]
+    index = 1
+    end = len(value) - 1
+    while True:
+        backslash = value.find('\\', index, end)
+        if backslash == -1:
+            append(value[index:end])
+            return ''.join(chunks)
 
-        if char != '\\':
-            chars.append(char)
-            index += 1
-            if char == '\n':
-                line += 1
-                column = 1
-            else:
-                column += 1
-            continue
+        append(value[index:backslash])
 
-        next_char = token.value[index+1]
+        next_char = value[backslash + 1]
         if next_char == 'u':
-            hex_string = token.value[index+2:index+6]
-            try:
-                unicode_char = literal_eval(f'"\\u{hex_string}"')
-            except SyntaxError as err:
-                raise ParseError(
-                    f"Invalid unicode escape: \\u{hex_string} "
-                    f"(line {line} column {column})") from err
+            code = _unicode_escape(token, backslash)
+            index = backslash + 6
 
-            chars.append(unicode_char)
-            index += 6
-            column += 6
+            # A high surrogate followed by a low one is a single character
+            if 0xd800 <= code <= 0xdbff and value.startswith('\\u', index):
+                low_hex = value[index + 2:index + 6]
+                if (len(low_hex) == 4 and HEX_DIGITS.issuperset(low_hex)
+                        and 0xdc00 <= int(low_hex, 16) <= 0xdfff):
+                    low = int(low_hex, 16)
+                    code = 0x10000 + ((code - 0xd800) << 10) + (low - 0xdc00)
+                    index += 6
+
+            append(chr(code))
             continue
 
-        if next_char in ('"', '/', '\\'):
-            chars.append(next_char)
-        elif next_char == 'b':
-            chars.append('\b')
-        elif next_char == 'f':
-            chars.append('\f')
-        elif next_char == 'n':
-            chars.append('\n')
-        elif next_char == 'r':
-            chars.append('\r')
-        elif next_char == 't':
-            chars.append('\t')
-        else:
+        escaped = ESCAPES.get(next_char)
+        if escaped is None:
+            line, column = _string_position(token, backslash)
             raise ParseError(
-                f"Unknown escape sequence: {token.value} "
+                f"Unknown escape sequence: {value} "
                 f"(line {line} column {column})")
 
-        index += 2
-        column += 2
+        append(escaped)
+        index = backslash + 2
 
-    string = ''.join(chars)
-    return string
 
+def _unicode_escape(token: Token, backslash: int) -> int:
+    """Reads the code point of the \\uXXXX escape at `backslash`"""
+    hex_string = token.value[backslash + 2:backslash + 6]
+    if len(hex_string) != 4 or not HEX_DIGITS.issuperset(hex_string):
+        line, column = _string_position(token, backslash)
+        raise ParseError(
+            f"Invalid unicode escape: \\u{hex_string} "
+            f"(line {line} column {column})")
 
-def parse_number(token: Token) -> JSONNumber:
+    return int(hex_string, 16)
+
+
+def _string_position(token: Token, offset: int) -> Tuple[int, int]:
+    """Finds the line and column of a character in a string token"""
+    value = token.value
+    newline = value.rfind('\n', 0, offset)
+    if newline == -1:
+        return token.line, token.column + offset
+
+    return token.line + value.count('\n', 0, offset), offset - newline
+
+
+def parse_number(
+        token: Token,
+        number_decoder: Optional[NumberDecoder] = None) -> JSONNumber:
     """Parses a number out of a JSON token"""
     try:
-        if token.value.isdigit():
-            number: JSONNumber = int(token.value)
-        else:
-            number = float(token.value)
-        return number
+        if number_decoder is not None:
+            return number_decoder(token.value)  # type: ignore
+        if '.' in token.value:
+            return float(token.value)
+        return int(token.value)
 
-    except ValueError as err:
+    except (ValueError, ArithmeticError) as err:
         raise ParseError(
             f"Invalid token: {token.value} "
             f"(line {token.line} column {token.column})") from err
 
 
-def _parse(tokens: Deque[Token]) -> object:
-    """Recursive JSON parse implementation"""
+def _parse(
+        tokens: Deque[Token],
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None,
+        schema: Optional['Validator'] = None,
+        string_decoder: Optional[StringDecoder] = None) -> object:
+    """Recursive JSON parse implementation.
+
+    `string_decoder` is used in place of `parse_string`, for keys and
+    values, when given.
+    """
     token = tokens.popleft()
 
+    if schema is not None:
+        return schema.parse(
+            token, tokens, key_cache, number_decoder, object_hook)
+
     if token.type == 'left_bracket':
-        return parse_array(tokens)
+        return parse_array(
+            tokens, key_cache, number_decoder, object_hook, None,
+            string_decoder)
 
     if token.type == 'left_brace':
-        return parse_object(tokens)
+        obj = parse_object(
+            tokens, key_cache, number_decoder, object_hook, None,
+            string_decoder)
+        if object_hook is not None:
+            return object_hook(obj)
+        return obj
 
     if token.type == 'string':
+        if string_decoder is not None:
+            return string_decoder(token)
         return parse_string(token)
 
     if token.type == 'number':
-        return parse_number(token)
+        return parse_number(token, number_decoder)
 
-    special_tokens = {
-        'true': True,
-        'false': False,
-        'null': None,
-    }
     if token.type in ('boolean', 'null'):
-        return special_tokens[token.value]
+        return SPECIAL_VALUES[token.value]
 
     raise ParseError(
         f"Unexpected token: {token.value} "
         f"(line {token.line} column {token.column})")
 
 
-def parse(json_string: str) -> object:
-    """Parses a JSON string into a Python object"""
-    tokens = tokenize(json_string)
+def _parse_key(
+        tokens: Deque[Token],
+        key_cache: Optional[KeyCache] = None,
+        string_decoder: Optional[StringDecoder] = None) -> Tuple[str, Token]:
+    """Parses an object key and its colon, for the iterative parser"""
+    token = tokens.popleft()
+
+    if not token.type == 'string':
+        raise ParseError(
+            f"Expected string key for object, found {token.value} "
+            f"(line {token.line} column {token.column})")
+
+    key = _object_key(token, key_cache, string_decoder)
+
+    if len(tokens) == 0:
+        column_end = token.column + len(token.value)
+        raise ParseError(
+            "Unexpected end of file while parsing "
+            f"(line {token.line} column {column_end})")
+
+    token = tokens.popleft()
+    if token.type != 'colon':
+        raise ParseError(
+            f"Expected colon, found {token.value} "
+            f"(line {token.line} column {token.column})")
+
+    # Missing value for key
+    if len(tokens) == 0:
+        raise ParseError(
+            "Unexpected end of file while parsing "
+            f"(line {token.line} column {token.column+1})")
+
+    if tokens[0].type == 'right_brace':
+        token = tokens[0]
+        raise ParseError(
+            "Expected value after colon, found } "
+            f"(line {token.line} column {token.column})")
+
+    return key, token
+
+
+def _parse_iterative(
+        tokens: Deque[Token],
+        max_depth: Optional[int] = None,
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None,
+        string_decoder: Optional[StringDecoder] = None) -> object:
+    """Non-recursive JSON parse implementation.
+
+    Runs the same checks as `parse_object` and `parse_array`, but keeps the
+    open containers on an explicit stack, so nesting depth is only limited
+    by `max_depth`. Strings are decoded with `string_decoder`, if given,
+    like `_parse`.
+    """
+    popleft = tokens.popleft
+    depth_limit = sys.maxsize if max_depth is None else max_depth
+    decode_string = parse_string if string_decoder is None else string_decoder
+    special_values = SPECIAL_VALUES
+
+    # The innermost open container, whether it is an array, its current key
+    # if it is an object and the colon token after that key. Enclosing ones
+    # are saved on the stack.
+    container: Union[JSONArray, JSONObject, None] = None
+    in_array = False
+    key = ''
+    colon: Optional[Token] = None
+    stack: List[Tuple[Union[JSONArray, JSONObject, None], str, Any]] = []
+    push = stack.append
+    pop = stack.pop
+
+    while True:
+        token = popleft()
+        token_type = token.type
+
+        if token_type == 'string':
+            value: object = decode_string(token)
+
+        elif token_type == 'number':
+            if number_decoder is None:
+                text = token.value
+                try:
+                    value = float(text) if '.' in text else int(text)
+                except ValueError:
+                    # Raises the error with the token's position
+                    parse_number(token)
+            else:
+                value = parse_number(token, number_decoder)
+
+        elif token_type == 'left_bracket' or token_type == 'left_brace':
+            if len(stack) >= depth_limit:
+                raise ParseError(
+                    f"Maximum nesting depth of {max_depth} exceeded "
+                    f"(line {token.line} column {token.column})")
+
+            if token_type == 'left_bracket':
+                if tokens[0].type == 'right_bracket':
+                    popleft()
+                    value = []
+                else:
+                    push((container, key, colon))
+                    container = []
+                    in_array = True
+                    continue
+
+            elif tokens[0].type == 'right_brace':
+                popleft()
+                value = {} if object_hook is None else object_hook({})
+            else:
+                push((container, key, colon))
+                container = {}
+                in_array = False
+                key, colon = _parse_key(tokens, key_cache, string_decoder)
+                continue
+
+        elif token_type == 'boolean' or token_type == 'null':
+            value = special_values[token.value]
+
+        else:
+            raise ParseError(
+                f"Unexpected token: {token.value} "
+                f"(line {token.line} column {token.column})")
+
+        # Add the value to its container, closing as many as possible
+        while container is not None:
+            if in_array:
+                container.append(value)  # type: ignore
+
+                token = popleft()
+                token_type = token.type
+                if token_type == 'comma':
+                    # trailing comma check
+                    if not tokens:
+                        column_end = token.column + len(token.value)
+                        raise ParseError(
+                            "Unexpected end of file while parsing "
+                            f"(line {token.line} column {column_end})")
+
+                    if tokens[0].type == 'right_bracket':
+                        token = tokens[0]
+                        raise ParseError(
+                            "Expected value after comma, found ] "
+                            f"(line {token.line} column {token.column})")
+
+                    break
+
+                if token_type == 'right_bracket':
+                    value = container
+                    container, key, colon = pop()
+                    in_array = type(container) is list
+                    continue
+
+                raise ParseError(
+                    f"Expected ',' or ']', found {token.value} "
+                    f"(line {token.line} column {token.column})")
+
+            container[key] = value  # type: ignore
+
+            if not tokens:
+                token = colon
+                column_end = token.column + len(token.value)
+                raise ParseError(
+                    "Unexpected end of file while parsing "
+                    f"(line {token.line} column {column_end})")
+
+            token = popleft()
+            token_type = token.type
+            if token_type == 'comma':
+                # A key, its colon and the start of a value follow in
+                # well-formed documents. Anything else goes through the
+                # checks below, for their errors.
+                if len(tokens) > 2:
+                    key_token = popleft()
+                    if (key_token.type == 'string'
+                            and tokens[0].type == 'colon'
+                            and tokens[1].type != 'right_brace'):
+                        if key_cache is None:
+                            key = decode_string(key_token)
+                        else:
+                            key = _object_key(
+                                key_token, key_cache, string_decoder)
+                        colon = popleft()
+                        break
+                    tokens.appendleft(key_token)
+
+                # Trailing comma checks
+                if not tokens:
+                    column_end = token.column + len(token.value)
+                    raise ParseError(
+                        "Unexpected end of file while parsing "
+                        f"(line {token.line} column {column_end})")
+
+                if tokens[0].type == 'right_brace':
+                    token = tokens[0]
+                    raise ParseError(
+                        "Expected value after comma, found } "
+                        f"(line {token.line} column {token.column})")
+
+                key, colon = _parse_key(tokens, key_cache, string_decoder)
+                break
+
+            if token_type == 'right_brace':
+                value = container
+                if object_hook is not None:
+                    value = object_hook(value)
+                container, key, colon = pop()
+                in_array = type(container) is list
+                continue
+
+            raise ParseError(
+                f"Expected ',' or '}}', found {token.value}"
+                f" (line {token.line} column {token.column})")
+
+        else:
+            return value
+
+
+def parse_fused(
+        json_string: str,
+        max_depth: Optional[int] = None,
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None) -> object:
+    """Scans and parses a JSON string in a single pass, without tokens.
+
+    Only well-formed input is handled here: on anything else, including
+    lexer edge cases the scanner doesn't cover, `Unsupported` is raised so
+    the caller can re-run the token based parser and get its exact error.
+    The object hook is only called once the whole document is parsed, so
+    that it's never called twice for the same object.
+    """
+    match = SCANNER.match
+
+    # Containers still being built, and the pending key of every object
+    stack: List[Union[JSONArray, JSONObject]] = []
+    keys: List[str] = []
+    pending: List[PendingObject] = []
+
+    index = 0
+    while True:
+        found = match(json_string, index)
+        kind = found.lastindex
+        text = found.group(kind) if kind else ''
+        index = found.end()
+
+        if kind == STRING:
+            value = _decode_string(text)
+
+        elif kind == NUMBER:
+            try:
+                if number_decoder is not None:
+                    value = number_decoder(text)
+                elif '.' in text:
+                    value = float(text)
+                else:
+                    value = int(text)
+            except (ValueError, ArithmeticError) as err:
+                raise Unsupported from err
+
+        elif kind != SYMBOL:
+            raise Unsupported
+
+        elif text == '[':
+            if max_depth is not None and len(stack) >= max_depth:
+                raise Unsupported
+
+            found = match(json_string, index)
+            if found.group(found.lastindex or 0) == ']':
+                value = []
+                index = found.end()
+            else:
+                stack.append([])
+                continue
+
+        elif text == '{':
+            if max_depth is not None and len(stack) >= max_depth:
+                raise Unsupported
+
+            found = match(json_string, index)
+            if found.group(found.lastindex or 0) == '}':
+                value = {}
+                if object_hook is not None:
+                    pending.append(_pending_object(
+                        value, stack[-1] if stack else None,
+                        keys[-1] if keys else ''))
+                index = found.end()
+            else:
+                key, index = _fused_key(json_string, index, key_cache)
+                keys.append(key)
+                stack.append({})
+                continue
+
+        elif text in SPECIAL_VALUES:
+            value = SPECIAL_VALUES[text]
+
+        else:
+            raise Unsupported
+
+        # Add the value to its container, closing as many as possible
+        while stack:
+            container = stack[-1]
+            if isinstance(container, list):
+                container.append(value)
+            else:
+                container[keys[-1]] = value
+
+            found = match(json_string, index)
+            text = found.group(found.lastindex or 0)
+            index = found.end()
+
+            if text == ',':
+                if isinstance(container, dict):
+                    keys[-1], index = _fused_key(
+                        json_string, index, key_cache)
+                break
+
+            if text == ']' and isinstance(container, list):
+                value = stack.pop()
+            elif text == '}' and isinstance(container, dict):
+                value = stack.pop()
+                keys.pop()
+                if object_hook is not None:
+                    pending.append(_pending_object(
+                        value, stack[-1] if stack else None,
+                        keys[-1] if keys else ''))
+            else:
+                raise Unsupported
+
+        else:
+            if match(json_string, index).lastindex is not None:
+                raise Unsupported
+
+            if object_hook is not None:
+                return _apply_object_hook(value, pending, object_hook)
+            return value
+
+
+def _pending_object(
+        obj: JSONObject,
+        container: Union[JSONArray, JSONObject, None],
+        key: str) -> PendingObject:
+    """An object for the hook, and where it's about to be added"""
+    if type(container) is list:
+        return obj, container, len(container)
+
+    return obj, container, key
+
+
+def _apply_object_hook(
+        value: object,
+        pending: List[PendingObject],
+        object_hook: ObjectHook) -> object:
+    """Calls the object hook on the objects a fast path has built.
+
+    They are in the order they were closed, inner objects first, and each
+    result replaces its object in its container, unless a repeated key has
+    already replaced it. Returns the top level value.
+    """
+    for obj, container, slot in pending:
+        result = object_hook(obj)
+        if container is None:
+            value = result
+        elif container[slot] is obj:  # type: ignore
+            container[slot] = result  # type: ignore
+
+    return value
+
+
+def _fused_key(
+        json_string: str,
+        index: int,
+        key_cache: Optional[KeyCache] = None) -> Tuple[str, int]:
+    """Reads an object key and its colon, for the fused parser"""
+    found = SCANNER.match(json_string, index)
+    if found.lastindex != STRING:
+        raise Unsupported
+
+    key = _cached_key(found.group(STRING), key_cache)
+
+    found = SCANNER.match(json_string, found.end())
+    if found.group(found.lastindex or 0) != ':':
+        raise Unsupported
+
+    return key, found.end()
+
+
+def _decode_string(text: str) -> str:
+    """Decodes a string token's text, for the fused parser"""
+    if '\\' not in text:
+        return text[1:-1]
+
+    try:
+        return parse_string(Token(text, 'string', 0, 0))
+    except ParseError as err:
+        raise Unsupported from err
+
+
+def _object_key(
+        token: Token,
+        key_cache: Optional[KeyCache],
+        string_decoder: Optional[StringDecoder] = None) -> str:
+    """Decodes an object key, going through the cache if there is one"""
+    decode = parse_string if string_decoder is None else string_decoder
+    if key_cache is None:
+        return decode(token)
+
+    key = key_cache.get(token.value)
+    if key is None:
+        key = key_cache.add(token.value, decode(token))
+
+    return key
+
+
+def _cached_key(text: str, key_cache: Optional[KeyCache]) -> str:
+    """Decodes an object key's text, for the single pass parsers"""
+    if key_cache is None:
+        return _decode_string(text)
+
+    key = key_cache.get(text)
+    if key is None:
+        key = key_cache.add(text, _decode_string(text))
+
+    return key
+
+
+def _parse_compact(
+        stream: TokenStream,
+        max_depth: Optional[int] = None,
+        key_cache: Optional[KeyCache] = None,
+        number_decoder: Optional[NumberDecoder] = None,
+        object_hook: Optional[ObjectHook] = None) -> object:
+    """Non-recursive JSON parse over a compact token stream.
+
+    Works like `_parse_iterative`, but reads type codes and offsets instead
+    of `Token` tuples, and only slices out the text of scalar values. Raises
+    `Unsupported` at the first problem, so that the error can be reported
+    by the iterative parser, from the same tokens. Like the fused parser,
+    it only calls the object hook once the whole document is parsed.
+    """
+    json_string = stream.json_string
+    types, starts, ends = stream.types, stream.starts, stream.ends
+    depth_limit = sys.maxsize if max_depth is None else max_depth
+
+    # The innermost open container and its current key, if it is an object.
+    # Enclosing ones are saved on the stack.
+    container: Union[JSONArray, JSONObject, None] = None
+    key = ''
+    stack: List[Tuple[Union[JSONArray, JSONObject, None], str]] = []
+    pending: List[PendingObject] = []
+
+    index = 0
+    try:
+        while True:
+            code = types[index]
+            index += 1
+
+            if code == STRING_CODE:
+                value: object = _decode_string(
+                    json_string[starts[index - 1]:ends[index - 1]])
+
+            elif code == NUMBER_CODE:
+                text = json_string[starts[index - 1]:ends[index - 1]]
+                try:
+                    if number_decoder is not None:
+                        value = number_decoder(text)
+                    elif '.' in text:
+                        value = float(text)
+                    else:
+                        value = int(text)
+                except (ValueError, ArithmeticError) as err:
+                    raise Unsupported from err
+
+            elif code == LEFT_BRACKET_CODE or code == LEFT_BRACE_CODE:
+                if len(stack) >= depth_limit:
+                    raise Unsupported
+
+                if code == LEFT_BRACKET_CODE:
+                    if types[index] == RIGHT_BRACKET_CODE:
+                        index += 1
+                        value = []
+                    else:
+                        stack.append((container, key))
+                        container = []
+                        continue
+
+                elif types[index] == RIGHT_BRACE_CODE:
+                    index += 1
+                    value = {}
+                    if object_hook is not None:
+                        pending.append(
+                            _pending_object(value, container, key))
+                else:
+                    stack.append((container, key))
+                    container = {}
+                    key, index = _compact_key(stream, index, key_cache)
+                    continue
+
+            elif code == BOOLEAN_CODE or code == NULL_CODE:
+                value = SPECIAL_VALUES[
+                    json_string[starts[index - 1]:ends[index - 1]]]
+
+            else:
+                raise Unsupported
+
+            # Add the value to its container, closing as many as possible
+            while container is not None:
+                if type(container) is list:
+                    container.append(value)
+
+                    code = types[index]
+                    index += 1
+                    if code == COMMA_CODE:
+                        if types[index] == RIGHT_BRACKET_CODE:
+                            raise Unsupported
+                        break
+
+                    if code == RIGHT_BRACKET_CODE:
+                        value = container
+                        container, key = stack.pop()
+                        continue
+
+                    raise Unsupported
+
+                container[key] = value  # type: ignore
+
+                code = types[index]
+                index += 1
+                if code == COMMA_CODE:
+                    key, index = _compact_key(stream, index, key_cache)
+                    break
+
+                if code == RIGHT_BRACE_CODE:
+                    value = container
+                    container, key = stack.pop()
+                    if object_hook is not None:
+                        pending.append(
+                            _pending_object(value, container, key))
+                    continue
+
+                raise Unsupported
+
+            else:
+                if index != len(types):
+                    raise Unsupported
+
+                break
+
+    except IndexError as err:
+        raise Unsupported from err
+
+    if object_hook is not None:
+        return _apply_object_hook(value, pending, object_hook)
+    return value
+
+
+def _compact_key(
+        stream: TokenStream,
+        index: int,
+        key_cache: Optional[KeyCache] = None) -> Tuple[str, int]:
+    """Parses an object key and its colon, for the compact parser"""
+    types = stream.types
+    if (types[index] != STRING_CODE
+            or types[index + 1] != COLON_CODE
+            or types[index + 2] == RIGHT_BRACE_CODE):
+        raise Unsupported
+
+    key = _cached_key(
+        stream.json_string[stream.starts[index]:stream.ends[index]],
+        key_cache)
+    return key, index + 2
+
+
+def parse(
+        json_string: Union[str, Buffer],
+        engine: ParserEngine = 'recursive',
+        max_depth: Optional[int] = None,
+        select: Optional[Iterable[str]] = None,
+        key_cache: Optional[KeyCache] = None,
+        parse_float: Optional[Callable[[str], object]] = None,
+        parse_int: Optional[Callable[[str], object]] = None,
+        decimal: bool = False,
+        raw_numbers: bool = False,
+        object_hook: Optional[ObjectHook] = None,
+        object_pairs_hook: Optional[
+            Callable[[List[Tuple[str, object]]], object]] = None,
+        workers: Optional[int] = None,
+        stats: Optional['ParseStats'] = None,
+        schema: Optional[Union[Dict[str, Any], bool, 'Validator']] = None,
+) -> object:
+    """Parses a JSON string into a Python object.
+
+    UTF-8 encoded `bytes`, `bytearray`, `memoryview` and `mmap` inputs are
+    parsed in place, see `parse_buffer`.
+
+    `max_depth` limits how deeply arrays and objects may be nested, and is
+    only supported by the non-recursive engines.
+
+    `select` is a list of JSON pointers like `/items/*/price`, see
+    `parse_selected`. Only those values are built, everything else in the
+    document is skipped over.
+
+    With a `KeyCache`, object keys are decoded once per distinct key and
+    shared between objects. The same cache can be passed to many calls.
+
+    Numbers with a decimal point become `float`s and others `int`s, unless
+    `parse_float` or `parse_int` are given, which are called with the text
+    of the number. `decimal=True` decodes the former as `Decimal`s instead.
+    With `raw_numbers=True`, every number is a `RawNumber` that keeps its
+    text, and is only decoded when its value is used.
+
+    `object_hook` is called with every object once it is decoded, inner
+    objects first, and its result is used in place of the `dict`.
+    `object_pairs_hook` gets the object's `(key, value)` pairs instead, in
+    document order, and takes priority over `object_hook`. Repeated keys
+    are merged before either hook sees them, the last value winning.
+
+    With `workers`, the elements of a large top level array are parsed by
+    that many processes, see `parse_parallel`. Hooks have to be picklable
+    for that, and other inputs are parsed as usual. It is ignored with
+    `select`, `key_cache` or `raw_numbers`, whose results can't be shared
+    between processes.
+
+    Passing a `ParseStats` counts the tokens, escapes, depth and bytes of
+    the document into it, and times tokenizing, string and number decoding
+    and container building separately. It needs the `recursive` or
+    `iterative` engine, and can't be combined with `select` or `workers`.
+
+    With a JSON Schema, values are checked as they are parsed, and the
+    first one that doesn't match raises `SchemaError`, see
+    `compile_schema` for the supported keywords. It needs the `recursive`
+    engine, and can't be combined with `select`, `workers` or `stats`.
+    """
+    number_decoder = make_number_decoder(
+        parse_float, parse_int, decimal, raw_numbers)
+
+    if (workers is not None and workers > 1 and select is None
+            and key_cache is None and not raw_numbers and stats is None
+            and schema is None):
+        if max_depth is not None and engine == 'recursive':
+            raise ValueError("max_depth needs a non-recursive engine")
+        if not isinstance(json_string, str):
+            json_string = str(json_string, 'utf-8')
+
+        from json_parser.parallel import parse_parallel
+        options = {
+            'engine': engine,
+            'max_depth': max_depth,
+            'parse_float': parse_float,
+            'parse_int': parse_int,
+            'decimal': decimal,
+            'object_hook': object_hook,
+            'object_pairs_hook': object_pairs_hook,
+        }
+        try:
+            return parse_parallel(json_string, workers, options)
+        except Unsupported:
+            pass
+
+    if object_pairs_hook is not None:
+        object_hook = _pairs_hook(object_pairs_hook)
+
+    if select is not None:
+        if stats is not None:
+            raise ValueError("stats can't be used with select")
+        if schema is not None:
+            raise ValueError("schema can't be used with select")
+        if max_depth is not None:
+            raise ValueError("max_depth can't be used with select")
+        if object_hook is not None:
+            raise ValueError("object hooks can't be used with select")
+        if not isinstance(json_string, str):
+            json_string = str(json_string, 'utf-8')
+
+        from json_parser.selection import parse_selected
+        return parse_selected(json_string, select, number_decoder)
+
+    if max_depth is not None and engine == 'recursive':
+        raise ValueError("max_depth needs a non-recursive engine")
+
+    if schema is not None:
+        if engine != 'recursive':
+            raise ValueError("schema needs the recursive engine")
+        if stats is not None:
+            raise ValueError("schema can't be used with stats")
+
+        from json_parser.schema import parse_with_schema
+        return parse_with_schema(
+            json_string, schema, key_cache, number_decoder, object_hook)
+
+    if stats is not None:
+        from json_parser.stats import parse_with_stats
+        return parse_with_stats(
+            json_string,
+            stats,
+            engine,
+            max_depth,
+            key_cache,
+            number_decoder,
+            object_hook,
+        )
+
+    if not isinstance(json_string, str):
+        from json_parser.buffer import parse_buffer
+        return parse_buffer(
+            json_string,
+            engine,
+            max_depth,
+            key_cache,
+            number_decoder,
+            object_hook,
+        )
+
+    return _parse_text(
+        json_string,
+        engine,
+        max_depth,
+        key_cache,
+        number_decoder,
+        object_hook,
+    )
+
+
+def _pairs_hook(
+        object_pairs_hook: Callable[[List[Tuple[str, object]]], object],
+) -> ObjectHook:
+    """Turns an `object_pairs_hook` into an `object_hook`"""
+    def object_hook(obj: JSONObject) -> object:
+        return object_pairs_hook(list(obj.items()))
+
+    return object_hook
+
+
+def _key_counts(key_cache: Optional[KeyCache]) -> Tuple[int, int]:
+    """A key cache's hit and miss counts, before a fast path is tried"""
+    if key_cache is None:
+        return 0, 0
+
+    return key_cache.hits, key_cache.misses
+
+
+def _restore_key_counts(
+        key_cache: Optional[KeyCache],
+        counts: Tuple[int, int]) -> None:
+    """Forgets the lookups of a fast path that gave up, as the parse it
+    falls back to looks the same keys up again"""
+    if key_cache is not None:
+        key_cache.hits, key_cache.misses = counts
+
+
+def _parse_text(
+        json_string: str,
+        engine: ParserEngine,
+        max_depth: Optional[int],
+        key_cache: Optional[KeyCache],
+        number_decoder: Optional[NumberDecoder],
+        object_hook: Optional[ObjectHook] = None) -> object:
+    """Parses a JSON string with the given engine"""
+    if engine == 'fused':
+        counts = _key_counts(key_cache)
+        try:
+            return parse_fused(
+                json_string, max_depth, key_cache, number_decoder, object_hook)
+        except Unsupported:
+            _restore_key_counts(key_cache, counts)
+            engine = 'iterative'
+
+    if engine == 'compact':
+        stream = tokenize_compact(json_string)
+        counts = _key_counts(key_cache)
+        try:
+            return _parse_compact(
+                stream, max_depth, key_cache, number_decoder, object_hook)
+        except Unsupported:
+            _restore_key_counts(key_cache, counts)
+            tokens = deque(stream)
+            engine = 'iterative'
+    else:
+        tokens = tokenize(json_string)
+
+    if engine == 'iterative':
+        value = _parse_iterative(
+            tokens, max_depth, key_cache, number_decoder, object_hook)
+    else:
+        value = _parse(tokens, key_cache, number_decoder, object_hook)
 
-    value = _parse(tokens)
     if len(tokens) != 0:
         raise ParseError(
             f"Invalid JSON at {tokens[0].value} "
@@ -0,0 +1,386 @@
+"""Checking documents against a JSON Schema while they are parsed"""
+from collections import OrderedDict
+from decimal import Decimal
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from json_parser.encoder import dumps
+from json_parser.keys import KeyCache
+from json_parser.lexer import Token, tokenize
+from json_parser.numeric import NumberDecoder, RawNumber
+from json_parser.parser import (
+    SPECIAL_VALUES,
+    Buffer,
+    ObjectHook,
+    ParseError,
+    Violation,
+    parse_array,
+    parse_number,
+    parse_object,
+    parse_string,
+)
+
+# A schema object, or `true` or `false`, which match any value and none
+Schema = Union[Dict[str, Any], bool]
+
+# How many compiled schemas are kept
+SCHEMA_CACHE_SIZE = 256
+
+TYPES = frozenset(
+    ('object', 'array', 'string', 'number', 'integer', 'boolean', 'null'))
+# The JSON type of the value starting with each kind of token
+TOKEN_TYPES = {
+    'left_brace': 'object',
+    'left_bracket': 'array',
+    'string': 'string',
+    'number': 'number',
+    'boolean': 'boolean',
+    'null': 'null',
+}
+# Keywords that only describe a schema, and don't constrain anything
+ANNOTATIONS = frozenset((
+    '$schema', '$id', '$comment', 'title', 'description', 'default',
+    'examples', 'deprecated', 'readOnly', 'writeOnly'))
+KEYWORDS = ANNOTATIONS | {
+    'type', 'enum', 'const', 'minimum', 'maximum', 'exclusiveMinimum',
+    'exclusiveMaximum', 'minLength', 'maxLength', 'minItems', 'maxItems',
+    'required', 'properties', 'additionalProperties', 'items'}
+
+# Compiled schemas by the id of the schema they came from. The schema is
+# kept alongside, so that its id can't be reused while it's cached.
+VALIDATORS: 'OrderedDict[int, Tuple[object, Validator]]' = OrderedDict()
+
+
+class SchemaError(ParseError):
+    """Raised when a document doesn't match the schema it's parsed with"""
+
+
+class Validator:
+    """A compiled schema, which checks values as they are parsed.
+
+    Every constraint is looked up once, when the schema is compiled. The
+    type of a value is checked at its first token, before anything is
+    decoded, and the rest of its constraints once it's built. Object
+    members and array items get their own validators, or None where the
+    schema doesn't constrain them, and those are parsed as usual. The
+    `false` schema compiles to a validator that rejects every value.
+    """
+
+    def __init__(self, schema: Schema) -> None:
+        self.never = schema is False
+        if isinstance(schema, bool):
+            schema = {}
+        if not isinstance(schema, dict):
+            raise ValueError(
+                f"Schemas must be objects or booleans, not "
+                f"{type(schema).__name__}")
+
+        unknown = set(schema) - KEYWORDS
+        if unknown:
+            raise ValueError(
+                f"Unsupported schema keyword: {sorted(unknown)[0]}")
+
+        types = schema.get('type')
+        if isinstance(types, str):
+            types = [types]
+        if types is not None and not TYPES.issuperset(types):
+            raise ValueError(f"Unknown schema type: {schema['type']}")
+        self.types: Optional[FrozenSet[str]] = (
+            None if types is None else frozenset(types))
+        self.type_names = (
+            '' if types is None else ' or '.join(sorted(self.types)))
+
+        self.enum: Optional[List[object]] = None
+        if 'enum' in schema:
+            self.enum = list(schema['enum'])
+        if 'const' in schema:
+            self.enum = [schema['const']]
+        # The options as they're compared, so numbers match however they
+        # are decoded
+        self.enum_values: List[object] = [
+            _canonical(option) for option in self.enum or ()]
+
+        # Each bound, exactly as a Decimal, and how a number is compared
+        # to it
+        self.bounds: List[Tuple[object, Decimal, str, str]] = [
+            (schema[keyword], _bound(keyword, schema[keyword]), method, text)
+            for keyword, method, text in (
+                ('minimum', '__ge__', 'at least'),
+                ('maximum', '__le__', 'at most'),
+                ('exclusiveMinimum', '__gt__', 'more than'),
+                ('exclusiveMaximum', '__lt__', 'less than'),
+            )
+            if schema.get(keyword) is not None
+        ]
+
+        self.min_length = _size('minLength', schema.get('minLength', 0))
+        self.max_length = _size('maxLength', schema.get('maxLength'))
+        self.min_items = _size('minItems', schema.get('minItems', 0))
+        self.max_items = _size('maxItems', schema.get('maxItems'))
+
+        self.required: Tuple[str, ...] = tuple(schema.get('required', ()))
+        self.properties: Dict[str, Optional[Validator]] = {
+            key: _compile_member(member)
+            for key, member in schema.get('properties', {}).items()
+        }
+        additional = schema.get('additionalProperties', True)
+        self.closed = additional is False
+        self.additional = (
+            None if self.closed else _compile_member(additional))
+
+        items = schema.get('items')
+        if isinstance(items, list):
+            raise ValueError("Only a single schema is supported for items")
+        self.items = None if items is None else _compile_member(items)
+
+    def member(self, key: str, token: Token) -> Optional['Validator']:
+        """The validator for an object member, found at its key's token"""
+        if key in self.properties:
+            member = self.properties[key]
+        elif self.closed:
+            member = NEVER
+        else:
+            member = self.additional
+
+        if member is not None and member.never:
+            raise Violation(f"Unexpected key {token.value}", token)
+        return member
+
+    def parse(
+            self,
+            token: Token,
+            tokens: Deque[Token],
+            key_cache: Optional[KeyCache],
+            number_decoder: Optional[NumberDecoder],
+            object_hook: Optional[ObjectHook]) -> object:
+        """Parses the value starting at `token`, checking it on the way"""
+        json_type = TOKEN_TYPES.get(token.type)
+        if json_type is None:
+            raise ParseError(
+                f"Unexpected token: {token.value} "
+                f"(line {token.line} column {token.column})")
+
+        if self.never:
+            raise Violation(f"Unexpected value {_found(token)}", token)
+
+        if self.types is not None and json_type not in self.types and not (
+                json_type == 'number'
+                and 'integer' in self.types
+                and _is_integer(token.value)):
+            raise Violation(
+                f"Expected {self.type_names}, found {_found(token)}", token)
+
+        value: Any
+        if json_type == 'object':
+            value = parse_object(
+                tokens, key_cache, number_decoder, object_hook, self)
+            for key in self.required:
+                if key not in value:
+                    raise Violation(
+                        f"Missing required key {dumps(key)}", token)
+
+        elif json_type == 'array':
+            value = parse_array(
+                tokens, key_cache, number_decoder, object_hook, self)
+            self._check_size(len(value), self.min_items, self.max_items,
+                             'items', token)
+
+        elif json_type == 'string':
+            value = parse_string(token)
+            self._check_size(len(value), self.min_length, self.max_length,
+                             'characters', token)
+
+        elif json_type == 'number':
+            value = parse_number(token, number_decoder)
+            if self.bounds:
+                self._check_bounds(token)
+
+        else:
+            value = SPECIAL_VALUES[token.value]
+
+        if self.enum is not None and (
+                ('number', Decimal(token.value)) if json_type == 'number'
+                else _canonical(value)) not in self.enum_values:
+            expected = ', '.join(dumps(option) for option in self.enum)
+            raise Violation(
+                f"Expected one of {expected}, found {_found(token)}",
+                token)
+
+        if json_type == 'object' and object_hook is not None:
+            return object_hook(value)
+        return value
+
+    def _check_size(
+            self,
+            size: int,
+            minimum: Optional[int],
+            maximum: Optional[int],
+            unit: str,
+            token: Token) -> None:
+        """Checks the length of a string, or array"""
+        if minimum and size < minimum:
+            raise Violation(
+                f"Expected at least {minimum} {unit}, found {size}", token)
+        if maximum is not None and size > maximum:
+            raise Violation(
+                f"Expected at most {maximum} {unit}, found {size}", token)
+
+    def _check_bounds(self, token: Token) -> None:
+        """Checks a number against the minimum and maximum"""
+        number = Decimal(token.value)
+        for bound, exact, method, description in self.bounds:
+            if not getattr(number, method)(exact):
+                raise Violation(
+                    f"Expected {description} {bound}, found {token.value}",
+                    token)
+
+
+def compile_schema(schema: Union[Schema, Validator]) -> Validator:
+    """Compiles a schema, or finds it in the cache of compiled schemas.
+
+    Schemas are cached by identity, so the same schema object is only
+    compiled once, and changing it after that has no effect. The
+    supported keywords are `type`, `enum`, `const`, `minimum`, `maximum`,
+    `exclusiveMinimum`, `exclusiveMaximum`, `minLength`, `maxLength`,
+    `minItems`, `maxItems`, `required`, `properties`,
+    `additionalProperties` and `items`, and any schema can be `True` or
+    `False`, to allow any value or none. Any other constraint raises
+    `ValueError`, so it can't be silently ignored.
+    """
+    if isinstance(schema, Validator):
+        return schema
+
+    entry = VALIDATORS.get(id(schema))
+    if entry is not None:
+        VALIDATORS.move_to_end(id(schema))
+        return entry[1]
+
+    validator = Validator(schema)
+    VALIDATORS[id(schema)] = (schema, validator)
+    if len(VALIDATORS) > SCHEMA_CACHE_SIZE:
+        VALIDATORS.popitem(last=False)
+
+    return validator
+
+
+def _compile_member(schema: Schema) -> Optional[Validator]:
+    """Compiles a nested schema, to None if it allows anything"""
+    if schema is True or (
+            isinstance(schema, dict)
+            and not any(key not in ANNOTATIONS for key in schema)):
+        return None
+
+    return Validator(schema)
+
+
+def parse_with_schema(
+        json_string: Union[str, Buffer],
+        schema: Union[Schema, Validator],
+        key_cache: Optional[KeyCache],
+        number_decoder: Optional[NumberDecoder],
+        object_hook: Optional[ObjectHook]) -> object:
+    """Parses a JSON string with the recursive engine, checking the schema.
+
+    The first value that doesn't match raises `SchemaError`, with the JSON
+    pointer and position of that value.
+    """
+    validator = compile_schema(schema)
+    if not isinstance(json_string, str):
+        json_string = str(json_string, 'utf-8')
+
+    tokens = tokenize(json_string)
+    token = tokens.popleft()
+    try:
+        value = validator.parse(
+            token, tokens, key_cache, number_decoder, object_hook)
+    except Violation as err:
+        raise SchemaError(_violation_message(err)) from None
+
+    if len(tokens) != 0:
+        raise ParseError(
+            f"Invalid JSON at {tokens[0].value} "
+            f"(line {tokens[0].line} column {tokens[0].column})")
+
+    return value
+
+
+def _violation_message(err: Violation) -> str:
+    """Describes a violation and where it is"""
+    token = err.token
+    position = f"(line {token.line} column {token.column})"
+    if not err.path:
+        return f"{err.message} {position}"
+
+    pointer = ''.join(
+        '/' + key.replace('~', '~0').replace('/', '~1')
+        for key in reversed(err.path))
+    return f"{err.message} at {pointer} {position}"
+
+
+def _bound(keyword: str, bound: object) -> Decimal:
+    """A minimum or maximum, as a Decimal that numbers compare exactly to"""
+    if isinstance(bound, bool) or not isinstance(
+            bound, (int, float, Decimal)):
+        raise ValueError(
+            f"{keyword} must be a number, not {type(bound).__name__}")
+
+    exact = Decimal(str(bound))
+    if not exact.is_finite():
+        raise ValueError(f"{keyword} must be finite, not {bound}")
+
+    return exact
+
+
+def _size(keyword: str, size: object) -> Optional[int]:
+    """A minimum or maximum length, checked to be a count"""
+    if size is None:
+        return None
+    if isinstance(size, bool) or not isinstance(size, int):
+        raise ValueError(
+            f"{keyword} must be an integer, not {type(size).__name__}")
+    if size < 0:
+        raise ValueError(f"{keyword} must be at least 0, not {size}")
+
+    return size
+
+
+def _is_integer(text: str) -> bool:
+    """Whether a number token has no fractional part, like `2` or `2.0`"""
+    return '.' not in text or text.rstrip('0').endswith('.')
+
+
+def _canonical(value: object) -> object:
+    """A value as it's compared to enum options.
+
+    Numbers become exact `Decimal`s, tagged so that `true` isn't `1`, and
+    so that a number equals an option however either was decoded.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, Decimal, RawNumber)):
+        return 'number', Decimal(str(value))
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    return value
+
+
+def _found(token: Token) -> str:
+    """How to show a value in an error: its token, or its container type"""
+    if token.type in ('left_brace', 'left_bracket'):
+        return 'object' if token.type == 'left_brace' else 'array'
+
+    return token.value
+
+
+# What `additionalProperties: false` compiles to, for the keys it leaves out
+NEVER = Validator(False)
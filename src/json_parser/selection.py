@@ -0,0 +1,219 @@
+"""Parsing only the parts of a document that were asked for"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from json_parser.index import split_pointer
+from json_parser.lazy import MISSING, TokenReader
+from json_parser.lexer import SCANNER, TokenizeError
+from json_parser.numeric import NumberDecoder
+from json_parser.parser import ParseError, _parse_text
+
+# An object key and its colon. Strings can have raw newlines in them, as
+# the lexer allows.
+MEMBER = re.compile(
+    r'[ \t\n\r\x0b\x0c]*("[^"\\]*(?:\\.[^"\\]*)*")[ \t\n\r\x0b\x0c]*:',
+    re.DOTALL)
+# A scalar value and the separator after it
+SKIP_SCALAR = re.compile(r'''
+    [ \t\n\r\x0b\x0c]*
+    (?:"[^"\\]*(?:\\.[^"\\]*)*"|[^ \t\n\r\x0b\x0c\[\]{},:"]+)
+    [ \t\n\r\x0b\x0c]*([,\]}])
+''', re.VERBOSE | re.DOTALL)
+# The separator after a value
+SEPARATOR = re.compile(r'[ \t\n\r\x0b\x0c]*([,\]}])')
+
+WILDCARD = '*'
+
+# The selected paths, as a tree of pointer parts. `None` selects everything
+# under a path.
+SelectTree = Optional[Dict[str, 'SelectTree']]
+
+
+def compile_selectors(selectors: Iterable[str]) -> SelectTree:
+    """Merges JSON pointers, which may use `*` as a part, into a tree"""
+    tree: SelectTree = {}
+    for selector in selectors:
+        tree = _merge(tree, _path_tree(split_pointer(selector)))
+
+    return tree
+
+
+def _path_tree(parts: List[str]) -> SelectTree:
+    """The tree for a single path"""
+    tree: SelectTree = None
+    for part in reversed(parts):
+        tree = {part: tree}
+
+    return tree
+
+
+def _merge(tree: SelectTree, other: SelectTree) -> SelectTree:
+    """Selects everything either tree selects"""
+    if tree is None or other is None:
+        return None
+
+    merged = dict(tree)
+    for part, subtree in other.items():
+        merged[part] = (
+            _merge(merged[part], subtree) if part in merged else subtree)
+
+    return merged
+
+
+class Selection(TokenReader):
+    """Builds the selected values of a document, and skips the rest"""
+
+    def __init__(
+            self,
+            json_string: str,
+            number_decoder: Optional[NumberDecoder] = None) -> None:
+        super().__init__(json_string, number_decoder)
+        self._children: Dict[Tuple[int, str], SelectTree] = {}
+
+    def _child_tree(self, tree: Dict[str, SelectTree], part: str) -> object:
+        """What is selected under `part`, or MISSING if nothing is"""
+        if WILDCARD not in tree:
+            return tree.get(part, MISSING)
+        if part not in tree:
+            return tree[WILDCARD]
+
+        # Both match, merging is cached per tree
+        cache_key = (id(tree), part)
+        if cache_key not in self._children:
+            self._children[cache_key] = _merge(tree[part], tree[WILDCARD])
+        return self._children[cache_key]
+
+    def _separator(self, index: int) -> Tuple[str, int]:
+        """Finds the ',' or closing bracket after a value"""
+        found = SEPARATOR.match(self.json_string, index)
+        if found is None:
+            self.fail()
+
+        return found.group(1), found.end()
+
+    def _skip_member(self, index: int) -> Tuple[str, int]:
+        """Skips the value after `index`, and finds the separator after it"""
+        found = SKIP_SCALAR.match(self.json_string, index)
+        if found is None:
+            return self._separator(self.skip(index))
+
+        return found.group(1), found.end()
+
+    def select(self, index: int, tree: SelectTree) -> Tuple[object, int]:
+        """Reads the value after `index`, keeping only what's selected.
+
+        Returns MISSING as the value if nothing in it was selected.
+        """
+        token_type, text, start, end = self.next_token(index)
+        if token_type in ('string', 'number', 'boolean', 'null'):
+            # A scalar can't contain the rest of the path
+            if tree is not None:
+                return MISSING, end
+            return self.scalar(token_type, text), end
+
+        if token_type not in ('left_bracket', 'left_brace'):
+            self.fail()
+
+        if tree is None:
+            end = self.skip(start)
+            try:
+                value = _parse_text(
+                    self.json_string[start:end],
+                    'fused',
+                    None,
+                    None,
+                    self.number_decoder,
+                )
+            except (ParseError, TokenizeError):
+                self.fail()
+            return value, end
+
+        if token_type == 'left_bracket':
+            return self._select_array(end, tree)
+        return self._select_object(end, tree)
+
+    def _select_array(
+            self,
+            index: int,
+            tree: Dict[str, SelectTree]) -> Tuple[object, int]:
+        """Reads the selected elements of an array, starting after the '['"""
+        array: List[object] = []
+
+        token_type, _, _, end = self.next_token(index)
+        if token_type == 'right_bracket':
+            return array, end
+
+        position = 0
+        while True:
+            subtree = self._child_tree(tree, str(position))
+            if subtree is MISSING:
+                separator, index = self._skip_member(index)
+            else:
+                value, index = self.select(index, subtree)  # type: ignore
+                if value is not MISSING:
+                    array.append(value)
+                separator, index = self._separator(index)
+
+            if separator == ']':
+                return array, index
+            if separator != ',':
+                self.fail()
+
+            position += 1
+
+    def _select_object(
+            self,
+            index: int,
+            tree: Dict[str, SelectTree]) -> Tuple[object, int]:
+        """Reads the selected values of an object, starting after the '{'"""
+        obj: Dict[str, object] = {}
+
+        token_type, _, _, end = self.next_token(index)
+        if token_type == 'right_brace':
+            return obj, end
+
+        json_string = self.json_string
+        while True:
+            found = MEMBER.match(json_string, index)
+            if found is None:
+                self.fail()
+
+            key = self.decode_string(found.group(1))
+            index = found.end()
+            subtree = self._child_tree(tree, key)
+            if subtree is MISSING:
+                separator, index = self._skip_member(index)
+            else:
+                value, index = self.select(index, subtree)  # type: ignore
+                if value is not MISSING:
+                    obj[key] = value
+                separator, index = self._separator(index)
+
+            if separator == '}':
+                return obj, index
+            if separator != ',':
+                self.fail()
+
+
+def parse_selected(
+        json_string: str,
+        selectors: Iterable[str],
+        number_decoder: Optional[NumberDecoder] = None) -> object:
+    """Parses only the values at the given JSON pointers.
+
+    A `*` part matches every key or array index. The result has the shape
+    of the document, but only contains the selected values and the
+    containers along the selected paths, even if nothing in them matched.
+    Array elements that weren't selected are left out, so the remaining
+    ones are renumbered from 0.
+
+    A document that is a single scalar has nothing to select, and gives
+    `None`. Values that aren't selected are skipped by only matching up their
+    brackets and quotes, so errors inside them may not be reported.
+    """
+    selection = Selection(json_string, number_decoder)
+    value, index = selection.select(0, compile_selectors(selectors))
+    if SCANNER.match(json_string, index).lastindex is not None:
+        selection.fail()
+
+    return None if value is MISSING else value
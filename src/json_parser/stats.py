@@ -0,0 +1,166 @@
+"""Counting and timing what a parse spends its time on"""
+import re
+import time
+from typing import Dict, Optional, Union
+
+from json_parser.keys import KeyCache
+from json_parser.lexer import TOKEN_TYPES, Token, tokenize
+from json_parser.numeric import NumberDecoder, decode_number
+from json_parser.parser import (
+    Buffer,
+    ObjectHook,
+    ParseError,
+    ParserEngine,
+    _parse,
+    _parse_iterative,
+    parse_string,
+)
+
+# An escape inside a string token, `\uXXXX` counting as one
+ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{4}|.)', re.DOTALL)
+
+
+class ParseStats:
+    """Where parses spend their time, filled in by `parse(..., stats=...)`.
+
+    Counters add up over every parse the same object is passed to, so one
+    instance can collect totals for a whole service, and `max_depth` is
+    the deepest nesting seen in any of them. Times are in seconds.
+
+    Every string and number the parser decodes is timed as it is, and
+    the rest of the parse is counted as container building. Keys found in
+    a `KeyCache` aren't decoded, so they don't count as string time.
+    Timing every value adds to the time of the parse, but without stats,
+    nothing is counted and the parse costs the same as ever.
+    """
+
+    def __init__(self) -> None:
+        self.parses = 0
+        self.bytes = 0
+        self.tokens: Dict[str, int] = dict.fromkeys(TOKEN_TYPES, 0)
+        self.escapes = 0
+        self.max_depth = 0
+        self.tokenize_time = 0.0
+        self.string_time = 0.0
+        self.number_time = 0.0
+        self.container_time = 0.0
+
+    @property
+    def total_time(self) -> float:
+        """The time spent in every phase together"""
+        return (
+            self.tokenize_time
+            + self.string_time
+            + self.number_time
+            + self.container_time
+        )
+
+    def as_dict(self) -> Dict[str, object]:
+        """The counters as a dict, ready to be logged or sent as JSON"""
+        return {
+            'parses': self.parses,
+            'bytes': self.bytes,
+            'tokens': dict(self.tokens),
+            'escapes': self.escapes,
+            'max_depth': self.max_depth,
+            'tokenize_time': self.tokenize_time,
+            'string_time': self.string_time,
+            'number_time': self.number_time,
+            'container_time': self.container_time,
+            'total_time': self.total_time,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f'ParseStats(parses={self.parses}, bytes={self.bytes}, '
+            f'tokens={sum(self.tokens.values())}, '
+            f'max_depth={self.max_depth}, '
+            f'total_time={self.total_time:.6f})'
+        )
+
+
+def parse_with_stats(
+        json_string: Union[str, Buffer],
+        stats: ParseStats,
+        engine: ParserEngine,
+        max_depth: Optional[int],
+        key_cache: Optional[KeyCache],
+        number_decoder: Optional[NumberDecoder],
+        object_hook: Optional[ObjectHook]) -> object:
+    """Parses a JSON string with a token engine, counting into `stats`"""
+    if engine not in ('recursive', 'iterative'):
+        raise ValueError("stats needs the 'recursive' or 'iterative' engine")
+
+    if isinstance(json_string, str):
+        size = len(json_string.encode('utf-8', 'surrogatepass'))
+    else:
+        size = len(json_string)
+        json_string = str(json_string, 'utf-8')
+
+    start = time.perf_counter()
+    tokens = tokenize(json_string)
+    tokenize_time = time.perf_counter() - start
+
+    counts = dict.fromkeys(TOKEN_TYPES, 0)
+    escapes = 0
+    depth = deepest = 0
+    for token in tokens:
+        token_type = token.type
+        counts[token_type] += 1
+        if token_type == 'string':
+            if '\\' in token.value:
+                escapes += len(ESCAPE.findall(token.value))
+        elif token_type in ('left_bracket', 'left_brace'):
+            depth += 1
+            if depth > deepest:
+                deepest = depth
+        elif token_type in ('right_bracket', 'right_brace'):
+            depth -= 1
+
+    # The parser decodes through these, which time every call
+    perf_counter = time.perf_counter
+    string_time = number_time = 0.0
+    decode = decode_number if number_decoder is None else number_decoder
+
+    def timed_string(token: Token) -> str:
+        nonlocal string_time
+        start = perf_counter()
+        value = parse_string(token)
+        string_time += perf_counter() - start
+        return value
+
+    def timed_number(text: str) -> object:
+        nonlocal number_time
+        start = perf_counter()
+        value = decode(text)
+        number_time += perf_counter() - start
+        return value
+
+    start = perf_counter()
+    if engine == 'iterative':
+        value = _parse_iterative(
+            tokens, max_depth, key_cache, timed_number, object_hook,
+            timed_string)
+    else:
+        value = _parse(
+            tokens, key_cache, timed_number, object_hook, None, timed_string)
+    parse_time = perf_counter() - start
+
+    if len(tokens) != 0:
+        raise ParseError(
+            f"Invalid JSON at {tokens[0].value} "
+            f"(line {tokens[0].line} column {tokens[0].column})")
+
+    # Only successful parses are counted
+    stats.parses += 1
+    stats.bytes += size
+    for token_type, count in counts.items():
+        stats.tokens[token_type] += count
+    stats.escapes += escapes
+    stats.max_depth = max(stats.max_depth, deepest)
+    stats.tokenize_time += tokenize_time
+    stats.string_time += string_time
+    stats.number_time += number_time
+    stats.container_time += max(parse_time - string_time - number_time, 0.0)
+
+    return value
@@ -0,0 +1,239 @@
+"""Incremental parsing of JSON that arrives in chunks"""
+import codecs
+import sys
+from typing import IO, Any, List, Optional, Tuple, Union
+
+from json_parser.lexer import IncrementalLexer, Token, TokenizeError
+from json_parser.parser import (
+    JSONArray,
+    JSONObject,
+    SPECIAL_VALUES,
+    ParseError,
+    parse_number,
+    parse_string,
+)
+
+# What the parser expects to see next
+VALUE = 0           # the top level value
+ARRAY_FIRST = 1     # right after '[': a value or ']'
+ARRAY_NEXT = 2      # after a comma in an array
+OBJECT_FIRST = 3    # right after '{': a key or '}'
+OBJECT_NEXT = 4     # after a comma in an object
+COLON = 5           # after an object key
+OBJECT_VALUE = 6    # after a colon
+SEPARATOR = 7       # after a value inside a container: ',' or closing
+DONE = 8            # the top level value is complete
+
+VALUE_TYPES = ('string', 'number', 'boolean', 'null')
+CHUNK_SIZE = 64 * 1024
+
+
+class Parser:
+    """Parses JSON fed to it one chunk at a time.
+
+    Chunks can be `str` or UTF-8 encoded `bytes`, and can be split anywhere,
+    even in the middle of a string, number or escape sequence. Only the
+    containers being built are kept around between chunks, so memory use
+    depends on the chunk size and the result, not the size of the input.
+
+    Errors are raised as soon as they are found, so unlike `parse`, a
+    grammar error can be reported before a lexer error further ahead.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None) -> None:
+        self._lexer = IncrementalLexer()
+        self._decoder: Optional[codecs.IncrementalDecoder] = None
+        self._depth_limit = sys.maxsize if max_depth is None else max_depth
+        self._max_depth = max_depth
+
+        self._state = VALUE
+        self._last_token: Optional[Token] = None
+        self._value: object = None
+        # The innermost open container, its current key and the colon token
+        # after that key. Enclosing containers are saved on the stack.
+        self._container: Union[JSONArray, JSONObject, None] = None
+        self._key = ''
+        self._colon: Optional[Token] = None
+        self._stack: List[
+            Tuple[Union[JSONArray, JSONObject, None], str, Any]] = []
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        """Parses the next chunk of input"""
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+            chunk = self._decoder.decode(chunk)
+
+        for token in self._lexer.feed(chunk):
+            self._consume(token)
+
+    def close(self) -> object:
+        """Finishes parsing, and returns the parsed value"""
+        if self._decoder is not None:
+            for token in self._lexer.feed(self._decoder.decode(b'', True)):
+                self._consume(token)
+
+        for token in self._lexer.close():
+            self._consume(token)
+
+        if self._state == DONE:
+            return self._value
+
+        token = self._last_token
+        if token is None:
+            raise TokenizeError("Cannot parse empty string")
+
+        # Same as `parse_object`, which reports the colon before the value
+        if self._state == SEPARATOR and isinstance(self._container, dict):
+            token = self._colon
+
+        assert token is not None
+        column_end = token.column + len(token.value)
+        raise ParseError(
+            "Unexpected end of file while parsing "
+            f"(line {token.line} column {column_end})")
+
+    def _consume(self, token: Token) -> None:
+        """Advances the parser by a single token"""
+        self._last_token = token
+        state = self._state
+        token_type = token.type
+
+        if state == SEPARATOR:
+            if isinstance(self._container, list):
+                if token_type == 'comma':
+                    self._state = ARRAY_NEXT
+                elif token_type == 'right_bracket':
+                    self._close_container()
+                else:
+                    raise ParseError(
+                        f"Expected ',' or ']', found {token.value} "
+                        f"(line {token.line} column {token.column})")
+
+            elif token_type == 'comma':
+                self._state = OBJECT_NEXT
+            elif token_type == 'right_brace':
+                self._close_container()
+            else:
+                raise ParseError(
+                    f"Expected ',' or '}}', found {token.value}"
+                    f" (line {token.line} column {token.column})")
+
+        elif state in (OBJECT_FIRST, OBJECT_NEXT):
+            if token_type == 'string':
+                self._add_key(parse_string(token))
+                self._state = COLON
+            elif token_type == 'right_brace':
+                if state == OBJECT_NEXT:
+                    raise ParseError(
+                        "Expected value after comma, found } "
+                        f"(line {token.line} column {token.column})")
+
+                self._close_container()
+            else:
+                raise ParseError(
+                    f"Expected string key for object, found {token.value} "
+                    f"(line {token.line} column {token.column})")
+
+        elif state == COLON:
+            if token_type != 'colon':
+                raise ParseError(
+                    f"Expected colon, found {token.value} "
+                    f"(line {token.line} column {token.column})")
+
+            self._colon = token
+            self._state = OBJECT_VALUE
+
+        elif state == DONE:
+            raise ParseError(
+                f"Invalid JSON at {token.value} "
+                f"(line {token.line} column {token.column})")
+
+        elif token_type in VALUE_TYPES:
+            if token_type == 'string':
+                value: object = parse_string(token)
+            elif token_type == 'number':
+                value = parse_number(token)
+            else:
+                value = SPECIAL_VALUES[token.value]
+
+            self._add_value(value)
+
+        elif token_type in ('left_bracket', 'left_brace'):
+            if len(self._stack) >= self._depth_limit:
+                raise ParseError(
+                    f"Maximum nesting depth of {self._max_depth} exceeded "
+                    f"(line {token.line} column {token.column})")
+
+            if token_type == 'left_bracket':
+                self._start_container([])
+                self._state = ARRAY_FIRST
+            else:
+                self._start_container({})
+                self._state = OBJECT_FIRST
+
+        elif token_type == 'right_bracket' and state == ARRAY_FIRST:
+            self._close_container()
+
+        elif token_type == 'right_bracket' and state == ARRAY_NEXT:
+            raise ParseError(
+                "Expected value after comma, found ] "
+                f"(line {token.line} column {token.column})")
+
+        elif token_type == 'right_brace' and state == OBJECT_VALUE:
+            raise ParseError(
+                "Expected value after colon, found } "
+                f"(line {token.line} column {token.column})")
+
+        else:
+            raise ParseError(
+                f"Unexpected token: {token.value} "
+                f"(line {token.line} column {token.column})")
+
+    def _start_container(
+            self,
+            container: Union[JSONArray, JSONObject]) -> None:
+        """Opens a new innermost container"""
+        self._stack.append((self._container, self._key, self._colon))
+        self._container = container
+
+    def _add_key(self, key: str) -> None:
+        """Sets the key the next value is stored under"""
+        self._key = key
+
+    def _close_container(self) -> None:
+        """Pops the innermost container, and adds it to its parent"""
+        value = self._container
+        self._container, self._key, self._colon = self._stack.pop()
+        self._add_value(value)
+
+    def _add_value(self, value: object) -> None:
+        """Adds a complete value to the innermost container"""
+        container = self._container
+        if container is None:
+            self._value = value
+            self._state = DONE
+            return
+
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[self._key] = value
+
+        self._state = SEPARATOR
+
+
+def load(
+        fp: IO[Any],
+        chunk_size: int = CHUNK_SIZE,
+        max_depth: Optional[int] = None) -> object:
+    """Parses JSON from a text or binary file, reading it in chunks"""
+    parser = Parser(max_depth)
+
+    chunk = fp.read(chunk_size)
+    while chunk:
+        parser.feed(chunk)
+        chunk = fp.read(chunk_size)
+
+    return parser.close()
@@ -0,0 +1,604 @@
+"""Parsing JSON straight into dataclasses, named tuples and typed dicts"""
+import collections.abc
+import typing
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from json_parser.lazy import TokenReader
+from json_parser.lexer import NUMBER, SCANNER, STRING, SYMBOL, TokenizeError
+from json_parser.parser import (
+    Buffer,
+    ParseError,
+    SPECIAL_VALUES,
+    _parse_text,
+    parse,
+)
+from json_parser.selection import MEMBER, SEPARATOR
+
+# Decodes the value after an offset, and returns it with the offset after it
+Decoder = Callable[[TokenReader, int], Tuple[Any, int]]
+# Decodes an object member's value, given its key's token text and the
+# offset after the colon, and returns the offset after the value
+Member = Callable[[str, int], int]
+
+SCALAR_TYPES = ('string', 'number', 'boolean', 'null')
+
+# Marks a field that hasn't been found in the object yet
+MISSING = object()
+
+# What the generic types' origins can be, across Python versions
+SEQUENCES = (list, List, collections.abc.Sequence, typing.Sequence)
+MAPPINGS = (dict, Dict, collections.abc.Mapping, typing.Mapping)
+
+# How many target types' decoders are kept
+DECODER_CACHE_SIZE = 1024
+
+# Decoders of the types being built, so that types that refer to themselves
+# can decode their own fields
+BUILDING: Dict[object, Decoder] = {}
+
+
+class DecodeError(ParseError):
+    """Raised when a valid JSON document doesn't fit the target type"""
+
+
+class Mismatch(Exception):
+    """A value that doesn't fit its type, and the keys leading to it"""
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(message)
+        self.message = message
+        self.offset = offset
+        self.path: List[str] = []
+
+
+def parse_into(json_string: Union[str, Buffer], target: Any) -> Any:
+    """Parses a JSON string into an instance of `target`.
+
+    Dataclasses, `NamedTuple`s and `TypedDict`s are built straight from the
+    document's tokens, without decoding objects into dicts first. Their
+    fields can use `int`, `float`, `Decimal`, `str`, `bool`, `None`,
+    `list`, `tuple` and `dict` types, `Optional` and `Union`s of those, or
+    other dataclasses, named tuples and typed dicts. `Any` and `object`
+    take any JSON value.
+
+    Members that aren't fields are skipped, and missing fields use their
+    defaults. A document that is valid JSON, but doesn't fit the types,
+    raises `DecodeError`.
+    """
+    if not isinstance(json_string, str):
+        json_string = str(json_string, 'utf-8')
+
+    reader = TokenReader(json_string)
+    try:
+        value, index = get_decoder(target)(reader, 0)
+    except Mismatch as err:
+        # Syntax errors anywhere in the document are reported first
+        parse(json_string, engine='fused')
+        raise DecodeError(_mismatch_message(json_string, err)) from None
+
+    if SCANNER.match(json_string, index).lastindex is not None:
+        reader.fail()
+
+    return value
+
+
+def _mismatch_message(json_string: str, err: Mismatch) -> str:
+    """Describes where a mismatched value is"""
+    offset = err.offset
+    line = json_string.count('\n', 0, offset) + 1
+    column = offset - json_string.rfind('\n', 0, offset)
+    if not err.path:
+        return f"{err.message} (line {line} column {column})"
+
+    pointer = ''.join(
+        '/' + key.replace('~', '~0').replace('/', '~1')
+        for key in reversed(err.path))
+    return f"{err.message} at {pointer} (line {line} column {column})"
+
+
+def get_decoder(target: Any) -> Decoder:
+    """Finds the decoder for a type, building it on first use"""
+    decoder = BUILDING.get(target)
+    if decoder is not None:
+        return decoder
+
+    return _cached_decoder(target)
+
+
+@lru_cache(maxsize=DECODER_CACHE_SIZE)
+def _cached_decoder(target: Any) -> Decoder:
+    """Builds the decoder for a type, keeping the most recently used ones"""
+    # Types can refer to themselves, so they are registered before their
+    # fields' decoders are built
+    built: List[Decoder] = []
+    BUILDING[target] = lambda reader, index: built[0](reader, index)
+    try:
+        decoder = _build_decoder(target)
+    finally:
+        del BUILDING[target]
+
+    built.append(decoder)
+    return decoder
+
+
+def _type_name(target: Any) -> str:
+    """A short name for a type, for error messages"""
+    if isinstance(target, type):
+        return target.__name__
+
+    return repr(target).replace('typing.', '')
+
+
+def _build_decoder(target: Any) -> Decoder:
+    """Builds the decoder for a type"""
+    if target is Any or target is object:
+        return _decode_any
+    if target in SCALAR_DECODERS:
+        return SCALAR_DECODERS[target]
+
+    origin = getattr(target, '__origin__', None)
+    args = getattr(target, '__args__', None) or ()
+    if target in (list, List) or origin in SEQUENCES:
+        return _list_decoder(target, args[0] if args else Any, list)
+    if target in (tuple, Tuple) or origin in (tuple, Tuple):
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _list_decoder(target, args[0], tuple)
+        if args and args != ((),):
+            return _tuple_decoder(target, args)
+        return _list_decoder(target, Any, tuple)
+    if target in (dict, Dict) or origin in MAPPINGS:
+        if args and args[0] is not str:
+            raise TypeError(f"Can't decode into {_type_name(target)}")
+        return _dict_decoder(target, args[1] if args else Any)
+    if origin is Union or type(target).__name__ == 'UnionType':
+        return _union_decoder(target, args)
+
+    if hasattr(target, '__dataclass_fields__'):
+        return _dataclass_decoder(target)
+    if isinstance(target, type) and issubclass(target, tuple):
+        if hasattr(target, '_fields'):
+            return _named_tuple_decoder(target)
+    if isinstance(target, type) and issubclass(target, dict):
+        if hasattr(target, '__total__'):
+            return _typed_dict_decoder(target)
+
+    raise TypeError(f"Can't decode into {_type_name(target)}")
+
+
+def _scalar_decoder(
+        expected: str,
+        kind: int,
+        values: Optional[Dict[str, object]] = None,
+        convert: Optional[Callable[[str], object]] = None,
+        integer: bool = False) -> Decoder:
+    """Decodes a single token, of the scanner's `kind`.
+
+    Symbols are looked up in `values`, other tokens are decoded with
+    `convert`. Integers can't have a decimal point.
+    """
+    def decode(reader: TokenReader, index: int) -> Tuple[object, int]:
+        found = SCANNER.match(reader.json_string, index)
+        if found.lastindex == kind:
+            text = found.group(kind)
+            if values is not None:
+                if text in values:
+                    return values[text], found.end()
+            elif not integer or '.' not in text:
+                return convert(text), found.end()  # type: ignore
+
+        return _scalar_token(reader, index, expected, convert, integer)
+
+    return decode
+
+
+def _scalar_token(
+        reader: TokenReader,
+        index: int,
+        expected: str,
+        convert: Optional[Callable[[str], object]],
+        integer: bool) -> Tuple[object, int]:
+    """Decodes a scalar token that the scanner doesn't match on its own"""
+    token_type, text, start, end = reader.next_token(index)
+    if token_type == TOKEN_TYPES[expected]:
+        if convert is None:
+            return reader.scalar(token_type, text), end
+        if not integer or '.' not in text:
+            return convert(text), end
+
+    raise _mismatch(expected, token_type, text, start)
+
+
+def _mismatch(
+        expected: str,
+        token_type: str,
+        text: str,
+        start: int) -> Mismatch:
+    """The error for finding a token where a value of another type was"""
+    if token_type not in SCALAR_TYPES:
+        text = text[:1]
+
+    return Mismatch(f"Expected {expected}, found {text}", start)
+
+
+def _decode_string(reader: TokenReader, index: int) -> Tuple[str, int]:
+    """Decodes a string"""
+    found = SCANNER.match(reader.json_string, index)
+    if found.lastindex == STRING:
+        text = found.group(STRING)
+        if '\\' not in text:
+            return text[1:-1], found.end()
+        return reader.decode_string(text), found.end()
+
+    return _scalar_token(  # type: ignore
+        reader, index, 'str', None, False)
+
+
+def _decode_any(reader: TokenReader, index: int) -> Tuple[object, int]:
+    """Decodes any JSON value, the way `parse` does"""
+    found = SCANNER.match(reader.json_string, index)
+    kind = found.lastindex
+    if kind == STRING:
+        text = found.group(STRING)
+        if '\\' not in text:
+            return text[1:-1], found.end()
+        return reader.decode_string(text), found.end()
+
+    if kind == NUMBER:
+        text = found.group(NUMBER)
+        return float(text) if '.' in text else int(text), found.end()
+
+    if kind == SYMBOL:
+        text = found.group(SYMBOL)
+        if text in SPECIAL_VALUES:
+            return SPECIAL_VALUES[text], found.end()
+        if text in ('[', '{'):
+            # Containers are found by their brackets, and parsed whole
+            start = found.start(SYMBOL)
+            end = reader.skip(start)
+            try:
+                value = _parse_text(
+                    reader.json_string[start:end], 'fused', None, None, None)
+            except (ParseError, TokenizeError):
+                reader.fail()
+            return value, end
+
+    token_type, text, _, end = reader.next_token(index)
+    if token_type not in SCALAR_TYPES:
+        reader.fail()
+
+    return reader.scalar(token_type, text), end
+
+
+def _skip_value(reader: TokenReader, index: int) -> int:
+    """Checks the value after `index` without building it, and returns the
+    offset after it"""
+    token_type, text, start, end = reader.next_token(index)
+    if token_type in SCALAR_TYPES:
+        reader.scalar(token_type, text)
+        return end
+
+    end = reader.skip(start)
+    reader.check_span(start, end)
+    return end
+
+
+SCALAR_DECODERS: Dict[object, Decoder] = {
+    str: _decode_string,
+    int: _scalar_decoder('int', NUMBER, convert=int, integer=True),
+    float: _scalar_decoder('float', NUMBER, convert=float),
+    Decimal: _scalar_decoder('Decimal', NUMBER, convert=Decimal),
+    bool: _scalar_decoder('bool', SYMBOL, {'true': True, 'false': False}),
+    type(None): _scalar_decoder('None', SYMBOL, {'null': None}),
+    None: _scalar_decoder('None', SYMBOL, {'null': None}),
+}
+
+# The token types of the scalar decoders' values
+TOKEN_TYPES = {
+    'str': 'string',
+    'int': 'number',
+    'float': 'number',
+    'Decimal': 'number',
+    'bool': 'boolean',
+    'None': 'null',
+}
+
+
+def _read_items(
+        reader: TokenReader,
+        index: int,
+        item: Decoder) -> Tuple[List[object], int]:
+    """Decodes the items of an array, after its '['"""
+    json_string = reader.json_string
+    items: List[object] = []
+    found = SEPARATOR.match(json_string, index)
+    if found is not None and found.group(1) == ']':
+        return items, found.end()
+
+    while True:
+        try:
+            value, index = item(reader, index)
+        except Mismatch as err:
+            err.path.append(str(len(items)))
+            raise
+
+        items.append(value)
+        found = SEPARATOR.match(json_string, index)
+        if found is None:
+            reader.fail()
+
+        separator = found.group(1)
+        index = found.end()
+        if separator == ']':
+            return items, index
+        if separator != ',':
+            reader.fail()
+
+
+def _read_members(reader: TokenReader, index: int, member: Member) -> int:
+    """Decodes the members of an object, after its '{'"""
+    json_string = reader.json_string
+    found = MEMBER.match(json_string, index)
+    if found is None:
+        return _close_object(reader, index)
+
+    while True:
+        key = found.group(1)
+        try:
+            index = member(key, found.end())
+        except Mismatch as err:
+            err.path.append(reader.decode_string(key))
+            raise
+
+        found = SEPARATOR.match(json_string, index)
+        if found is None:
+            reader.fail()
+
+        separator = found.group(1)
+        if separator == '}':
+            return found.end()
+        if separator != ',':
+            reader.fail()
+
+        found = MEMBER.match(json_string, found.end())
+        if found is None:
+            reader.fail()
+
+
+def _close_object(reader: TokenReader, index: int) -> int:
+    """Reads the '}' of an empty object"""
+    found = SEPARATOR.match(reader.json_string, index)
+    if found is None or found.group(1) != '}':
+        reader.fail()
+
+    return found.end()
+
+
+def _open(
+        reader: TokenReader,
+        index: int,
+        bracket: str,
+        target: Any) -> Tuple[int, int]:
+    """Reads the opening bracket of a container, or raises `Mismatch`.
+
+    Returns the offsets of the bracket and of the end of it.
+    """
+    found = SCANNER.match(reader.json_string, index)
+    if found.lastindex == SYMBOL and found.group(SYMBOL) == bracket:
+        return found.start(SYMBOL), found.end()
+
+    token_type, text, start, _ = reader.next_token(index)
+    raise _mismatch(_type_name(target), token_type, text, start)
+
+
+def _list_decoder(
+        target: Any,
+        item_type: Any,
+        container: Callable[[List[object]], object]) -> Decoder:
+    """Decodes arrays whose items are all of one type"""
+    item = get_decoder(item_type)
+
+    def decode(reader: TokenReader, index: int) -> Tuple[object, int]:
+        _, index = _open(reader, index, '[', target)
+        items, index = _read_items(reader, index, item)
+        return items if container is list else container(items), index
+
+    return decode
+
+
+def _tuple_decoder(target: Any, item_types: Tuple[Any, ...]) -> Decoder:
+    """Decodes arrays with a fixed number of items of given types"""
+    items = [get_decoder(item_type) for item_type in item_types]
+    count = len(items)
+
+    def decode(reader: TokenReader, index: int) -> Tuple[object, int]:
+        start, index = _open(reader, index, '[', target)
+        decoders = iter(items)
+
+        def item(reader: TokenReader, index: int) -> Tuple[object, int]:
+            decoder = next(decoders, None)
+            if decoder is None:
+                raise Mismatch(
+                    f"Expected {count} items", reader.next_token(index)[2])
+            return decoder(reader, index)
+
+        values, index = _read_items(reader, index, item)
+        if len(values) != count:
+            raise Mismatch(f"Expected {count} items", start)
+
+        return tuple(values), index
+
+    return decode
+
+
+def _dict_decoder(target: Any, value_type: Any) -> Decoder:
+    """Decodes objects whose values are all of one type"""
+    value = get_decoder(value_type)
+
+    def decode(reader: TokenReader, index: int) -> Tuple[object, int]:
+        _, index = _open(reader, index, '{', target)
+        obj: Dict[str, object] = {}
+
+        def member(key: str, index: int) -> int:
+            obj[reader.decode_string(key)], index = value(reader, index)
+            return index
+
+        return obj, _read_members(reader, index, member)
+
+    return decode
+
+
+def _union_decoder(target: Any, member_types: Tuple[Any, ...]) -> Decoder:
+    """Decodes a value with the first of the `Union`'s types that fits it"""
+    # Checking for null first is the cheapest, and the common case
+    decoders = [
+        get_decoder(member_type) for member_type in sorted(
+            member_types, key=lambda member_type: member_type is type(None),
+            reverse=True)]
+    expected = _type_name(target)
+
+    def decode(reader: TokenReader, index: int) -> Tuple[object, int]:
+        for decoder in decoders:
+            try:
+                return decoder(reader, index)
+            except Mismatch:
+                pass
+
+        token_type, text, start, _ = reader.next_token(index)
+        raise _mismatch(expected, token_type, text, start)
+
+    return decode
+
+
+def _record_decoder(
+        target: Any,
+        names: List[str],
+        defaults: List[Optional[Callable[[], object]]],
+        build: Callable[[List[object]], object]) -> Decoder:
+    """Decodes objects into a type with a fixed set of fields.
+
+    Field values are decoded straight into a list, in field order, which is
+    handed to `build` once the object ends. Keys are looked up by their
+    token text, so they are only decoded if they have escapes, or aren't
+    fields.
+    """
+    hints = typing.get_type_hints(target)
+    decoders = [get_decoder(hints.get(name, Any)) for name in names]
+    slots = {f'"{name}"': slot for slot, name in enumerate(names)}
+    by_name = {name: slot for slot, name in enumerate(names)}
+    count = len(names)
+    expected = _type_name(target)
+
+    def decode(reader: TokenReader, index: int) -> Tuple[object, int]:
+        json_string = reader.json_string
+        start, index = _open(reader, index, '{', target)
+        values = [MISSING] * count
+
+        found = MEMBER.match(json_string, index)
+        if found is None:
+            index = _close_object(reader, index)
+
+        while found is not None:
+            key = found.group(1)
+            slot = slots.get(key)
+            if slot is None:
+                slot = by_name.get(reader.decode_string(key))
+
+            try:
+                if slot is None:
+                    index = _skip_value(reader, found.end())
+                else:
+                    values[slot], index = decoders[slot](reader, found.end())
+            except Mismatch as err:
+                err.path.append(reader.decode_string(key))
+                raise
+
+            found = SEPARATOR.match(json_string, index)
+            if found is None:
+                reader.fail()
+
+            separator = found.group(1)
+            index = found.end()
+            if separator == '}':
+                break
+            if separator != ',':
+                reader.fail()
+
+            found = MEMBER.match(json_string, index)
+            if found is None:
+                reader.fail()
+
+        if MISSING in values:
+            for slot, value in enumerate(values):
+                if value is MISSING:
+                    default = defaults[slot]
+                    if default is None:
+                        raise Mismatch(
+                            f"Missing field {names[slot]!r} of {expected}",
+                            start)
+                    values[slot] = default()
+
+        return build(values), index
+
+    return decode
+
+
+def _dataclass_decoder(target: Any) -> Decoder:
+    """Decodes objects into a dataclass"""
+    import dataclasses
+
+    fields = [field for field in dataclasses.fields(target) if field.init]
+    defaults: List[Optional[Callable[[], object]]] = []
+    for field in fields:
+        if field.default is not dataclasses.MISSING:
+            defaults.append(lambda default=field.default: default)
+        elif field.default_factory is not dataclasses.MISSING:
+            defaults.append(field.default_factory)
+        else:
+            defaults.append(None)
+
+    names = [field.name for field in fields]
+    if any(getattr(field, 'kw_only', False) for field in fields):
+        # Keyword only fields can't be passed by position
+        def build(values: List[object]) -> object:
+            return target(**dict(zip(names, values)))
+    else:
+        def build(values: List[object]) -> object:
+            return target(*values)
+
+    return _record_decoder(target, names, defaults, build)
+
+
+def _named_tuple_decoder(target: Any) -> Decoder:
+    """Decodes objects into a `NamedTuple`"""
+    names = list(target._fields)
+    field_defaults = getattr(target, '_field_defaults', {})
+    defaults: List[Optional[Callable[[], object]]] = [
+        (lambda default=field_defaults[name]: default)
+        if name in field_defaults else None
+        for name in names
+    ]
+
+    def build(values: List[object]) -> object:
+        return target(*values)
+
+    return _record_decoder(target, names, defaults, build)
+
+
+def _typed_dict_decoder(target: Any) -> Decoder:
+    """Decodes objects into a `TypedDict`, leaving out missing keys"""
+    names = list(typing.get_type_hints(target))
+    required = getattr(
+        target, '__required_keys__', names if target.__total__ else ())
+    defaults: List[Optional[Callable[[], object]]] = [
+        None if name in required else lambda: MISSING for name in names]
+
+    def build(values: List[object]) -> object:
+        return {
+            name: value
+            for name, value in zip(names, values)
+            if value is not MISSING
+        }
+
+    return _record_decoder(target, names, defaults, build)
@@ -0,0 +1,269 @@
+"""Checking that JSON is well-formed, without building anything"""
+import re
+import sys
+from typing import Callable, Match, NamedTuple, Optional, Tuple, Union
+
+from json_parser.buffer import BYTES_SCANNER
+from json_parser.lexer import NUMBER, SCANNER, STRING, SYMBOL
+from json_parser.parser import Buffer, _parse_text
+
+# A string token whose escapes would all decode
+VALID_STRING = re.compile(
+    r'"(?:[^"\\]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*"', re.DOTALL)
+BYTES_VALID_STRING = re.compile(VALID_STRING.pattern.encode(), re.DOTALL)
+
+# Strings the scanner would find and the parser decode. In bytes, only
+# ASCII strings, as the rest have to be checked to be valid UTF-8.
+RUN_STRING = r'"[^"\\\n]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\n]*)*"'
+BYTES_RUN_STRING = (
+    r'"[^"\\\n\x80-\xff]*'
+    r'(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\n\x80-\xff]*)*"'
+)
+WHITESPACE = r'[ \t\n\r\x0b\x0c]*'
+# Numbers with more digits than this are left out of runs, and checked
+# against the digit limit for `int()`. It's the lowest limit
+# `sys.set_int_max_str_digits` allows.
+RUN_NUMBER_DIGITS = 640
+
+# What each symbol is, by its first character. Indexing a `str` gives a
+# character and indexing bytes gives an int, so both are keys.
+(
+    OPEN_ARRAY,
+    OPEN_OBJECT,
+    CLOSE_ARRAY,
+    CLOSE_OBJECT,
+    COMMA,
+    COLON,
+    LITERAL,
+) = range(7)
+SYMBOLS = {}
+for char, symbol in (
+        ('[', OPEN_ARRAY),
+        ('{', OPEN_OBJECT),
+        (']', CLOSE_ARRAY),
+        ('}', CLOSE_OBJECT),
+        (',', COMMA),
+        (':', COLON),
+        ('t', LITERAL),
+        ('f', LITERAL),
+        ('n', LITERAL)):
+    SYMBOLS[char] = SYMBOLS[ord(char)] = symbol  # type: ignore
+
+Matcher = Callable[..., Match]
+
+
+class Grammar(NamedTuple):
+    """How to scan and check a `str` document, or a bytes one"""
+    # Matches the next token, like the lexer
+    match: Matcher
+    # Match runs of scalars followed by commas, as array items or object
+    # members, so the most common parts of a document are checked in one go
+    array_run: Matcher
+    object_run: Matcher
+    # Checks a string token's escapes, and encoding
+    check_string: Callable[[Match], bool]
+
+
+def validate(
+        json_string: Union[str, Buffer],
+        max_depth: Optional[int] = None) -> None:
+    """Checks that a JSON string, or UTF-8 bytes, is well-formed.
+
+    The lexer's rules and the parser's grammar are checked, but no string
+    is unescaped, no number converted and no container built, so it takes
+    next to no memory. Returns None for valid JSON, and otherwise raises
+    the same `ParseError` or `TokenizeError` as `parse` would. Like the
+    non-recursive engines, nesting can be as deep as `max_depth` allows.
+    """
+    if isinstance(json_string, str):
+        if _validate(json_string, TEXT_GRAMMAR, max_depth):
+            return
+    else:
+        if isinstance(json_string, memoryview):
+            json_string = json_string.cast('B')
+        if _validate(json_string, BYTES_GRAMMAR, max_depth):
+            return
+
+        json_string = str(json_string, 'utf-8')
+
+    # Let the parser find the exact error
+    _parse_text(json_string, 'iterative', max_depth, None, None)
+
+
+def _run_patterns(string: str) -> Tuple[str, str]:
+    """Patterns for runs of array items and object members"""
+    scalar = (
+        rf'(?:{string}'
+        rf'|-?[0-9]{{1,{RUN_NUMBER_DIGITS}}}(?:\.[0-9]+)?(?![-.\w])'
+        r'|true(?!\w)|false(?!\w)|null(?!\w))'
+    )
+    ws = WHITESPACE
+    return (
+        rf'(?:{ws}{scalar}{ws},)*',
+        rf'(?:{ws}{string}{ws}:{ws}{scalar}{ws},)*',
+    )
+
+
+def _check_text(found: Match[str]) -> bool:
+    """Checks that a string token's escapes are valid"""
+    start, end = found.span(STRING)
+    json_string = found.string
+    return (
+        json_string.find('\\', start, end) == -1
+        or VALID_STRING.fullmatch(json_string, start, end) is not None
+    )
+
+
+def _check_number(found: Match) -> bool:
+    """Checks that an integer has no more digits than `int()` allows"""
+    text = found.group(NUMBER)
+    if isinstance(text, bytes):
+        text = text.decode()
+
+    # Not limited before Python 3.11
+    limit = getattr(sys, 'get_int_max_str_digits', lambda: 0)()
+    return (
+        not limit
+        or '.' in text
+        or len(text) - text.startswith('-') <= limit
+    )
+
+
+def _check_bytes(found: Match[bytes]) -> bool:
+    """Checks that a string token is valid UTF-8, with valid escapes"""
+    text = found.group(STRING)
+    if b'\\' in text and BYTES_VALID_STRING.fullmatch(text) is None:
+        return False
+
+    if not text.isascii():
+        try:
+            text.decode()
+        except UnicodeDecodeError:
+            return False
+
+    return True
+
+
+TEXT_ARRAY_RUN, TEXT_OBJECT_RUN = _run_patterns(RUN_STRING)
+BYTES_ARRAY_RUN, BYTES_OBJECT_RUN = _run_patterns(BYTES_RUN_STRING)
+TEXT_GRAMMAR = Grammar(
+    SCANNER.match,
+    re.compile(TEXT_ARRAY_RUN).match,
+    re.compile(TEXT_OBJECT_RUN).match,
+    _check_text,
+)
+BYTES_GRAMMAR = Grammar(
+    BYTES_SCANNER.match,
+    re.compile(BYTES_ARRAY_RUN.encode()).match,
+    re.compile(BYTES_OBJECT_RUN.encode()).match,
+    _check_bytes,
+)
+
+
+def _validate(
+        document: Union[str, Buffer],
+        grammar: Grammar,
+        max_depth: Optional[int]) -> bool:
+    """Scans a document, checking the grammar with a stack of containers.
+
+    Only well-formed input is handled, anything else returns False, for
+    the parser to find the error.
+    """
+    match, array_run, object_run, check_string = grammar
+
+    # For every open container, whether it's an object
+    stack = bytearray()
+
+    index = 0
+    while True:
+        # A value
+        found = match(document, index)
+        kind = found.lastindex
+        index = found.end()
+
+        if kind == STRING:
+            if not check_string(found):
+                return False
+
+        elif kind == SYMBOL:
+            symbol = SYMBOLS[document[found.start(SYMBOL)]]
+            if symbol == OPEN_ARRAY or symbol == OPEN_OBJECT:
+                if max_depth is not None and len(stack) >= max_depth:
+                    return False
+
+                is_object = symbol == OPEN_OBJECT
+                found = match(document, index)
+                if (found.lastindex == SYMBOL
+                        and SYMBOLS[document[found.start(SYMBOL)]]
+                        == (CLOSE_OBJECT if is_object else CLOSE_ARRAY)):
+                    index = found.end()
+                else:
+                    stack.append(is_object)
+                    if is_object:
+                        index = _key(
+                            document, object_run(document, index).end(),
+                            match, check_string)
+                        if index == -1:
+                            return False
+                    else:
+                        index = array_run(document, index).end()
+                    continue
+
+            elif symbol != LITERAL:
+                return False
+
+        elif kind == NUMBER:
+            if (found.end(NUMBER) - found.start(NUMBER) > RUN_NUMBER_DIGITS
+                    and not _check_number(found)):
+                return False
+
+        else:
+            return False
+
+        # What follows a value, closing as many containers as possible
+        while stack:
+            found = match(document, index)
+            if found.lastindex != SYMBOL:
+                return False
+
+            symbol = SYMBOLS[document[found.start(SYMBOL)]]
+            index = found.end()
+            is_object = stack[-1]
+            if symbol == COMMA:
+                if is_object:
+                    index = _key(
+                        document, object_run(document, index).end(),
+                        match, check_string)
+                    if index == -1:
+                        return False
+                else:
+                    index = array_run(document, index).end()
+                break
+
+            if symbol != (CLOSE_OBJECT if is_object else CLOSE_ARRAY):
+                return False
+            stack.pop()
+
+        else:
+            return match(document, index).lastindex is None
+
+
+def _key(
+        document: Union[str, Buffer],
+        index: int,
+        match: Matcher,
+        check_string: Callable[[Match], bool]) -> int:
+    """Checks an object key and its colon, returns the index after them.
+
+    Returns -1 if they aren't there.
+    """
+    found = match(document, index)
+    if found.lastindex != STRING or not check_string(found):
+        return -1
+
+    found = match(document, found.end())
+    if (found.lastindex != SYMBOL
+            or SYMBOLS[document[found.start(SYMBOL)]] != COLON):
+        return -1
+
+    return found.end()
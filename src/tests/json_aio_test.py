@@ -0,0 +1,96 @@
+"""asyncio parsing tests"""
+import asyncio
+from typing import AsyncIterator, List, Union
+
+import pytest
+
+import json_parser
+from json_parser.parser import ParseError
+
+JSON_STRING = '[{"id": 1, "tags": ["a", "\\u00e9"]}, {"id": 2, "tags": []}]'
+
+
+async def _stream(data: bytes) -> asyncio.StreamReader:
+    """A stream reader that has all of `data` buffered"""
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+async def _iterate(*chunks: Union[str, bytes]) -> AsyncIterator[object]:
+    for chunk in chunks:
+        yield chunk
+
+
+def test_aload() -> None:
+    """Streams and async iterables are parsed, in chunks of any size"""
+    async def main() -> None:
+        reader = await _stream(JSON_STRING.encode())
+        assert await json_parser.aload(reader, chunk_size=3) == (
+            json_parser.parse(JSON_STRING))
+
+        chunks = _iterate(JSON_STRING[:10], JSON_STRING[10:])
+        assert await json_parser.aload(chunks, chunk_size=4) == (
+            json_parser.parse(JSON_STRING))
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    ('prefix', 'expected'),
+    (
+        ('item', [{'id': 1, 'tags': ['a', 'é']}, {'id': 2, 'tags': []}]),
+        ('item.tags.item', ['a', 'é']),
+    ),
+)
+def test_aiterparse(prefix: str, expected: List[object]) -> None:
+    """Events and values match `iterparse`"""
+    async def main() -> None:
+        reader = await _stream(JSON_STRING.encode())
+        events = [
+            event
+            async for event in json_parser.aiterparse(reader, chunk_size=5)
+        ]
+        assert events == list(json_parser.iterparse(JSON_STRING))
+
+        reader = await _stream(JSON_STRING.encode())
+        values = [
+            value
+            async for value in json_parser.aiterparse(reader, prefix)
+        ]
+        assert values == expected
+
+    asyncio.run(main())
+
+
+def test_yields_to_loop() -> None:
+    """Other tasks run while a large, fully buffered document is parsed"""
+    async def main() -> None:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        reader = await _stream(b'[' + b'1, ' * 10000 + b'2]')
+        value = await json_parser.aload(reader, chunk_size=1000)
+        task.cancel()
+
+        assert len(value) == 10001  # type: ignore
+        assert ticks >= 30
+
+    asyncio.run(main())
+
+
+def test_errors() -> None:
+    """Errors are raised from the await"""
+    async def main() -> None:
+        reader = await _stream(b'{"a": [1,]}')
+        with pytest.raises(ParseError):
+            await json_parser.aload(reader)
+
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""Batch parsing tests"""
+import time
+from decimal import Decimal
+
+import pytest
+
+import json_parser
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+MESSAGES = [
+    '{"id": 1, "tags": ["a", "b"]}',
+    b'{"id": 2, "tags": []}',
+    '[1.5, null, true]',
+    bytearray(b'"caf\xc3\xa9"'),
+    '42',
+] * 7
+
+
+def tuple_pairs(pairs: list) -> tuple:
+    """A picklable object hook"""
+    return tuple(pairs)
+
+
+@pytest.mark.parametrize(
+    ('backend', 'workers', 'chunk_size'),
+    (
+        ('serial', None, None),
+        ('thread', 3, None),
+        ('thread', 2, 1),
+        ('process', 2, None),
+        ('process', 1, None),
+    ),
+)
+def test_parse_many(backend: str, workers: object, chunk_size: object) -> None:
+    """Every backend gives the values in order"""
+    values = json_parser.parse_many(
+        iter(MESSAGES), workers=workers, backend=backend,  # type: ignore
+        chunk_size=chunk_size)  # type: ignore
+
+    assert values == [json_parser.parse(message) for message in MESSAGES]
+
+
+@pytest.mark.parametrize('backend', ('serial', 'thread', 'process'))
+def test_options(backend: str) -> None:
+    """Parse options apply to every message"""
+    values = json_parser.parse_many(
+        ['{"a": 1.5}', '[{"b": 2}]'],
+        workers=2,
+        backend=backend,  # type: ignore
+        decimal=True,
+        object_pairs_hook=tuple_pairs,
+    )
+
+    assert values == [(('a', Decimal('1.5')),), [(('b', 2),)]]
+
+
+@pytest.mark.parametrize('backend', ('serial', 'thread', 'process'))
+def test_errors(backend: str) -> None:
+    """The first error is raised, or each is returned in place"""
+    messages = ['[1]', '[1,]', '{"a": 1}', 'nope', '2']
+    with pytest.raises(ParseError) as error:
+        json_parser.parse(messages[1])
+
+    with pytest.raises(ParseError) as batch_error:
+        json_parser.parse_many(
+            messages, workers=2, backend=backend,  # type: ignore
+            chunk_size=1)
+    assert str(batch_error.value) == str(error.value)
+
+    values = json_parser.parse_many(
+        messages, workers=2, backend=backend,  # type: ignore
+        return_exceptions=True)
+    assert values[0] == [1]
+    assert isinstance(values[1], ParseError)
+    assert str(values[1]) == str(error.value)
+    assert values[2] == {'a': 1}
+    assert isinstance(values[3], TokenizeError)
+    assert values[4] == 2
+
+
+def test_shared_key_cache() -> None:
+    """Keys repeated between messages are shared"""
+    first, second = json_parser.parse_many(['{"name": 1}', '{"name": 2}'])
+    assert next(iter(first)) is next(iter(second))  # type: ignore
+
+
+@pytest.mark.parametrize(
+    'options',
+    (
+        {'backend': 'fibers'},
+        {'max_depth': 10},
+        {'decimal': True, 'parse_float': float},
+    ),
+)
+def test_invalid_options(options: dict) -> None:
+    """Invalid options are rejected before anything is parsed"""
+    with pytest.raises(ValueError):
+        json_parser.parse_many(['1'], **options)
+
+
+def test_empty() -> None:
+    """An empty batch gives an empty list"""
+    assert json_parser.parse_many([], workers=2, backend='process') == []
+
+
+@pytest.mark.parametrize('chunk_size', (0, -1))
+def test_invalid_chunk_size(chunk_size: int) -> None:
+    """Chunks need at least one message"""
+    with pytest.raises(ValueError) as exinfo:
+        json_parser.parse_many(
+            ['1'], workers=2, backend='thread', chunk_size=chunk_size)
+    assert str(exinfo.value) == (
+        f"chunk_size must be at least 1, not {chunk_size}")
+
+
+def test_fail_fast() -> None:
+    """Chunks after a failure are cancelled, rather than waited for"""
+    parsed = []
+
+    def slow_hook(obj: dict) -> object:
+        parsed.append(obj)
+        time.sleep(0.001)
+        return obj
+
+    with pytest.raises(TokenizeError):
+        json_parser.parse_many(
+            ['nope'] + ['{}'] * 2000, workers=2, backend='thread',
+            chunk_size=1, object_hook=slow_hook)
+    assert len(parsed) < 100
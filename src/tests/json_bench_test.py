@@ -0,0 +1,86 @@
+"""Benchmark suite tests"""
+import json
+from pathlib import Path
+
+import pytest
+
+from json_parser import bench
+
+
+@pytest.mark.parametrize('name', list(bench.CORPORA))
+def test_corpora(name: str) -> None:
+    """Corpora are the same every time, about the right size, and valid"""
+    documents = bench.generate_corpus(name, 20000)
+    assert documents == bench.generate_corpus(name, 20000)
+    assert documents != bench.generate_corpus(name, 20000, seed=1)
+
+    size = len('\n'.join(documents)) + 1
+    assert 20000 <= size < 40000
+    for document in documents:
+        json.loads(document)
+
+
+def test_run_benchmarks() -> None:
+    """Every stage gets a time, and end to end parses get a peak memory"""
+    results = bench.run_benchmarks(
+        ['numbers', 'jsonl'], ['fused'], size=5000, repeat=1)
+
+    numbers = results['corpora']['numbers']
+    assert numbers['documents'] == 1
+    assert list(numbers['timings']) == [
+        'tokenize', '_parse', 'parse:fused', 'json']
+    assert list(numbers['peak_memory']) == ['parse:fused', 'json']
+
+    jsonl = results['corpora']['jsonl']
+    assert jsonl['documents'] > 1
+    assert 'iter_lines' in jsonl['timings']
+
+
+def test_compare() -> None:
+    """Only results worse than the baseline by the threshold are reported"""
+    baseline = {'corpora': {'wide': {
+        'timings': {'parse:fused': 1.0, 'tokenize': 1.0, 'json': 1.0},
+        'peak_memory': {'parse:fused': 1000},
+    }}}
+    results = {'corpora': {
+        'wide': {
+            'timings': {'parse:fused': 1.05, 'tokenize': 1.5, 'json': 2.0},
+            'peak_memory': {'parse:fused': 2000},
+        },
+        'deep': {'timings': {'tokenize': 5.0}, 'peak_memory': {}},
+    }}
+
+    assert bench.compare(results, baseline) == [
+        'wide tokenize timings: 1s -> 1.5s (1.50x)',
+        'wide parse:fused peak_memory: 1000B -> 2000B (2.00x)',
+    ]
+    assert bench.compare(results, baseline, threshold=2) == []
+
+
+def test_main(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Results are written out, and compared against a baseline"""
+    output = tmp_path / 'results.json'
+    arguments = [
+        '--corpus', 'wide', '--engine', 'fused', '--size', '5000',
+        '--repeat', '1', '--no-memory', '--output', str(output)]
+    assert bench.main(arguments) == 0
+
+    results = json.loads(output.read_text())
+    assert results['size'] == 5000
+    assert results['corpora']['wide']['peak_memory'] == {}
+    assert 'parse:fused' in capsys.readouterr().err
+
+    # Against a baseline that's impossibly fast, everything regressed
+    for corpus in results['corpora'].values():
+        for stage in corpus['timings']:
+            corpus['timings'][stage] = 1e-9
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(results))
+    assert bench.main([*arguments, '--compare', str(baseline)]) == 1
+    assert 'Regression: wide tokenize' in capsys.readouterr().err
+
+    corpora = tmp_path / 'corpora'
+    assert bench.main(['--write-corpora', str(corpora), '--size', '100']) == 0
+    assert sorted(path.name for path in corpora.iterdir()) == [
+        'deep.json', 'escapes.json', 'jsonl.jsonl', 'long_strings.json',
+        'numbers.json', 'wide.json']
@@ -0,0 +1,76 @@
+"""Bytes and memory mapped input tests"""
+import mmap
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+import json_parser
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+JSON_STRING = '{"name": "سینا \\u00e9", "values": [1, -2.5, true, null, {}]}'
+
+
+@pytest.mark.parametrize(
+    'to_buffer',
+    (bytes, bytearray, memoryview, lambda data: memoryview(data).cast('c')),
+)
+def test_buffers(to_buffer: Callable[[bytes], object]) -> None:
+    """Bytes-like objects are parsed as UTF-8"""
+    buffer = to_buffer(JSON_STRING.encode())
+    assert json_parser.parse(buffer) == json_parser.parse(JSON_STRING)
+
+
+def test_mmap(tmp_path: Path) -> None:
+    """Memory maps are parsed without reading them"""
+    path = tmp_path / 'data.json'
+    path.write_text(JSON_STRING, encoding='utf-8')
+
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            value = json_parser.parse(mapped)
+
+    assert value == json_parser.parse(JSON_STRING)
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error'),
+    (
+        ('[1, 2', IndexError),
+        ('{"a": 1,}', ParseError),
+        ('["é" "x"]', ParseError),
+        ('[1.2.3]', TokenizeError),
+        ('  ', TokenizeError),
+    )
+)
+def test_errors(json_string: str, error: type) -> None:
+    """Errors are the same as for the decoded string"""
+    with pytest.raises(error) as exinfo:
+        json_parser.parse(json_string)
+
+    with pytest.raises(error) as buffer_exinfo:
+        json_parser.parse(json_string.encode())
+
+    assert buffer_exinfo.value.args == exinfo.value.args
+
+
+@pytest.mark.parametrize(
+    'data',
+    (b'["\xff"]', b'{"a": \xc3}', b'"\xed\xa0\x80"'),
+)
+def test_invalid_utf8(data: bytes) -> None:
+    """Invalid UTF-8 is reported, in strings or anywhere else"""
+    with pytest.raises(UnicodeDecodeError):
+        json_parser.parse(data)
+
+
+def test_load_path(tmp_path: Path) -> None:
+    """Files can be parsed straight from a memory map"""
+    path = tmp_path / 'data.json'
+    path.write_text(JSON_STRING, encoding='utf-8')
+    assert json_parser.load_path(path) == json_parser.parse(JSON_STRING)
+
+    path.write_bytes(b'')
+    with pytest.raises(TokenizeError):
+        json_parser.load_path(path)
@@ -0,0 +1,126 @@
+"""Parse result cache tests"""
+import copy
+import pickle
+
+import pytest
+
+import json_parser
+from json_parser.cache import CachedParserStats, FrozenDict
+from json_parser.parser import ParseError
+
+DOCUMENT = '{"flags": {"dark_mode": true, "rollout": [10, 20]}, "version": 3}'
+
+
+def test_shared_results() -> None:
+    """Repeated documents share one immutable result"""
+    parser = json_parser.CachedParser()
+    first = parser.parse(DOCUMENT)
+    # An equal, but separately built string is still a hit
+    second = parser.parse(''.join(list(DOCUMENT)))
+
+    assert second is first
+    assert first == {
+        'flags': {'dark_mode': True, 'rollout': (10, 20)}, 'version': 3}
+    assert isinstance(first, FrozenDict)
+    assert isinstance(first['flags']['rollout'], tuple)
+    assert parser.stats() == CachedParserStats(
+        hits=1, misses=1, evictions=0, entries=1, size=len(DOCUMENT),
+        maxsize=1024, maxbytes=16 * 1024 * 1024)
+
+
+@pytest.mark.parametrize(
+    'change',
+    (
+        lambda obj: obj.__setitem__('a', 1),
+        lambda obj: obj.__delitem__('version'),
+        lambda obj: obj.update(a=1),
+        lambda obj: obj.setdefault('a', 1),
+        lambda obj: obj.pop('version'),
+        lambda obj: obj.popitem(),
+        lambda obj: obj.clear(),
+        lambda obj: obj.__init__(a=1),
+        lambda obj: obj['flags'].__init__({'dark_mode': False}),
+    ),
+)
+def test_frozen(change: object) -> None:
+    """Shared results can't be changed"""
+    result = json_parser.CachedParser().parse(DOCUMENT)
+    with pytest.raises(TypeError):
+        change(result)  # type: ignore
+
+    assert copy.deepcopy(result) == result
+    assert pickle.loads(pickle.dumps(result)) == result
+    assert json_parser.dumps(result) == DOCUMENT
+
+
+@pytest.mark.parametrize('copy_results', (False, True))
+def test_deep_nesting(copy_results: bool) -> None:
+    """Results are frozen or copied without recursion"""
+    depth = 50000
+    parser = json_parser.CachedParser(engine='iterative', copy=copy_results)
+    for _ in range(2):
+        value = parser.parse('[' * depth + '{"a": 1}' + ']' * depth)
+
+    for _ in range(depth):
+        assert isinstance(value, list if copy_results else tuple)
+        value, = value  # type: ignore
+    assert value == {'a': 1}
+    assert parser.stats().hits == 1
+
+
+def test_copies() -> None:
+    """With `copy`, every call gets its own mutable result"""
+    parser = json_parser.CachedParser(copy=True)
+    first = parser.parse(DOCUMENT)
+    first['flags']['rollout'].append(30)
+
+    second = parser.parse(DOCUMENT)
+    assert second == json_parser.parse(DOCUMENT)
+    assert type(second) is dict
+    assert second['flags']['rollout'] is not first['flags']['rollout']
+    assert parser.hits == 1
+
+
+def test_options() -> None:
+    """Options are passed to `parse`, and bytes are cached too"""
+    parser = json_parser.CachedParser(decimal=True, engine='fused')
+    result = parser.parse(b'[1.5]')
+
+    assert result == (json_parser.parse('1.5', decimal=True),)
+    assert parser.parse(bytearray(b'[1.5]')) is result
+    assert parser.parse('[1.5]') is not result
+
+
+def test_eviction() -> None:
+    """The least recently used documents are evicted by count and size"""
+    parser = json_parser.CachedParser(maxsize=2, maxbytes=10)
+    parser.parse('[1]')
+    parser.parse('[2]')
+    parser.parse('[1]')
+    parser.parse('[3]')
+    assert parser.stats()[:5] == (1, 3, 1, 2, 6)
+
+    # [2] was evicted, [1] was used more recently than it
+    parser.parse('[1]')
+    assert parser.hits == 2
+
+    parser.parse('[1, 2, 3]')
+    assert parser.stats()[:5] == (2, 4, 3, 1, 9)
+
+    # Too large to cache at all
+    parser.parse('[1, 2, 3, 4]')
+    parser.parse('[1, 2, 3, 4]')
+    assert parser.stats()[:5] == (2, 6, 3, 1, 9)
+
+    parser.clear()
+    assert parser.stats()[:5] == (0, 0, 0, 0, 0)
+
+
+def test_errors_not_cached() -> None:
+    """Invalid documents are parsed again every time"""
+    parser = json_parser.CachedParser()
+    for _ in range(2):
+        with pytest.raises(ParseError):
+            parser.parse('[1,]')
+
+    assert parser.stats()[:4] == (0, 2, 0, 0)
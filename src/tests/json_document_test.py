@@ -0,0 +1,220 @@
+"""Incrementally re-parsed document tests"""
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+import json_parser
+from json_parser import document as document_module
+from json_parser.document import Offsets
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+DOCUMENT = '''{
+  "name": "demo",
+  "tags": ["a", "b", "c"],
+  "nested": {"items": [1, 2, {"deep": true}], "other": {"x": null}}
+}'''
+
+
+def edit(text: str, old: str, new: str) -> tuple:
+    """The arguments to `Document.edit` replacing `old` with `new`"""
+    return text.index(old), len(old), new
+
+
+@pytest.mark.parametrize(
+    ('old', 'new'),
+    (
+        ('"demo"', '"renamed"'),
+        ('"b"', '"b", "b2"'),
+        ('"a", ', ''),
+        ('["a", "b", "c"]', '[]'),
+        ('1, 2', '10, 20, 30'),
+        ('true', 'false'),
+        ('"deep"', '"shallow"'),
+        ('"x": null', '"x": null, "y": [1]'),
+        ('"other"', '"renamed"'),
+        ('"items"', '"other"'),
+        ('{"x": null}', '[{"x": null}]'),
+        ('demo', 'de\\u006do'),
+        ('"tags": ["a", "b", "c"],\n  ', ''),
+        ('}\n}', '}, "tail": 1.5\n}'),
+    ),
+)
+def test_edits(old: str, new: str) -> None:
+    """Edits give the same value as parsing the edited text"""
+    document = json_parser.Document(DOCUMENT)
+    value = document.edit(*edit(DOCUMENT, old, new))
+    expected = DOCUMENT.replace(old, new, 1)
+
+    assert document.text == expected
+    assert value == document.value == json_parser.parse(expected)
+    assert list(document.value) == list(json_parser.parse(expected))
+
+
+def test_unchanged_values_are_reused() -> None:
+    """Values outside the edited container keep their identity"""
+    document = json_parser.Document(DOCUMENT)
+    root = document.value
+    tags = root['tags']
+    nested = root['nested']
+    deep = nested['items'][2]
+    other = nested['other']
+
+    document.edit(*edit(document.text, '2', '2, 3'))
+
+    assert document.value is root
+    assert root['tags'] is tags
+    assert root['nested'] is nested
+    assert nested['items'] == [1, 2, 3, {'deep': True}]
+    assert nested['items'][3] is deep
+    assert nested['other'] is other
+
+    # Edits after a change in length land in the right place
+    document.edit(*edit(document.text, 'null', '"set"'))
+    assert nested['other'] is other
+    assert other == {'x': 'set'}
+    document.edit(*edit(document.text, '"c"', '"d"'))
+    assert tags == ['a', 'b', 'd']
+    assert document.value == json_parser.parse(document.text)
+
+
+def test_many_edits() -> None:
+    """A document stays in sync over a series of edits"""
+    document = json_parser.Document('[]')
+    for number in range(50):
+        end = len(document.text) - 1
+        document.edit(end, 0, f'{", " if number else ""}{{"n": {number}}}')
+
+    first = document.value[0]
+    document.edit(*edit(document.text, '{"n": 25}', '[25]'))
+    document.edit(*edit(document.text, '{"n": 49}', '"last"'))
+
+    assert document.value[0] is first
+    assert document.value[25] == [25]
+    assert document.value[-1] == 'last'
+    assert document.value == json_parser.parse(document.text)
+
+
+def test_offsets(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Offsets split into blocks behave like a sorted list"""
+    monkeypatch.setattr(document_module, 'BLOCK_SIZE', 3)
+    rng = random.Random(0)
+    expected = list(range(0, 40, 2))
+    offsets = Offsets(expected)
+
+    for _ in range(500):
+        index = rng.randrange(len(expected))
+        delta = rng.randint(0, 3)
+        if rng.random() < 0.5:
+            offsets.shift(index, delta)
+            expected[index:] = [offset + delta for offset in expected[index:]]
+        else:
+            stop = rng.randint(index + 1, min(index + 4, len(expected)))
+            low = expected[index - 1] if index else 0
+            high = expected[stop] if stop < len(expected) else low + 10
+            new = sorted(
+                rng.randint(low, high) for _ in range(rng.randint(1, 5)))
+            offsets.replace(index, stop, new)
+            expected[index:stop] = new
+
+        assert len(offsets) == len(expected)
+        assert [offsets[i] for i in range(len(expected))] == expected
+        for offset in range(-1, expected[-1] + 2):
+            assert offsets.bisect_left(offset) == bisect_left(
+                expected, offset)
+            assert offsets.bisect_right(offset) == bisect_right(
+                expected, offset)
+
+
+def test_wide_containers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Edits in containers with many blocks of children"""
+    monkeypatch.setattr(document_module, 'BLOCK_SIZE', 4)
+    text = json_parser.dumps({
+        'items': list(range(50)),
+        'members': {f'k{number}': [number] for number in range(50)},
+    })
+    document = json_parser.Document(text)
+    items = document.value['items']
+
+    for old, new in (
+            ('10, ', '10, 10.5, 10.75, '),
+            ('[20]', '[20, 21, 22]'),
+            ('"k30": [30], ', ''),
+            ('48, 49', '48, 49, 50'),
+            ('0, 1, 2', '0'),
+            ('"k5"', '"k5b"'),
+            ('[40]', '{"forty": 40}')):
+        document.edit(*edit(document.text, old, new))
+        assert document.value == json_parser.parse(document.text)
+
+    assert document.value['items'] is items
+
+
+@pytest.mark.parametrize(
+    ('old', 'new', 'error', 'message'),
+    (
+        ('"b"', '"b",', ParseError,
+         "Unexpected token: , (line 3 column 21)"),
+        ('true', 'tru', TokenizeError,
+         "Unknown token found: tru (line 4 column 39)"),
+        ('"items"', '"items', TokenizeError, None),
+        ('}\n}', '}', ParseError, None),
+    ),
+)
+def test_invalid_edits(
+        old: str,
+        new: str,
+        error: type,
+        message: object) -> None:
+    """Invalid edits raise the parse error, and change nothing"""
+    document = json_parser.Document(DOCUMENT)
+    value = document.value
+    edited = DOCUMENT.replace(old, new, 1)
+    with pytest.raises(error) as parse_error:
+        json_parser.parse(edited)
+
+    with pytest.raises(error) as edit_error:
+        document.edit(*edit(DOCUMENT, old, new))
+
+    assert str(edit_error.value) == str(parse_error.value)
+    if message is not None:
+        assert str(edit_error.value) == message
+    assert document.text == DOCUMENT
+    assert document.value is value
+    assert value == json_parser.parse(DOCUMENT)
+
+
+@pytest.mark.parametrize(
+    ('text', 'offset', 'deleted', 'inserted', 'expected'),
+    (
+        ('1', 0, 1, '"one"', 'one'),
+        ('  [1]  ', 0, 2, '', [1]),
+        ('[1]', 3, 0, '  ', [1]),
+        ('[1]', 0, 3, '{"a": {}}', {'a': {}}),
+        ('{"a": 1, "a": 2}', 14, 1, '3', {'a': 3}),
+        ('{"a": 1, "a": 2}', 6, 1, '3', {'a': 2}),
+        ('{"a": 1, "b": 2}', 9, 3, '"a"', {'a': 2}),
+    ),
+)
+def test_edges(
+        text: str,
+        offset: int,
+        deleted: int,
+        inserted: str,
+        expected: object) -> None:
+    """Scalar documents, whitespace and repeated keys"""
+    document = json_parser.Document(text)
+    assert document.edit(offset, deleted, inserted) == expected
+    assert document.value == json_parser.parse(document.text)
+
+
+@pytest.mark.parametrize(
+    ('offset', 'deleted'),
+    ((-1, 0), (0, -1), (2, 2), (4, 0)),
+)
+def test_out_of_range(offset: int, deleted: int) -> None:
+    """Edits outside the text are rejected"""
+    document = json_parser.Document('[1]')
+    with pytest.raises(ValueError):
+        document.edit(offset, deleted, '')
@@ -0,0 +1,154 @@
+"""JSON encoder tests"""
+import io
+import json
+from decimal import Decimal
+from typing import Any, Dict
+
+import pytest
+
+import json_parser
+from json_parser import encoder
+
+DOCUMENT = {
+    'name': 'سینا "quoted" \\ \n\t\x00\x7f 😀',
+    'values': [1, -2, 2.5, -0.0, 1e16, 1e-7, 12345678901234567890],
+    'flags': [True, False, None],
+    'nested': {'empty': {}, 'list': [[], [{}]], 'tuple': (1, 2)},
+}
+
+
+@pytest.mark.parametrize(
+    'options',
+    (
+        {},
+        {'indent': 2},
+        {'indent': '\t', 'sort_keys': True},
+        {'ensure_ascii': True},
+    ),
+)
+def test_round_trip(options: Dict[str, Any]) -> None:
+    """Output parses back to the same value, and to the same as `json`"""
+    json_string = json_parser.dumps(DOCUMENT, **options)
+    expected = json.loads(json.dumps(DOCUMENT))
+    assert json_parser.parse(json_string) == expected
+    assert json.loads(json_string) == expected
+
+
+@pytest.mark.parametrize(
+    ('value', 'options'),
+    (
+        ({'b': [1, 2.5, {'c': None}], 'a': 'x"y', 'd': []}, {}),
+        ({'b': [1, 2.5, {'c': None}], 'a': 'x"y', 'd': []}, {'indent': 4}),
+        ({'b': 1, 'a': {'z': [], 'y': {}}}, {'sort_keys': True, 'indent': 1}),
+        ('é \U0001f600\x1f', {'ensure_ascii': True}),
+        ({1: 'a', 2.5: 'b', True: 'c', None: 'd'}, {}),
+    ),
+)
+def test_same_as_json(value: object, options: Dict[str, Any]) -> None:
+    """The output is formatted like `json.dumps`"""
+    assert json_parser.dumps(value, **options) == json.dumps(value, **options)
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    (
+        (1e16, '10000000000000000.0'),
+        (-1.5e-7, '-0.00000015'),
+        (5e-324, '0.' + '0' * 323 + '5'),
+        (Decimal('0.10'), '0.10'),
+        (Decimal('1E+3'), '1000'),
+        (json_parser.parse('1.50', raw_numbers=True), '1.50'),
+    ),
+)
+def test_numbers(value: object, expected: str) -> None:
+    """Numbers are written without exponents, which the parser can't read"""
+    assert json_parser.dumps(value) == expected
+    decimal = not isinstance(value, float)
+    assert json_parser.parse(expected, decimal=decimal) == value
+
+
+def test_iterencode_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Output is yielded in chunks, and `dump` writes them one by one"""
+    monkeypatch.setattr(encoder, 'BATCH_SIZE', 10)
+    value = [{'id': index, 'tags': ['a', 'b']} for index in range(100)]
+
+    chunks = list(json_parser.iterencode(value))
+    assert len(chunks) > 10
+    assert ''.join(chunks) == json.dumps(value)
+
+    file = io.StringIO()
+    json_parser.dump(value, file, indent=2)
+    assert file.getvalue() == json.dumps(value, indent=2)
+
+
+def test_deep_nesting() -> None:
+    """Nesting isn't limited by the recursion limit"""
+    value: object = []
+    for _ in range(100000):
+        value = [value]
+
+    assert json_parser.dumps(value) == '[' * 100001 + ']' * 100001
+
+
+def test_default() -> None:
+    """Unknown types go through `default`"""
+    value = {'items': {1, 2}}
+    assert json_parser.dumps(value, default=sorted) == '{"items": [1, 2]}'
+
+    with pytest.raises(TypeError) as exinfo:
+        json_parser.dumps(value)
+    assert str(exinfo.value) == "Object of type set is not JSON serializable"
+
+
+@pytest.mark.parametrize(
+    ('value', 'error'),
+    (
+        (float('nan'), ValueError),
+        ([float('-inf')], ValueError),
+        (Decimal('NaN'), ValueError),
+        ({(1, 2): 'tuple key'}, TypeError),
+    ),
+)
+def test_errors(value: object, error: type) -> None:
+    """Values JSON can't represent are rejected"""
+    with pytest.raises(error):
+        json_parser.dumps(value)
+
+
+def test_circular_reference() -> None:
+    """Cycles are found, but repeated values are fine"""
+    shared = [1]
+    assert json_parser.dumps([shared, shared]) == '[[1], [1]]'
+
+    cycle: Dict[str, object] = {}
+    cycle['self'] = [cycle]
+    with pytest.raises(ValueError) as exinfo:
+        json_parser.dumps(cycle)
+    assert str(exinfo.value) == "Circular reference detected"
+
+
+class Opaque:
+    """An object only `default` can encode"""
+
+
+@pytest.mark.parametrize(
+    'default',
+    (
+        lambda obj: obj,
+        lambda obj: [obj],
+        lambda obj: {'inner': [1, obj]},
+    ),
+)
+def test_circular_default(default: Any) -> None:
+    """A `default` that gives back what it was passed is a cycle too"""
+    with pytest.raises(ValueError) as exinfo:
+        json_parser.dumps(Opaque(), default=default)
+    assert str(exinfo.value) == "Circular reference detected"
+
+
+def test_default_repeated_values() -> None:
+    """The same object can go through `default` more than once"""
+    shared = Opaque()
+    value = [shared, {'a': shared}, [shared]]
+    assert json_parser.dumps(value, default=lambda obj: {'x': 1}) == (
+        '[{"x": 1}, {"a": {"x": 1}}, [{"x": 1}]]')
@@ -0,0 +1,78 @@
+"""JSON event parser tests"""
+import io
+from typing import Iterator, List
+
+import pytest
+
+import json_parser
+from json_parser.parser import ParseError
+
+
+def test_events() -> None:
+    """Every value produces events with its dotted path"""
+    json_string = '{"a": [1, {"b": null}], "c": "x", "d": true}'
+    assert list(json_parser.iterparse(json_string)) == [
+        ('', 'start_map', None),
+        ('', 'map_key', 'a'),
+        ('a', 'start_array', None),
+        ('a.item', 'number', 1),
+        ('a.item', 'start_map', None),
+        ('a.item', 'map_key', 'b'),
+        ('a.item.b', 'null', None),
+        ('a.item', 'end_map', None),
+        ('a', 'end_array', None),
+        ('', 'map_key', 'c'),
+        ('c', 'string', 'x'),
+        ('', 'map_key', 'd'),
+        ('d', 'boolean', True),
+        ('', 'end_map', None),
+    ]
+
+
+@pytest.mark.parametrize(
+    ('prefix', 'expected'),
+    (
+        ('item', [{'id': 1, 'tags': ['a']}, {'id': 2, 'tags': []}, [3]]),
+        ('item.id', [1, 2]),
+        ('item.tags.item', ['a']),
+        ('', [[{'id': 1, 'tags': ['a']}, {'id': 2, 'tags': []}, [3]]]),
+        ('missing', []),
+    )
+)
+def test_items(prefix: str, expected: List[object]) -> None:
+    """Values under a prefix are built and yielded one by one"""
+    json_string = '[{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}, [3]]'
+    source = io.BytesIO(json_string.encode())
+
+    items = json_parser.iterparse(source, prefix=prefix, chunk_size=4)
+    assert list(items) == expected
+
+
+def test_items_are_lazy() -> None:
+    """Records are yielded before the rest of the input has been read"""
+    chunks_read = 0
+
+    def chunks() -> Iterator[str]:
+        nonlocal chunks_read
+        chunks_read += 1
+        yield '['
+        for index in range(10_000):
+            chunks_read += 1
+            yield f'{{"id": {index}}},'
+        yield '{"id": -1}]'
+
+    items = json_parser.iterparse(chunks(), prefix='item')
+    assert next(items) == {'id': 0}
+    assert chunks_read < 5
+
+    assert sum(1 for _ in items) == 10_000
+
+
+def test_errors() -> None:
+    """Errors are raised once the parser reaches them"""
+    items = json_parser.iterparse('[{"id": 1}, {"id": 2,}]', prefix='item')
+    with pytest.raises(ParseError) as exinfo:
+        list(items)
+
+    msg, = exinfo.value.args
+    assert msg == 'Expected value after comma, found } (line 1 column 22)'
@@ -0,0 +1,85 @@
+"""Structural index tests"""
+from pathlib import Path
+
+import pytest
+
+import json_parser
+from json_parser.index import StructuralIndex
+from json_parser.parser import ParseError
+
+DOCUMENT = '''{
+    "items": [
+        {"id": 1, "name": "caf\\u00e9", "tags": ["[a]", "{b}"]},
+        {"id": 2, "name": "سینا", "tags": []},
+        {"id": 3, "name": "x", "tags": [ ], "a/b": {"c~d": true}}
+    ],
+    "total": 3,
+    "empty": {}
+}'''
+
+
+@pytest.mark.parametrize(
+    ('pointer', 'expected'),
+    (
+        ('', json_parser.parse(DOCUMENT)),
+        ('/total', 3),
+        ('/empty', {}),
+        ('/items/0/name', 'café'),
+        ('/items/1/name', 'سینا'),
+        ('/items/0/tags', ['[a]', '{b}']),
+        ('/items/0/tags/1', '{b}'),
+        ('/items/1/tags', []),
+        ('/items/2/tags', []),
+        ('/items/2/a~1b/c~0d', True),
+        ('/items/2', {'id': 3, 'name': 'x', 'tags': [], 'a/b': {'c~d': True}}),
+    )
+)
+def test_get(pointer: str, expected: object) -> None:
+    """Values are found by their JSON pointer"""
+    index = StructuralIndex.build(DOCUMENT)
+    assert index.get(pointer) == expected
+
+
+@pytest.mark.parametrize(
+    'pointer',
+    ('/missing', '/items/3', '/items/-1', '/items/first', '/total/0'),
+)
+def test_missing(pointer: str) -> None:
+    """Paths that aren't in the document raise KeyError"""
+    index = StructuralIndex.build(DOCUMENT)
+    with pytest.raises(KeyError):
+        index.get(pointer)
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Indexes can be saved next to a file, and used to read only parts"""
+    path = tmp_path / 'document.json'
+    path.write_text(DOCUMENT, encoding='utf-8')
+
+    StructuralIndex.build_file(path).save(tmp_path / 'document.json.idx')
+    index = StructuralIndex.load(tmp_path / 'document.json.idx', path)
+
+    start, end = index.span('/items/1/name')
+    assert path.read_bytes()[start:end] == '"سینا"'.encode()
+    assert index.get('/items/1/name') == 'سینا'
+
+    path.write_text(DOCUMENT + '\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        StructuralIndex.load(tmp_path / 'document.json.idx', path)
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error_message'),
+    (
+        ('[1, 2]]', 'Invalid JSON at ] (line 1 column 7)'),
+        ('{"a": [1, 2}', "Expected ',' or ']', found } (line 1 column 12)"),
+        ('{"a" "b": 1}', 'Expected colon, found "b" (line 1 column 6)'),
+    )
+)
+def test_structure_errors(json_string: str, error_message: str) -> None:
+    """Broken structure is reported with the error parse would raise"""
+    with pytest.raises(ParseError) as exinfo:
+        StructuralIndex.build(json_string)
+
+    msg, = exinfo.value.args
+    assert msg == error_message
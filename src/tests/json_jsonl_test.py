@@ -0,0 +1,104 @@
+"""JSONL reader tests"""
+import io
+from pathlib import Path
+from typing import List, Optional, Type, Union
+
+import pytest
+
+from json_parser.jsonl import iter_lines, parse_jsonl_parallel
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+RECORDS = [{'id': index, 'name': f'record {index}'} for index in range(200)]
+LINES = [
+    '{"id": %d, "name": "record\\u0020%d"}' % (index, index)
+    for index in range(200)
+]
+# The records, with blank lines and Windows line endings mixed in
+JSONL = '\n'.join(LINES[:50]) + '\n\n  \n' + '\r\n'.join(LINES[50:]) + '\n'
+
+
+@pytest.mark.parametrize('binary', (False, True))
+def test_iter_lines(binary: bool) -> None:
+    """Every line is a value, and blank lines are skipped"""
+    if binary:
+        lines: io.IOBase = io.BytesIO(JSONL.encode())
+    else:
+        lines = io.StringIO(JSONL)
+
+    assert list(iter_lines(lines)) == RECORDS  # type: ignore
+    assert list(iter_lines(['1', '', '[2]'], engine='fused')) == [1, [2]]
+
+
+@pytest.mark.parametrize(
+    ('lines', 'error', 'error_message'),
+    (
+        (['1', '', '[1,]'], ParseError,
+         "Expected value after comma, found ] (line 3 column 4)"),
+        (['1', '2 3'], ParseError, "Invalid JSON at 3 (line 2 column 3)"),
+        (['{"a": tru}'], TokenizeError,
+         "Unknown token found: tru (line 1 column 7)"),
+        ([b'1', b'["\xc3\xa9", "\xff"]'], ParseError,
+         "Invalid UTF-8: invalid start byte (line 2 column 8)"),
+    ),
+)
+def test_iter_lines_errors(
+        lines: List[Union[str, bytes]],
+        error: Type[Exception],
+        error_message: str) -> None:
+    """Errors give the line number in the file"""
+    with pytest.raises(error) as exinfo:
+        list(iter_lines(lines))
+
+    msg, = exinfo.value.args
+    assert msg == error_message
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+@pytest.mark.parametrize('ordered', (True, False))
+def test_parallel(tmp_path: Path, workers: int, ordered: bool) -> None:
+    """Chunks are split on line boundaries, and parsed by the workers"""
+    path = tmp_path / 'records.jsonl'
+    path.write_text(JSONL, encoding='utf-8')
+
+    values = list(parse_jsonl_parallel(
+        path, workers=workers, ordered=ordered, chunk_size=500))
+    if not ordered:
+        values.sort(key=lambda record: record['id'])  # type: ignore
+
+    assert values == RECORDS
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_parallel_errors(tmp_path: Path, workers: Optional[int]) -> None:
+    """Errors come after the values before them, with their line number"""
+    path = tmp_path / 'records.jsonl'
+    path.write_text(
+        '\n'.join(LINES[:120] + ['{"id": 1,}'] + LINES[120:]),
+        encoding='utf-8',
+    )
+
+    values = []
+    with pytest.raises(ParseError) as exinfo:
+        for value in parse_jsonl_parallel(path, workers, chunk_size=500):
+            values.append(value)
+
+    assert values == RECORDS[:120]
+    msg, = exinfo.value.args
+    assert msg == "Expected value after comma, found } (line 121 column 10)"
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_parallel_encoding_errors(tmp_path: Path, workers: int) -> None:
+    """Lines that aren't UTF-8 are reported like other errors"""
+    path = tmp_path / 'records.jsonl'
+    path.write_bytes('\n'.join(LINES[:50]).encode() + b'\n{"id": "\xff"}\n')
+
+    values = []
+    with pytest.raises(ParseError) as exinfo:
+        for value in parse_jsonl_parallel(path, workers, chunk_size=500):
+            values.append(value)
+
+    assert values == RECORDS[:50]
+    msg, = exinfo.value.args
+    assert msg == "Invalid UTF-8: invalid start byte (line 51 column 9)"
@@ -0,0 +1,94 @@
+"""Object key cache tests"""
+import pytest
+
+import json_parser
+from json_parser.keys import KeyCache, KeyCacheStats
+from json_parser.parser import ParseError, ParserEngine
+
+RECORDS = '[{"id": 1, "na\\u006de": "a"}, {"id": 2, "name": "b"}, {"id": 3}]'
+
+
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
+def test_shared_keys(engine: ParserEngine) -> None:
+    """Records share their key strings, and the cache counts hits"""
+    key_cache = KeyCache()
+    records = json_parser.parse(RECORDS, engine=engine, key_cache=key_cache)
+
+    assert records == json_parser.parse(RECORDS)
+    first, second, third = (list(record) for record in records)
+    assert first[0] is second[0] is third[0]
+    assert key_cache.stats() == KeyCacheStats(
+        hits=2, misses=3, size=3, maxsize=4096)
+
+
+def test_shared_keys_bytes() -> None:
+    """Keys read from bytes are cached too"""
+    key_cache = KeyCache()
+    records = json_parser.parse(RECORDS.encode(), key_cache=key_cache)
+
+    assert records == json_parser.parse(RECORDS)
+    assert key_cache.hits == 2
+
+
+def test_cache_reused() -> None:
+    """A cache can be shared by many documents"""
+    key_cache = KeyCache()
+    first = json_parser.parse('{"key": 1}', key_cache=key_cache)
+    second = json_parser.parse('{"key": 2}', key_cache=key_cache)
+
+    assert next(iter(first)) is next(iter(second))
+    assert (key_cache.hits, key_cache.misses) == (1, 1)
+
+    key_cache.clear()
+    assert key_cache.stats() == KeyCacheStats(0, 0, 0, 4096)
+
+
+def test_bounded() -> None:
+    """A full cache stops taking new keys"""
+    key_cache = KeyCache(maxsize=2)
+    json_parser.parse('{"a": 1, "b": 2, "c": 3}', key_cache=key_cache)
+    json_parser.parse('{"a": 1, "b": 2, "c": 3}', key_cache=key_cache)
+
+    assert key_cache.stats() == KeyCacheStats(
+        hits=2, misses=4, size=2, maxsize=2)
+
+
+def test_lru() -> None:
+    """An LRU cache drops the key that was used least recently"""
+    key_cache = KeyCache(maxsize=2, lru=True)
+    json_parser.parse('{"a": 1, "b": 2}', key_cache=key_cache)
+    json_parser.parse('{"a": 1, "c": 3}', key_cache=key_cache)
+
+    assert key_cache.get('"a"') == 'a'
+    assert key_cache.get('"c"') == 'c'
+    assert key_cache.get('"b"') is None
+
+
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
+def test_errors(engine: ParserEngine) -> None:
+    """Bad keys are reported the same way with a cache"""
+    with pytest.raises(ParseError) as exinfo:
+        json_parser.parse(
+            '[{"a": 1}, {"a": 2, "\\x": 3}]',
+            engine=engine,
+            key_cache=KeyCache(),
+        )
+
+    msg, = exinfo.value.args
+    assert msg == 'Unknown escape sequence: "\\x" (line 1 column 22)'
+
+
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
+@pytest.mark.parametrize(
+    'json_string', ('[{"a": 1}, {"a": 2}, 1.]', b'[{"a": 1}, {"a": 2}, 1.]'))
+def test_counts_after_fallback(engine: ParserEngine,
+                               json_string: object) -> None:
+    """Lookups are counted once, even when a fast path gives up"""
+    key_cache = KeyCache()
+    for parses in (1, 2):
+        json_parser.parse(
+            json_string, engine=engine, key_cache=key_cache)  # type: ignore
+        assert key_cache.hits + key_cache.misses == 2 * parses
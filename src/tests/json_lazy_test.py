@@ -0,0 +1,128 @@
+"""Lazy JSON parser tests"""
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+import json_parser
+from json_parser.lazy import LazyArray, LazyObject, materialize
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+DOCUMENT = '''{
+    "users": [
+        {"id": 1, "name": "caf\\u00e9", "tags": ["a", "[b]"]},
+        {"id": -2.5, "name": "{\\"quoted\\"}", "tags": []}
+    ],
+    "count": 2,
+    "ok": true,
+    "missing": null,
+    "nested": {"a": {"b": [[], {}]}}
+}'''
+
+
+def test_lazy_access() -> None:
+    """Values are decoded on access, and cached"""
+    document = json_parser.parse_lazy(DOCUMENT)
+    assert isinstance(document, LazyObject)
+    assert isinstance(document, Mapping)
+
+    users = document['users']
+    assert isinstance(users, LazyArray)
+    assert isinstance(users, Sequence)
+    assert len(users) == 2
+    assert users[0]['name'] == 'café'
+    assert users[1]['name'] == '{"quoted"}'
+    assert users[-1]['tags'] == []
+    assert users[0]['tags'][1] == '[b]'
+    assert users[0:1] == [{'id': 1, 'name': 'café', 'tags': ['a', '[b]']}]
+
+    assert document['users'] is users
+    assert users[0] is users[0]
+
+    assert list(document) == ['users', 'count', 'ok', 'missing', 'nested']
+    assert 'count' in document
+    assert 'other' not in document
+    with pytest.raises(KeyError):
+        document['other']
+
+
+@pytest.mark.parametrize(
+    'json_string',
+    (
+        DOCUMENT,
+        '[]',
+        '{}',
+        ' 42 ',
+        '"string"',
+        '[1., -2, "a\nb", {"k": 1, "k": 2}]',
+    )
+)
+def test_materialize(json_string: str) -> None:
+    """Materialized documents are identical to parsed ones"""
+    value = materialize(json_parser.parse_lazy(json_string))
+    expected = json_parser.parse(json_string)
+
+    assert value == expected
+    assert repr(value) == repr(expected)
+
+
+def test_errors_on_access() -> None:
+    """Malformed values only raise once they are reached"""
+    document = json_parser.parse_lazy('{"good": [1, 2], "bad": [1, 2,]}')
+    assert isinstance(document, Mapping)
+    assert document['good'] == [1, 2]
+
+    with pytest.raises(ParseError) as exinfo:
+        document['bad'][0]
+
+    msg, = exinfo.value.args
+    assert msg == 'Expected value after comma, found ] (line 1 column 31)'
+
+
+@pytest.mark.parametrize(
+    'json_string',
+    (
+        '{"k0": [fals], "k0": -0.5}',
+        '{"k0": {"a": 1,}, "k0": 2}',
+        '{"k0": "\\q", "k0": 2}',
+    )
+)
+def test_repeated_key_errors(json_string: str) -> None:
+    """Values replaced by a repeated key are still checked"""
+    with pytest.raises((ParseError, TokenizeError)) as expected:
+        json_parser.parse(json_string)
+
+    document = json_parser.parse_lazy(json_string)
+    with pytest.raises(expected.type) as exinfo:
+        materialize(document)
+
+    assert exinfo.value.args == expected.value.args
+
+
+def test_deep_nesting() -> None:
+    """Deep documents are materialized, and their errors found, without
+    recursion"""
+    depth = 50_000
+    json_string = '[' * depth + '{"a": 1}' + ']' * depth
+    value = materialize(json_parser.parse_lazy(json_string))
+    for _ in range(depth):
+        assert type(value) is list
+        value, = value  # type: ignore
+    assert value == {'a': 1}
+
+    with pytest.raises(ParseError):
+        json_parser.parse_lazy(json_string[:-1] + '}')
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error'),
+    (
+        ('', TokenizeError),
+        ('[1, 2]]', ParseError),
+        ('{"a": [1, 2}', ParseError),
+    )
+)
+def test_structure_errors(json_string: str, error: type) -> None:
+    """Unbalanced brackets raise the same error as parse"""
+    with pytest.raises(error):
+        json_parser.parse_lazy(json_string)
@@ -3,9 +3,15 @@ from typing import List
 
 import pytest
 
-from json_parser.lexer import tokenize, TokenizeError
+from json_parser.lexer import (
+    LexerEngine,
+    TokenizeError,
+    tokenize,
+    tokenize_compact,
+)
 
 
+@pytest.mark.parametrize('engine', ('scanner', 'reference'))
 @pytest.mark.parametrize(
     ('json_string', 'expected'),
     (
@@ -26,11 +32,16 @@ from json_parser.lexer import tokenize, TokenizeError
          ['{', '"foo"', ':', '[', '1', ',', '2', ',', '{', '"bar"', ':', '3', '}', ']', '}']),
     )
 )
-def test_lexer(json_string: str, expected: List[str]) -> None:
+def test_lexer(
+        json_string: str,
+        expected: List[str],
+        engine: LexerEngine) -> None:
     """JSON lexer tests"""
-    assert [token.value for token in tokenize(json_string)] == expected
+    tokens = tokenize(json_string, engine)
+    assert [token.value for token in tokens] == expected
 
 
+@pytest.mark.parametrize('engine', ('scanner', 'reference'))
 @pytest.mark.parametrize(
     ('json_string', 'error_message'),
     (
@@ -48,12 +59,69 @@ def test_lexer(json_string: str, expected: List[str]) -> None:
                 "wow": ["Such", "tests,]
             }]
         }''', 'Expected end of string (line 6 column 10)'),
+        ('[1, 2.3.4]', 'Too many decimal points in number'),
+        ('[1, --2]', 'Minus sign in between number'),
+        ('[truex]', 'Unknown token found: truex (line 1 column 2)'),
+        ('"abc\\', 'Incomplete escape at end of string'),
+        ('[\n  1,\n  @]', 'Unknown token found:  (line 3 column 3)'),
     )
 )
-def test_lexer_failure(json_string: str, error_message: str) -> None:
+def test_lexer_failure(
+        json_string: str,
+        error_message: str,
+        engine: LexerEngine) -> None:
     """JSON lexer test failutes"""
     with pytest.raises(TokenizeError) as exinfo:
-        tokenize(json_string)
+        tokenize(json_string, engine)
 
     msg, = exinfo.value.args
     assert msg == error_message
+
+
+@pytest.mark.parametrize(
+    'json_string',
+    (
+        '  [1, -2, 3.5, 1., 1-2, 007, \u0663\u0664]  ',
+        '{"a\\"b": "c\\\nd", "e": "f\ng"}\n\n[true, false, null]',
+        '\t{\r\n"key" :\x0b[ {}, [],\x0c"value" ] }\n',
+        '"unicode \u0633\u06cc\u0646\u0627" "\\u1234"',
+        'true1 false"x"null',
+    )
+)
+def test_scanner_matches_reference(json_string: str) -> None:
+    """The regex scanner produces the same tokens as the reference loop"""
+    assert tokenize(json_string) == tokenize(json_string, 'reference')
+
+
+@pytest.mark.parametrize(
+    'json_string',
+    (
+        '  [1, -2, 3.5, 1., 1-2, 007, ٣٤]  ',
+        '{"a\\"b": "c\\\nd", "e": "f\ng"}\n\n[true, false, null]',
+        '\t{\r\n"key" :\x0b[ {}, [],\x0c"value" ] }\n',
+        '"unicode سینا"\n\n "\\u1234"',
+        '[\n"a\\\nb",\n"c"]',
+    )
+)
+def test_compact_matches_scanner(json_string: str) -> None:
+    """The compact token stream holds the same tokens as the scanner"""
+    stream = tokenize_compact(json_string)
+    tokens = tokenize(json_string)
+
+    assert list(stream) == list(tokens)
+    assert stream[len(stream) - 1] == tokens[-1]
+
+
+@pytest.mark.parametrize(
+    'json_string',
+    ('', '  ', '"abc', '[1, "a\\\nb", 1.2.3]', '[\n  1,\n  @]'),
+)
+def test_compact_failure(json_string: str) -> None:
+    """The compact token stream raises the same errors as the scanner"""
+    with pytest.raises(TokenizeError) as exinfo:
+        tokenize(json_string)
+
+    with pytest.raises(TokenizeError) as compact_exinfo:
+        tokenize_compact(json_string)
+
+    assert compact_exinfo.value.args == exinfo.value.args
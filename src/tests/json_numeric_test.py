@@ -0,0 +1,125 @@
+"""Number decoding tests"""
+from decimal import Decimal
+from typing import Dict
+
+import pytest
+
+import json_parser
+from json_parser.numeric import RawNumber
+from json_parser.parser import ParseError, ParserEngine
+
+ENGINES = ('recursive', 'iterative', 'fused', 'compact')
+NUMBERS = '[0, -7, 12345678901234567890, 1.5, -0.25, 3.]'
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_default(engine: ParserEngine) -> None:
+    """Negative integers stay integers"""
+    values = json_parser.parse(NUMBERS, engine=engine)
+    assert values == [0, -7, 12345678901234567890, 1.5, -0.25, 3.0]
+    assert [type(value) for value in values] == [
+        int, int, int, float, float, float]
+
+    assert json_parser.parse(NUMBERS.encode(), engine=engine) == values
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_hooks(engine: ParserEngine) -> None:
+    """`parse_float` and `parse_int` get the text of each number"""
+    values = json_parser.parse(
+        NUMBERS, engine=engine, parse_float=str, parse_int=len)
+    assert values == [1, 2, 20, '1.5', '-0.25', '3.']
+
+    values = json_parser.parse(NUMBERS.encode(), engine=engine, parse_int=str)
+    assert values == ['0', '-7', '12345678901234567890', 1.5, -0.25, 3.0]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_decimal(engine: ParserEngine) -> None:
+    """Money values stay exact"""
+    values = json_parser.parse(
+        '{"price": 0.1, "tax": 0.2, "count": 3}', engine=engine, decimal=True)
+    assert values == {'price': Decimal('0.1'), 'tax': Decimal('0.2'), 'count': 3}
+    assert values['price'] + values['tax'] == Decimal('0.3')
+    assert type(values['count']) is int
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_raw_numbers(engine: ParserEngine) -> None:
+    """Raw numbers keep their text, and act like their value"""
+    values = json_parser.parse(NUMBERS, engine=engine, raw_numbers=True)
+    assert all(isinstance(value, RawNumber) for value in values)
+    assert [str(value) for value in values] == [
+        '0', '-7', '12345678901234567890', '1.5', '-0.25', '3.']
+    assert values == [0, -7, 12345678901234567890, 1.5, -0.25, 3.0]
+
+    zero, negative, _, half, *_ = values
+    assert negative < zero < half
+    assert int(negative) == -7 and float(half) == 1.5
+    assert {negative: 'x'}[-7] == 'x'
+    assert repr(half) == "RawNumber('1.5')"
+
+    # Everything the default decoding accepts
+    value, = json_parser.parse('[-.5]', engine=engine, raw_numbers=True)
+    assert str(value) == '-.5' and value == -0.5
+
+
+def test_raw_numbers_decoded_once() -> None:
+    """A raw number is decoded on first use, with the chosen hooks"""
+    calls: Dict[str, int] = {}
+
+    def parse_float(text: str) -> Decimal:
+        calls[text] = calls.get(text, 0) + 1
+        return Decimal(text)
+
+    value = json_parser.parse('1.10', raw_numbers=True, parse_float=parse_float)
+    assert calls == {}
+    assert value == Decimal('1.1') and value.value == Decimal('1.10')
+    assert calls == {'1.10': 1}
+
+    # Even when the decoded value is None
+    decoded = []
+    value = json_parser.parse(
+        '2', raw_numbers=True, parse_int=decoded.append)
+    assert value.value is None and value.value is None
+    assert decoded == ['2']
+
+
+def test_select() -> None:
+    """Selected values are decoded the same way"""
+    values = json_parser.parse(
+        '{"a": [0.5, {"b": -1}], "c": 2.5}', select=['/a'], decimal=True)
+    assert values == {'a': [Decimal('0.5'), {'b': -1}]}
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize(
+    ('json_string', 'kwargs', 'error'),
+    (
+        ('[1, 2.5]', {'parse_int': bytes.fromhex}, 'Invalid token: 1'),
+        ('[10, 2.5]', {'parse_int': bytes.fromhex}, None),
+        ('[1-2]', {'raw_numbers': True}, 'Invalid token: 1-2'),
+        ('[1-2]', {'decimal': True}, 'Invalid token: 1-2'),
+        ('[1, 2-]', {}, 'Invalid token: 2-'),
+    ),
+)
+def test_errors(
+        engine: ParserEngine,
+        json_string: str,
+        kwargs: Dict[str, object],
+        error: str) -> None:
+    """Numbers that a hook can't decode are reported like invalid ones"""
+    if error is None:
+        json_parser.parse(json_string, engine=engine, **kwargs)  # type: ignore
+        return
+
+    with pytest.raises(ParseError) as exc:
+        json_parser.parse(json_string, engine=engine, **kwargs)  # type: ignore
+    assert str(exc.value).startswith(error)
+
+
+def test_decimal_with_parse_float() -> None:
+    """Only one way of decoding floats can be chosen"""
+    with pytest.raises(ValueError) as exc:
+        json_parser.parse('1.5', decimal=True, parse_float=float)
+    assert str(exc.value) == "decimal can't be used with parse_float"
@@ -0,0 +1,80 @@
+"""Parallel array parsing tests"""
+import json
+from decimal import Decimal
+from typing import Optional
+
+import pytest
+
+import json_parser
+from json_parser import parallel
+from json_parser.lexer import TokenizeError
+from json_parser.parallel import split_array
+from json_parser.parser import ParseError
+
+RECORDS = json.dumps([
+    {'id': index, 'name': f'[{index}]', 'values': [index, {'x': 1.5}]}
+    for index in range(300)
+], indent=2)
+
+
+@pytest.fixture(autouse=True)
+def small_threshold(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Small documents are parsed in parallel too"""
+    monkeypatch.setattr(parallel, 'PARALLEL_THRESHOLD', 0)
+
+
+@pytest.mark.parametrize('engine', ('recursive', 'fused'))
+def test_parallel(engine: json_parser.parser.ParserEngine) -> None:
+    """Elements are parsed by the workers, and joined in order"""
+    assert json_parser.parse(
+        RECORDS, engine=engine, workers=2) == json.loads(RECORDS)
+    assert json_parser.parse(
+        RECORDS.encode(), workers=2, decimal=True
+    ) == json.loads(RECORDS, parse_float=Decimal)
+
+
+def test_split_array() -> None:
+    """Arrays are split after container elements, never inside strings"""
+    chunks = split_array(RECORDS, 1000)
+    assert chunks is not None and len(chunks) > 10
+    assert [
+        value
+        for chunk in chunks
+        for value in json_parser.parse(chunk)  # type: ignore
+    ] == json.loads(RECORDS)
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'chunks'),
+    (
+        ('{"a": [[1], [2]]}', None),
+        ('[[1], [2], [3]]', ['[[1]]', '[ [2]]', '[ [3]]']),
+        ('[1, 2, 3]', ['[1, 2, 3]']),
+        ('[[1], [2], ]', None),
+        ('[[1], [2]] x', None),
+        ('[[1], ["]"]', None),
+    ),
+)
+def test_split_array_edges(
+        json_string: str,
+        chunks: Optional[list]) -> None:
+    """Anything that isn't a well formed array is left to the serial parse"""
+    assert split_array(json_string, 1) == chunks
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error'),
+    (
+        ('[{"a": 1}, {"a": 2,}, {"a": 3}]', ParseError),
+        ('[{"a": 1}, {"a": 2}, ]', ParseError),
+        ('[{"a": 1}, {"a": tru}]', TokenizeError),
+    ),
+)
+def test_errors(json_string: str, error: type) -> None:
+    """Errors are the same as for the serial parse"""
+    with pytest.raises(error) as exinfo:
+        json_parser.parse(json_string, workers=2)
+
+    with pytest.raises(error) as serial_exinfo:
+        json_parser.parse(json_string)
+    assert exinfo.value.args == serial_exinfo.value.args
@@ -6,9 +6,12 @@ from typing import Dict
 import pytest
 
 import json_parser
-from json_parser.parser import ParseError
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError, ParserEngine
 
 
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
 @pytest.mark.parametrize(
     ('json_string', 'expected'),
     (
@@ -24,6 +27,10 @@ from json_parser.parser import ParseError
         ('{"value1": true, "value2": false, "value3": null}',
          {"value1": True, "value2": False, "value3": None}),
         ('{"foo": [1, 2, {"bar": 3}]}', {"foo": [1, 2, {"bar": 3}]}),
+        ('[1., -2, "a\nb", [[]], {"x": {}}]', [1.0, -2, "a\nb", [[]], {"x": {}}]),
+        ('"\\ud83d\\ude00 \\uD83D\\uDE00"', '\U0001f600 \U0001f600'),
+        ('["\\ud83d", "\\ude00\\ud83d"]', ['\ud83d', '\ude00\ud83d']),
+        ('"\\\\u0041 \\\\\\u0041"', '\\u0041 \\A'),
         ('{"results":[{"gender":"male","name":{"title":"Mr","first":"سینا","last":"موسوی"},"location":{"street":{"number":8134,"name":"میدان امام حسین"},"city":"ارومیه","state":"خوزستان","country":"Iran","postcode":24340,"coordinates":{"latitude":"27.3083","longitude":"-104.2564"},"timezone":{"offset":"0:00","description":"Western Europe Time, London, Lisbon, Casablanca"}},"email":"syn.mwswy@example.com","login":{"uuid":"8a6da152-019a-40b4-80b0-bfafd5281fd7","username":"sadbear764","password":"1947","salt":"ddKNbUrc","md5":"7ff0c750f9b8d7690d50385754a7fe25","sha1":"e140544e222f27a2d0aa809ccb00a1d1ca1fda60","sha256":"fd5dbd61da24a82f48971a6d027400a2fd5b0808fd108764f17d87aaa61774d9"},"dob":{"date":"1996-12-06T21:55:10.574Z","age":24},"registered":{"date":"2013-04-07T05:56:17.049Z","age":7},"phone":"083-15098477","cell":"0998-569-1505","id":{"name":"","value":null},"picture":{"large":"https://randomuser.me/api/portraits/men/94.jpg","medium":"https://randomuser.me/api/portraits/med/men/94.jpg","thumbnail":"https://randomuser.me/api/portraits/thumb/men/94.jpg"},"nat":"IR"}],"info":{"seed":"db5d8d673b395e5a","results":1,"page":1,"version":"1.3"}}',
          {'results': [{'gender': 'male', 'name': {'title': 'Mr', 'first': 'سینا', 'last': 'موسوی'}, 'location': {'street': {'number': 8134, 'name': 'میدان امام حسین'}, 'city': 'ارومیه', 'state': 'خوزستان', 'country': 'Iran', 'postcode': 24340, 'coordinates': {'latitude': '27.3083', 'longitude': '-104.2564'}, 'timezone': {'offset': '0:00', 'description': 'Western Europe Time, London, Lisbon, Casablanca'}}, 'email': 'syn.mwswy@example.com', 'login': {'uuid': '8a6da152-019a-40b4-80b0-bfafd5281fd7', 'username': 'sadbear764', 'password': '1947', 'salt': 'ddKNbUrc', 'md5': '7ff0c750f9b8d7690d50385754a7fe25', 'sha1': 'e140544e222f27a2d0aa809ccb00a1d1ca1fda60', 'sha256': 'fd5dbd61da24a82f48971a6d027400a2fd5b0808fd108764f17d87aaa61774d9'}, 'dob': {'date': '1996-12-06T21:55:10.574Z', 'age': 24}, 'registered': {'date': '2013-04-07T05:56:17.049Z', 'age': 7}, 'phone': '083-15098477', 'cell': '0998-569-1505', 'id': {'name': '', 'value': None}, 'picture': {'large': 'https://randomuser.me/api/portraits/men/94.jpg', 'medium': 'https://randomuser.me/api/portraits/med/men/94.jpg', 'thumbnail': 'https://randomuser.me/api/portraits/thumb/men/94.jpg'}, 'nat': 'IR'}], 'info': {'seed': 'db5d8d673b395e5a', 'results': 1, 'page': 1, 'version': '1.3'}}),
         ("""
@@ -119,11 +126,16 @@ from json_parser.parser import ParseError
         })
     )
 )
-def test_parser(json_string: str, expected: Dict[str, object]) -> None:
+def test_parser(
+        json_string: str,
+        expected: Dict[str, object],
+        engine: ParserEngine) -> None:
     """JSON parser tests"""
-    assert json_parser.parse(json_string) == expected
+    assert json_parser.parse(json_string, engine=engine) == expected
 
 
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
 @pytest.mark.parametrize(
     ('json_string', 'error_message'),
     (
@@ -136,6 +148,8 @@ def test_parser(json_string: str, expected: Dict[str, object]) -> None:
         ('{"abc":', "Unexpected end of file while parsing (line 1 column 8)"),
         ('[2,', "Unexpected end of file while parsing (line 1 column 4)"),
         ('"Abcd\\u123xab"', "Invalid unicode escape: \\u123x (line 1 column 6)"),
+        ('"ab\\ud83d\\u12"', "Invalid unicode escape: \\u12\" (line 1 column 10)"),
+        ('[\n"a\nb\\x"]', 'Unknown escape sequence: "a\nb\\x" (line 3 column 2)'),
         (
             """{
             "results": [
@@ -208,14 +222,137 @@ def test_parser(json_string: str, expected: Dict[str, object]) -> None:
         )
     )
 )
-def test_parser_failure(json_string: str, error_message: str) -> None:
+def test_parser_failure(
+        json_string: str,
+        error_message: str,
+        engine: ParserEngine) -> None:
     """JSON parser test failures"""
     with pytest.raises(ParseError) as exinfo:
-        json_parser.parse(json_string)
+        json_parser.parse(json_string, engine=engine)
+
+    msg, = exinfo.value.args
+    assert msg == error_message
+
+
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
+def test_tokenize_error_wins(engine: ParserEngine) -> None:
+    """The whole input is tokenized before any grammar errors are raised"""
+    with pytest.raises(TokenizeError) as exinfo:
+        json_parser.parse('[1 2, "abc', engine=engine)
+
+    msg, = exinfo.value.args
+    assert msg == 'Expected end of string (line 1 column 11)'
+
+
+@pytest.mark.parametrize('engine', ('iterative', 'fused', 'compact'))
+def test_deep_nesting(engine: ParserEngine) -> None:
+    """Nesting depth isn't limited by the recursion limit"""
+    depth = 100_000
+    json_string = '[{"a": ' * depth + '[]' + '}]' * depth
+
+    value = json_parser.parse(json_string, engine=engine)
+    for _ in range(depth):
+        value, = value
+        value = value['a']
+
+    assert value == []
+
+
+@pytest.mark.parametrize('engine', ('iterative', 'fused', 'compact'))
+@pytest.mark.parametrize(
+    ('json_string', 'max_depth', 'error_message'),
+    (
+        ('[[[]]]', 2, 'Maximum nesting depth of 2 exceeded (line 1 column 3)'),
+        ('{"a": {"b": {}}}', 2,
+         'Maximum nesting depth of 2 exceeded (line 1 column 13)'),
+        ('[\n  [1, 2],\n  [[3]]\n]', 2,
+         'Maximum nesting depth of 2 exceeded (line 3 column 4)'),
+        ('[]', 0, 'Maximum nesting depth of 0 exceeded (line 1 column 1)'),
+    )
+)
+def test_max_depth(
+        json_string: str,
+        max_depth: int,
+        error_message: str,
+        engine: ParserEngine) -> None:
+    """Documents nested deeper than max_depth are rejected"""
+    with pytest.raises(ParseError) as exinfo:
+        json_parser.parse(json_string, engine=engine, max_depth=max_depth)
 
     msg, = exinfo.value.args
     assert msg == error_message
 
+    assert json_parser.parse(
+        json_string, engine=engine, max_depth=max_depth + 1
+    ) == json.loads(json_string)
+
+
+def test_max_depth_needs_non_recursive_engine() -> None:
+    """The recursive engine can't enforce a depth limit"""
+    with pytest.raises(ValueError):
+        json_parser.parse('[]', max_depth=10)
+
+
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
+def test_object_hooks(engine: ParserEngine) -> None:
+    """Hooks replace every object, inner ones first"""
+    json_string = '{"a": [{"b": {}}], "c": 1, "c": 2}'
+    seen = []
+
+    def object_hook(obj: Dict[str, object]) -> object:
+        seen.append(obj)
+        return ('hooked', obj)
+
+    for data in (json_string, json_string.encode()):
+        seen.clear()
+        assert json_parser.parse(
+            data, engine=engine, object_hook=object_hook
+        ) == ('hooked', {'a': [('hooked', {'b': ('hooked', {})})], 'c': 2})
+        assert seen[0] == {}
+
+        assert json_parser.parse(
+            data,
+            engine=engine,
+            object_hook=object_hook,
+            object_pairs_hook=tuple,
+        ) == (('a', [(('b', ()),)]), ('c', 2))
+
+
+@pytest.mark.parametrize(
+    'engine', ('recursive', 'iterative', 'fused', 'compact'))
+@pytest.mark.parametrize(
+    'json_string',
+    (
+        # Raw newlines and numbers like `1.` are left to the lexer's own
+        # extractors, so the fast paths give up partway through these
+        '[{"a": 1}, {"b": "x\ny"}]',
+        b'[{"a": 1}, {"b": "x\ny"}]',
+        b'[{"a": 1}, {"b": 1.}]',
+        '{"a": {}, "b": [{"c": 1.}]}',
+    ),
+)
+def test_object_hooks_after_fallback(engine: ParserEngine,
+                                     json_string: object) -> None:
+    """Hooks are called once per object, even when a fast path gives up"""
+    seen = []
+
+    def object_hook(obj: Dict[str, object]) -> object:
+        seen.append(obj)
+        return obj
+
+    value = json_parser.parse(
+        json_string, engine=engine, object_hook=object_hook)  # type: ignore
+    assert value == json_parser.parse(json_string)  # type: ignore
+    assert len(seen) == str(value).count('{')
+
+
+def test_object_hooks_with_select() -> None:
+    """Selecting values keeps the document's shape, so it can't be hooked"""
+    with pytest.raises(ValueError):
+        json_parser.parse('{}', select=['/a'], object_hook=dict)
+
 
 def test_parse_large_file() -> None:
     """Download and parse a 25MB JSON file from the internet"""
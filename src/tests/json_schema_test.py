@@ -0,0 +1,223 @@
+"""Schema validation tests"""
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict
+
+import pytest
+
+import json_parser
+from json_parser import schema as schema_module
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+SCHEMA: Dict[str, Any] = {
+    '$schema': 'https://json-schema.org/draft/2020-12/schema',
+    'type': 'object',
+    'required': ['id', 'tags'],
+    'properties': {
+        'id': {'type': 'integer', 'minimum': 1},
+        'price': {'type': 'number', 'exclusiveMaximum': 100.5},
+        'name': {'type': ['string', 'null'], 'minLength': 1, 'maxLength': 5},
+        'tags': {
+            'type': 'array',
+            'items': {'type': 'string', 'enum': ['a', 'b']},
+            'maxItems': 2,
+        },
+        'kind': {'enum': [1, 'one', None, [1]]},
+        'meta': {'description': 'anything goes'},
+        'owner': {
+            'type': 'object',
+            'properties': {'a/b~c': {'const': True}},
+            'additionalProperties': {'type': 'number'},
+        },
+    },
+    'additionalProperties': False,
+}
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'expected'),
+    (
+        ('{"id": 1, "tags": []}', {'id': 1, 'tags': []}),
+        ('{"id": 2.0, "tags": ["a", "b"], "name": null, "price": -5}',
+         {'id': 2.0, 'tags': ['a', 'b'], 'name': None, 'price': -5}),
+        ('{"id": 3, "tags": [], "name": "abcde", "kind": [1], '
+         '"meta": {"x": [true]}, "owner": {"a/b~c": true, "n": 1.5}}',
+         {'id': 3, 'tags': [], 'name': 'abcde', 'kind': [1],
+          'meta': {'x': [True]}, 'owner': {'a/b~c': True, 'n': 1.5}}),
+    ),
+)
+def test_valid(json_string: str, expected: object) -> None:
+    """Documents that match the schema parse as usual"""
+    assert json_parser.parse(json_string, schema=SCHEMA) == expected
+    assert json_parser.parse(json_string.encode(), schema=SCHEMA) == expected
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'message'),
+    (
+        ('[1]', "Expected object, found array (line 1 column 1)"),
+        ('{"id": "1", "tags": []}',
+         'Expected integer, found "1" at /id (line 1 column 8)'),
+        ('{"id": 1.5, "tags": []}',
+         "Expected integer, found 1.5 at /id (line 1 column 8)"),
+        ('{"id": 0, "tags": []}',
+         "Expected at least 1, found 0 at /id (line 1 column 8)"),
+        ('{"id": 1, "tags": [], "price": 100.5}',
+         "Expected less than 100.5, found 100.5 at /price "
+         "(line 1 column 32)"),
+        ('{"id": 1, "tags": [], "name": ""}',
+         "Expected at least 1 characters, found 0 at /name "
+         "(line 1 column 31)"),
+        ('{"id": 1, "tags": [], "name": "abcdef"}',
+         "Expected at most 5 characters, found 6 at /name "
+         "(line 1 column 31)"),
+        ('{"id": 1, "tags": ["a", "c"]}',
+         'Expected one of "a", "b", found "c" at /tags/1 (line 1 column 25)'),
+        ('{"id": 1, "tags": ["a", "a", "b"]}',
+         "Expected at most 2 items, found 3 at /tags (line 1 column 19)"),
+        ('{"id": 1, "tags": [], "kind": true}',
+         'Expected one of 1, "one", null, [1], found true at /kind '
+         '(line 1 column 31)'),
+        ('{"id": 1, "tags": [], "kind": [2]}',
+         'Expected one of 1, "one", null, [1], found array at /kind '
+         '(line 1 column 31)'),
+        ('{"id": 1}', 'Missing required key "tags" (line 1 column 1)'),
+        ('{"id": 1, "tags": [], "other": 1}',
+         'Unexpected key "other" (line 1 column 23)'),
+        ('{"id": 1, "tags": [], "owner": {"a/b~c": false}}',
+         "Expected one of true, found false at /owner/a~1b~0c "
+         "(line 1 column 42)"),
+        ('{"id": 1, "tags": [], "owner": {"n": "1"}}',
+         'Expected number, found "1" at /owner/n (line 1 column 38)'),
+    ),
+)
+def test_violations(json_string: str, message: str) -> None:
+    """The first value that doesn't match is reported, with its position"""
+    with pytest.raises(json_parser.SchemaError) as exinfo:
+        json_parser.parse(json_string, schema=SCHEMA)
+    assert str(exinfo.value) == message
+
+
+def test_fail_fast() -> None:
+    """Violations are raised as they are found, before later syntax errors"""
+    with pytest.raises(json_parser.SchemaError):
+        json_parser.parse('{"id": "x", "tags": [1 2]}', schema=SCHEMA)
+
+    # The tokenizer still runs first
+    with pytest.raises(TokenizeError):
+        json_parser.parse('{"id": "x", "tags": "abc', schema=SCHEMA)
+
+    with pytest.raises(ParseError) as exinfo:
+        json_parser.parse('{"id": 1, "tags": []} 1', schema=SCHEMA)
+    assert str(exinfo.value) == "Invalid JSON at 1 (line 1 column 23)"
+
+
+def test_hooks_and_numbers() -> None:
+    """Object hooks and number options still apply"""
+    schema = {'type': 'array', 'items': {'required': ['a']}}
+    value = json_parser.parse(
+        '[{"a": 1.5}, {"a": {"b": 2}}]',
+        schema=schema,
+        object_hook=lambda obj: sorted(obj),
+        decimal=True,
+    )
+    assert value == [['a'], ['a']]
+
+    value = json_parser.parse(
+        '[0.30]', schema={'items': {'maximum': 0.3}}, raw_numbers=True)
+    assert value == [json_parser.RawNumber('0.30')]
+
+    # Enum options match numbers however they're decoded
+    schema = {'items': {'enum': [1.5, 2, [0.1]]}}
+    for options in ({'decimal': True}, {'raw_numbers': True}, {}):
+        value = json_parser.parse(
+            '[1.50, 2.0, [0.1]]', schema=schema, **options)
+        assert value == json_parser.parse('[1.50, 2.0, [0.1]]', **options)
+
+    assert json_parser.parse(
+        '0.1', schema={'const': 0.1}, decimal=True) == Decimal('0.1')
+    with pytest.raises(json_parser.SchemaError):
+        json_parser.parse('1', schema={'enum': [True]})
+
+
+def test_compile_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Schemas are compiled once, and only so many are kept"""
+    monkeypatch.setattr(schema_module, 'VALIDATORS', OrderedDict())
+    monkeypatch.setattr(schema_module, 'SCHEMA_CACHE_SIZE', 2)
+
+    first = {'type': 'array'}
+    validator = json_parser.compile_schema(first)
+    assert json_parser.compile_schema(first) is validator
+    assert json_parser.compile_schema(validator) is validator
+    assert json_parser.parse('[]', schema=validator) == []
+
+    json_parser.compile_schema({'type': 'string'})
+    json_parser.compile_schema(first)
+    json_parser.compile_schema({'type': 'null'})
+    assert len(schema_module.VALIDATORS) == 2
+    assert json_parser.compile_schema(first) is validator
+
+
+@pytest.mark.parametrize(
+    ('schema', 'json_string', 'message'),
+    (
+        ({'properties': {'x': False}}, '{"y": {"x": 1}}', None),
+        ({'properties': {'x': False}}, '{"y": 1, "x": 1}',
+         'Unexpected key "x" (line 1 column 10)'),
+        ({'properties': {'x': True}, 'additionalProperties': False},
+         '{"x": [1]}', None),
+        ({'items': False}, '[]', None),
+        ({'items': False}, '[[]]', "Unexpected value array at /0 "
+         "(line 1 column 2)"),
+        ({'items': {'additionalProperties': False}}, '[{}, {"a": 1}]',
+         'Unexpected key "a" at /1 (line 1 column 7)'),
+        (True, '"anything"', None),
+        (False, 'null', "Unexpected value null (line 1 column 1)"),
+    ),
+)
+def test_boolean_schemas(
+        schema: Any,
+        json_string: str,
+        message: object) -> None:
+    """`true` allows any value, and `false` none"""
+    if message is None:
+        assert json_parser.parse(json_string, schema=schema) == (
+            json_parser.parse(json_string))
+        return
+
+    with pytest.raises(json_parser.SchemaError) as exinfo:
+        json_parser.parse(json_string, schema=schema)
+    assert str(exinfo.value) == message
+
+
+@pytest.mark.parametrize(
+    ('schema', 'options', 'message'),
+    (
+        ({'pattern': 'a+'}, {}, "Unsupported schema keyword: pattern"),
+        ({'type': 'decimal'}, {}, "Unknown schema type: decimal"),
+        ({'items': [{}]}, {}, "Only a single schema is supported for items"),
+        ({'items': 1}, {}, "Schemas must be objects or booleans, not int"),
+        ({'minimum': True}, {}, "minimum must be a number, not bool"),
+        ({'properties': {'a': {'exclusiveMaximum': '5'}}}, {},
+         "exclusiveMaximum must be a number, not str"),
+        ({'maximum': float('nan')}, {}, "maximum must be finite, not nan"),
+        ({'minLength': 1.5}, {}, "minLength must be an integer, not float"),
+        ({'maxItems': False}, {}, "maxItems must be an integer, not bool"),
+        ({'properties': {'a': {'maxLength': -1}}}, {},
+         "maxLength must be at least 0, not -1"),
+        ({'minItems': '2'}, {}, "minItems must be an integer, not str"),
+        ({}, {'engine': 'fused'}, "schema needs the recursive engine"),
+        ({}, {'select': ['/a']}, "schema can't be used with select"),
+        ({}, {'stats': json_parser.ParseStats()},
+         "schema can't be used with stats"),
+    ),
+)
+def test_unsupported(
+        schema: Dict[str, Any],
+        options: Dict[str, Any],
+        message: str) -> None:
+    """Unsupported schemas and options are rejected up front"""
+    with pytest.raises(ValueError) as exinfo:
+        json_parser.parse('{"a": 1}', schema=schema, **options)
+    assert str(exinfo.value) == message
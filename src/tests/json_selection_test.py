@@ -0,0 +1,78 @@
+"""Selective parsing tests"""
+from typing import List
+
+import pytest
+
+import json_parser
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+DOCUMENT = '''{
+    "user": {"id": 7, "name": "a\\"]}"},
+    "items": [
+        {"price": 1.5, "tags": ["[", {"{": "}"}]},
+        {"price": 2, "a/b": {"c~d": null}},
+        3,
+        {"name": "x"}
+    ]
+}'''
+
+
+@pytest.mark.parametrize(
+    ('select', 'expected'),
+    (
+        (
+            ['/user/id', '/items/*/price'],
+            {'user': {'id': 7}, 'items': [{'price': 1.5}, {'price': 2}, {}]},
+        ),
+        (['/user'], {'user': {'id': 7, 'name': 'a"]}'}}),
+        (['/user/name', '/user'], {'user': {'id': 7, 'name': 'a"]}'}}),
+        (['/items/0/tags/1'], {'items': [{'tags': [{'{': '}'}]}]}),
+        (['/items/1/a~1b/c~0d'], {'items': [{'a/b': {'c~d': None}}]}),
+        (['/items/2', '/items/1/price'], {'items': [{'price': 2}, 3]}),
+        (['/missing', '/user/id/deeper'], {'user': {}}),
+        ([], {}),
+        ([''], json_parser.parse(DOCUMENT)),
+    )
+)
+def test_select(select: List[str], expected: object) -> None:
+    """Only the selected values are built"""
+    assert json_parser.parse(DOCUMENT, select=select) == expected
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error_message'),
+    (
+        ('{"a": 1 "b": 2}', "Expected ',' or '}', found \"b\" (line 1 column 9)"),
+        ('{"a": [1, "b]}', 'Expected end of string (line 1 column 15)'),
+        ('{"a": {"b": 1}]', "Expected ',' or '}', found ] (line 1 column 15)"),
+        ('{"b": tru}', 'Unknown token found: tru (line 1 column 7)'),
+        ('{"a": 1} 2', 'Invalid JSON at 2 (line 1 column 10)'),
+    )
+)
+def test_errors(json_string: str, error_message: str) -> None:
+    """Errors in the structure, and in selected values, are the same"""
+    with pytest.raises((ParseError, TokenizeError)) as exinfo:
+        json_parser.parse(json_string, select=['/b'])
+
+    msg, = exinfo.value.args
+    assert msg == error_message
+
+
+def test_skipped_values_are_not_checked() -> None:
+    """Values that aren't selected only need balanced brackets and quotes"""
+    json_string = '{"a": [tru, 1.], "b": 1}'
+    assert json_parser.parse(json_string, select=['/b']) == {'b': 1}
+
+
+def test_raw_newlines_in_strings() -> None:
+    """Keys and skipped strings can have raw newlines, like in `parse`"""
+    json_string = '{"a\nb": 1, "c": ["x\ny"], "d": "x\ny", "e": 2}'
+    assert json_parser.parse(json_string, select=['/a\nb', '/e']) == {
+        'a\nb': 1, 'e': 2}
+
+
+def test_select_with_max_depth() -> None:
+    """Selections don't support max_depth"""
+    with pytest.raises(ValueError):
+        json_parser.parse('[]', select=['/0'], max_depth=5)
@@ -0,0 +1,107 @@
+"""Parse instrumentation tests"""
+import time
+from typing import Any, Dict
+
+import pytest
+
+import json_parser
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError, ParserEngine
+
+
+@pytest.mark.parametrize('engine', ['recursive', 'iterative'])
+def test_counters(engine: ParserEngine) -> None:
+    """Tokens, escapes, depth and bytes are counted"""
+    stats = json_parser.ParseStats()
+    json_string = '{"a": [1, 2.5, "x\\n\\u00e9\\\\", {"b": null}], "é": true}'
+
+    assert json_parser.parse(json_string, engine=engine, stats=stats) == {
+        'a': [1, 2.5, 'x\né\\', {'b': None}], 'é': True}
+    assert stats.parses == 1
+    assert stats.bytes == len(json_string) + 1
+    assert stats.tokens == {
+        'string': 4, 'number': 2, 'boolean': 1, 'null': 1,
+        'left_bracket': 1, 'left_brace': 2,
+        'right_bracket': 1, 'right_brace': 2,
+        'comma': 4, 'colon': 3,
+    }
+    assert stats.escapes == 3
+    assert stats.max_depth == 3
+    for phase in ('tokenize', 'string', 'number', 'container'):
+        assert getattr(stats, f'{phase}_time') >= 0
+    assert stats.total_time > 0
+
+
+def test_totals() -> None:
+    """One object adds up counters over many parses"""
+    stats = json_parser.ParseStats()
+    json_parser.parse('[[[1]]]', stats=stats)
+    json_parser.parse(b'[2, 3]', stats=stats)
+    json_parser.parse('"\\t"', stats=stats)
+
+    result: Dict[str, Any] = stats.as_dict()
+    assert result['parses'] == 3
+    assert result['bytes'] == 17
+    assert result['tokens']['number'] == 3
+    assert result['escapes'] == 1
+    assert result['max_depth'] == 3
+    assert result['total_time'] == pytest.approx(
+        result['tokenize_time'] + result['string_time']
+        + result['number_time'] + result['container_time'])
+    assert repr(stats).startswith('ParseStats(parses=3, bytes=17, tokens=')
+
+
+@pytest.mark.parametrize('engine', ['recursive', 'iterative'])
+def test_times_the_parse(engine: ParserEngine) -> None:
+    """The decoding the parse does is what gets timed, once"""
+    calls = []
+
+    def slow_int(text: str) -> int:
+        calls.append(text)
+        time.sleep(0.01)
+        return int(text)
+
+    stats = json_parser.ParseStats()
+    value = json_parser.parse(
+        '{"a": [1, 2], "b": 3}', engine=engine, parse_int=slow_int,
+        stats=stats)
+
+    assert value == {'a': [1, 2], 'b': 3}
+    assert calls == ['1', '2', '3']
+    assert stats.number_time >= 0.03
+    assert stats.number_time < stats.total_time
+    assert stats.container_time < 0.01
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error', 'message'),
+    (
+        ('[1, }', ParseError, "Unexpected token: } (line 1 column 5)"),
+        ('[}, "\\x"]', ParseError, "Unexpected token: } (line 1 column 2)"),
+        ('[1] 2', ParseError, "Invalid JSON at 2 (line 1 column 5)"),
+        ('[tru]', TokenizeError, "Unknown token found: tru"),
+    ),
+)
+def test_errors(json_string: str, error: type, message: str) -> None:
+    """Errors are the same as without stats, and aren't counted"""
+    stats = json_parser.ParseStats()
+    with pytest.raises(error) as exinfo:
+        json_parser.parse(json_string, stats=stats)
+    assert str(exinfo.value).startswith(message)
+    assert stats.parses == 0
+    assert stats.total_time == 0
+
+
+@pytest.mark.parametrize(
+    ('options', 'message'),
+    (
+        ({'engine': 'fused'},
+         "stats needs the 'recursive' or 'iterative' engine"),
+        ({'select': ['/a']}, "stats can't be used with select"),
+    ),
+)
+def test_unsupported(options: Dict[str, Any], message: str) -> None:
+    """Engines without a separate tokenizer can't be instrumented"""
+    with pytest.raises(ValueError) as exinfo:
+        json_parser.parse('{"a": 1}', stats=json_parser.ParseStats(), **options)
+    assert str(exinfo.value) == message
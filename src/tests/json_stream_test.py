@@ -0,0 +1,119 @@
+"""JSON streaming parser tests"""
+import io
+import json
+from typing import IO, Any, Callable
+
+import pytest
+
+import json_parser
+from json_parser.lexer import IncrementalLexer, TokenizeError, tokenize
+from json_parser.parser import ParseError
+
+DOCUMENT = '''{
+    "name": "caf\\u00e9 \\"ol\\u00e9\\"",
+    "unicode": "سینا",
+    "values": [1, -2.5, 300, true, false, null, [], {}],
+    "nested": {"list": [[1, 2], {"a": "b"}]}
+}'''
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 3, 7, 64))
+def test_lexer_chunks(chunk_size: int) -> None:
+    """Chunked tokenization gives the same tokens as tokenizing at once"""
+    lexer = IncrementalLexer()
+    tokens = []
+    for index in range(0, len(DOCUMENT), chunk_size):
+        tokens.extend(lexer.feed(DOCUMENT[index:index+chunk_size]))
+    tokens.extend(lexer.close())
+
+    assert tokens == list(tokenize(DOCUMENT))
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 3, 7, 64))
+def test_parser_chunks(chunk_size: int) -> None:
+    """Text and UTF-8 chunks split anywhere parse to the same value"""
+    expected = json_parser.parse(DOCUMENT)
+
+    for data in (DOCUMENT, DOCUMENT.encode()):
+        parser = json_parser.Parser()
+        for index in range(0, len(data), chunk_size):
+            parser.feed(data[index:index+chunk_size])
+
+        assert parser.close() == expected
+
+
+def test_split_everywhere() -> None:
+    """Every possible split point in tokens and escapes is handled"""
+    json_string = '["ab\\u00e9\\n", -12.5, true, null, {"k": 1000}]'
+    expected = json.loads(json_string)
+
+    for split in range(len(json_string)):
+        parser = json_parser.Parser()
+        parser.feed(json_string[:split])
+        parser.feed(json_string[split:])
+        assert parser.close() == expected
+
+
+@pytest.mark.parametrize(
+    'make_file',
+    (
+        lambda: io.StringIO(DOCUMENT),
+        lambda: io.BytesIO(DOCUMENT.encode()),
+    )
+)
+def test_load(make_file: Callable[[], IO[Any]]) -> None:
+    """Text and binary files can be loaded"""
+    value = json_parser.load(make_file(), chunk_size=5)
+    assert value == json_parser.parse(DOCUMENT)
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error_message'),
+    (
+        ('[1, 2, 3,]', 'Expected value after comma, found ] (line 1 column 10)'),
+        ('[1, 2 "hello"]', "Expected ',' or ']', found \"hello\" (line 1 column 7)"),
+        ('{35: "test"}', "Expected string key for object, found 35 (line 1 column 2)"),
+        ('{"abc":}', "Expected value after colon, found } (line 1 column 8)"),
+        ('{"abc":"def",}', "Expected value after comma, found } (line 1 column 14)"),
+        ('{"abc"', "Unexpected end of file while parsing (line 1 column 7)"),
+        ('{"abc":', "Unexpected end of file while parsing (line 1 column 8)"),
+        ('{"abc": 12', "Unexpected end of file while parsing (line 1 column 8)"),
+        ('[2,', "Unexpected end of file while parsing (line 1 column 4)"),
+        ('[\n  2', "Unexpected end of file while parsing (line 2 column 4)"),
+        ('{', "Unexpected end of file while parsing (line 1 column 2)"),
+        ('[] []', "Invalid JSON at [ (line 1 column 4)"),
+        ('[[[]]]', "Maximum nesting depth of 2 exceeded (line 1 column 3)"),
+    )
+)
+def test_parser_failure(json_string: str, error_message: str) -> None:
+    """Streaming parser failures"""
+    parser = json_parser.Parser(max_depth=2)
+    with pytest.raises(ParseError) as exinfo:
+        for char in json_string:
+            parser.feed(char)
+        parser.close()
+
+    msg, = exinfo.value.args
+    assert msg == error_message
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error_message'),
+    (
+        ('', 'Cannot parse empty string'),
+        ('  \n ', 'Cannot parse empty string'),
+        ('["abc', 'Expected end of string (line 1 column 6)'),
+        ('[tru', 'Unknown token found: tru (line 1 column 2)'),
+        ('[1, 2.3.4]', 'Too many decimal points in number'),
+    )
+)
+def test_lexer_failure(json_string: str, error_message: str) -> None:
+    """Lexer errors are raised once the input can't be completed"""
+    parser = json_parser.Parser()
+    with pytest.raises(TokenizeError) as exinfo:
+        for char in json_string:
+            parser.feed(char)
+        parser.close()
+
+    msg, = exinfo.value.args
+    assert msg == error_message
@@ -0,0 +1,195 @@
+"""Typed decoding tests"""
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+import pytest
+
+import json_parser
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+from json_parser.typed import (
+    DECODER_CACHE_SIZE,
+    DecodeError,
+    _cached_decoder,
+    get_decoder,
+)
+
+try:
+    from typing import TypedDict
+except ImportError:  # Python < 3.8
+    TypedDict = None  # type: ignore
+
+
+@dataclass
+class Tag:
+    name: str
+    weight: float = 1.0
+
+
+class Point(NamedTuple):
+    x: int
+    y: int = 0
+
+
+@dataclass
+class Item:
+    id: int
+    price: Decimal
+    tags: List[Tag]
+    where: Point
+    parent: Optional['Item'] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    pair: Tuple[int, str] = (0, '')
+    code: Union[int, str] = 0
+
+
+ITEM = '''{
+    "id": 1,
+    "price": 0.10,
+    "tags": [{"name": "a"}, {"name": "b", "weight": 2}],
+    "where": {"x": 3},
+    "unknown": [1, {"z": null}],
+    "parent": {"id": 2, "price": 1, "tags": [], "where": {"x": 1, "y": 2}},
+    "extra": {"k": [true, 1.]},
+    "pair": [1, "x"],
+    "co\\u0064e": "s"
+}'''
+
+
+def test_parse_into() -> None:
+    """Nested dataclasses and named tuples are built from the document"""
+    parent = Item(2, Decimal(1), [], Point(1, 2))
+    assert json_parser.parse_into(ITEM, Item) == Item(
+        id=1,
+        price=Decimal('0.10'),
+        tags=[Tag('a'), Tag('b', 2.0)],
+        where=Point(3),
+        parent=parent,
+        extra={'k': [True, 1.0]},
+        pair=(1, 'x'),
+        code='s',
+    )
+    assert json_parser.parse_into(ITEM.encode(), Item).tags[1].weight == 2.0
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'target', 'expected'),
+    (
+        ('[1, -2]', List[int], [1, -2]),
+        ('[1, 2.5]', Tuple[float, ...], (1.0, 2.5)),
+        ('[1, "a\\nb", null]', Tuple[int, str, None], (1, 'a\nb', None)),
+        ('{"a": null, "b": 1}', Dict[str, Optional[int]], {'a': None, 'b': 1}),
+        ('[true, "x", 1]', List[Union[bool, str, int]], [True, 'x', 1]),
+        ('[{"a": [1.]}]', list, [{'a': [1.0]}]),
+        ('{"a\nb": 1, "c": 2}', Dict[str, int], {'a\nb': 1, 'c': 2}),
+        ('"x"', object, 'x'),
+    ),
+)
+def test_containers(json_string: str, target: Any, expected: object) -> None:
+    """Generic containers, unions and `Any` values"""
+    assert json_parser.parse_into(json_string, target) == expected
+
+
+@pytest.mark.skipif(TypedDict is None, reason="needs TypedDict")
+def test_typed_dict() -> None:
+    """Typed dicts only get the keys that are present"""
+    class Meta(TypedDict, total=False):
+        source: str
+        count: int
+
+    assert json_parser.parse_into('{"count": 2, "x": 1}', Meta) == {'count': 2}
+    with pytest.raises(DecodeError):
+        json_parser.parse_into('{"count": "2"}', Meta)
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'target', 'error_message'),
+    (
+        ('{"id": "x"}', Item, 'Expected int, found "x" at /id (line 1 column 8)'),
+        ('{"id": 1.5}', Item, 'Expected int, found 1.5 at /id (line 1 column 8)'),
+        (
+            '{"tags": [{"name": 1}]}',
+            Item,
+            'Expected str, found 1 at /tags/0/name (line 1 column 20)',
+        ),
+        ('{"price": 1}', Item, "Missing field 'id' of Item (line 1 column 1)"),
+        ('[1]', Item, 'Expected Item, found [ (line 1 column 1)'),
+        ('[1, 2, 3]', Tuple[int, int], 'Expected 2 items at /2 (line 1 column 8)'),
+        ('[1]', Tuple[int, int], 'Expected 2 items (line 1 column 1)'),
+        (
+            '{"a/b": [true]}',
+            Dict[str, List[Union[int, str]]],
+            'Expected Union[int, str], found true at /a~1b/0 '
+            '(line 1 column 10)',
+        ),
+        ('{"a": 1}', List[int], 'Expected List[int], found { (line 1 column 1)'),
+    ),
+)
+def test_decode_errors(
+        json_string: str,
+        target: Any,
+        error_message: str) -> None:
+    """Valid JSON that doesn't fit the type"""
+    with pytest.raises(DecodeError) as exinfo:
+        json_parser.parse_into(json_string, target)
+
+    msg, = exinfo.value.args
+    assert msg == error_message
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error'),
+    (
+        ('{"id": "x"', ParseError),
+        ('[{"id": 1,}]', ParseError),
+        ('[{"id": 1 "x": 2}]', ParseError),
+        ('[] x', TokenizeError),
+        ('{"id": 1, "unknown": [1, {"a": tru}]}', TokenizeError),
+        ('{"id": 1, "unknown": {"a": [1,]}}', ParseError),
+        ('{"id": 1, "unknown": "\\q"}', ParseError),
+    ),
+)
+def test_syntax_errors(json_string: str, error: type) -> None:
+    """Invalid JSON gives the same error as `parse`, even after a mismatch"""
+    with pytest.raises(error) as exinfo:
+        json_parser.parse_into(json_string, List[Item])
+
+    with pytest.raises(error) as parse_exinfo:
+        json_parser.parse(json_string)
+    assert exinfo.value.args == parse_exinfo.value.args
+
+
+def test_deep_values() -> None:
+    """Deeply nested unknown members are skipped, and `Any` values parsed,
+    without recursion"""
+    nested = '[' * 50_000 + ']' * 50_000
+    point = json_parser.parse_into(
+        f'{{"x": 1, "unknown": {nested}}}', Point)
+    assert point == Point(1)
+
+    item = json_parser.parse_into(
+        '{"id": 1, "price": 1, "tags": [], "where": {"x": 1}, '
+        f'"extra": {{"k": {nested}}}}}',
+        Item)
+    value = item.extra['k']
+    for _ in range(50_000):
+        assert type(value) is list
+        value = value[0] if value else None
+    assert value is None
+
+
+def test_decoder_cache() -> None:
+    """Only so many types' decoders are kept"""
+    for size in range(1, DECODER_CACHE_SIZE + 10):
+        get_decoder(Tuple[(int,) * size])  # type: ignore
+
+    assert _cached_decoder.cache_info().currsize == DECODER_CACHE_SIZE
+
+
+def test_unsupported_type() -> None:
+    """Types that JSON can't be decoded into are rejected up front"""
+    with pytest.raises(TypeError):
+        json_parser.parse_into('[]', Set[int])
+    with pytest.raises(TypeError):
+        json_parser.parse_into('{}', Dict[int, str])
@@ -0,0 +1,142 @@
+"""Validation tests"""
+import sys
+import tracemalloc
+from typing import Type, Union
+
+import pytest
+
+import json_parser
+from json_parser.lexer import TokenizeError
+from json_parser.parser import ParseError
+
+
+@pytest.mark.parametrize(
+    'json_string',
+    (
+        '0',
+        '-12.5',
+        '"abc"',
+        ' true ',
+        'null',
+        '[]',
+        '{}',
+        '[1, 2.5, "x", true, false, null, [], {}]',
+        '{"a": [1, {"b": "c\\n\\t\\"\\u00e9\\ud83d\\ude00"}], "": {}}',
+        '[\n  {"a" :1 ,"b":\t"سی"} ,\n  [ "x" , "y" ]\n]',
+        '[' * 10000 + ']' * 10000,
+    ),
+)
+@pytest.mark.parametrize('as_bytes', (False, True))
+def test_valid(json_string: str, as_bytes: bool) -> None:
+    """Valid JSON passes, as a string or UTF-8 bytes"""
+    document: Union[str, bytes] = json_string
+    if as_bytes:
+        document = json_string.encode()
+    assert json_parser.validate(document) is None
+
+
+@pytest.mark.parametrize(
+    ('json_string', 'error', 'message'),
+    (
+        ('', TokenizeError, "Cannot parse empty string"),
+        ('[1, 2, 3,]', ParseError,
+         "Expected value after comma, found ] (line 1 column 10)"),
+        ('[1, 2 "hello"]', ParseError,
+         "Expected ',' or ']', found \"hello\" (line 1 column 7)"),
+        ('{35: "test"}', ParseError,
+         "Expected string key for object, found 35 (line 1 column 2)"),
+        ('{"abc":}', ParseError,
+         "Expected value after colon, found } (line 1 column 8)"),
+        ('{"a": 1, "abc":"def",}', ParseError,
+         "Expected value after comma, found } (line 1 column 22)"),
+        ('{"abc"', ParseError,
+         "Unexpected end of file while parsing (line 1 column 7)"),
+        ('[2,', ParseError,
+         "Unexpected end of file while parsing (line 1 column 4)"),
+        ('[1] [2]', ParseError, "Invalid JSON at [ (line 1 column 5)"),
+        ('["a", "b\\u123x"]', ParseError,
+         "Invalid unicode escape: \\u123x (line 1 column 9)"),
+        ('[\n"a\nb\\x"]', ParseError,
+         'Unknown escape sequence: "a\nb\\x" (line 3 column 2)'),
+        ('[1, 2 3, "abc', TokenizeError,
+         "Expected end of string (line 1 column 14)"),
+        ('[1, tru]', TokenizeError, "Unknown token found: tru"),
+    ),
+)
+def test_invalid(
+        json_string: str,
+        error: Type[Exception],
+        message: str) -> None:
+    """Errors are exactly the same as the parser's"""
+    with pytest.raises(error) as expected:
+        json_parser.parse(json_string, engine='iterative')
+    assert str(expected.value).startswith(message)
+
+    for document in (json_string, json_string.encode()):
+        with pytest.raises(error) as exinfo:
+            json_parser.validate(document)
+        assert str(exinfo.value) == str(expected.value)
+
+
+@pytest.mark.parametrize(
+    'document',
+    (b'["\xff"]', bytearray(b'{"\xc3": 1}'), memoryview(b'[1, \xe9]')),
+)
+def test_invalid_utf8(document: Union[bytes, bytearray, memoryview]) -> None:
+    """Bytes that aren't UTF-8 are rejected like `parse` does"""
+    assert json_parser.validate(b'["\xc3\xa9"]') is None
+    with pytest.raises(UnicodeDecodeError):
+        json_parser.validate(document)
+
+
+def test_max_depth() -> None:
+    """Nesting deeper than `max_depth` is an error"""
+    assert json_parser.validate('[[{"a": []}]]', max_depth=4) is None
+    with pytest.raises(ParseError) as exinfo:
+        json_parser.validate('[[{"a": []}]]', max_depth=3)
+    assert str(exinfo.value).startswith("Maximum nesting depth of 3 exceeded")
+
+
+@pytest.mark.skipif(
+    not hasattr(sys, 'set_int_max_str_digits'),
+    reason="integer digits aren't limited")
+@pytest.mark.parametrize(
+    'template',
+    ('%s', '[%s]', '[%s, 1]', '{"a": %s}', '{"a": %s, "b": 1}'),
+)
+def test_long_integers(template: str) -> None:
+    """Integers are valid exactly when `int()` would take them"""
+    limit = sys.get_int_max_str_digits()
+    for number in ('-' + '9' * limit, '1' * limit + '.5'):
+        assert json_parser.validate(template % number) is None
+
+    document = template % ('1' * (limit + 1))
+    with pytest.raises(ParseError) as expected:
+        json_parser.parse(document, engine='iterative')
+    for source in (document, document.encode()):
+        with pytest.raises(ParseError) as exinfo:
+            json_parser.validate(source)
+        assert str(exinfo.value) == str(expected.value)
+
+    sys.set_int_max_str_digits(0)
+    try:
+        assert json_parser.validate(document) is None
+    finally:
+        sys.set_int_max_str_digits(limit)
+
+
+def test_memory() -> None:
+    """Nothing is built, so memory use doesn't grow with the document"""
+    json_string = json_parser.dumps([
+        {'id': index, 'name': f'item {index}', 'tags': ['a', 'b\n']}
+        for index in range(20000)
+    ])
+
+    tracemalloc.start()
+    try:
+        json_parser.validate(json_string)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 64 * 1024